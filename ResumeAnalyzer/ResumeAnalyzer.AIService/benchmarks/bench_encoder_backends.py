@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark the sentence encoder backends: torch (sentence-transformers), ONNX fp32 and
+ONNX int8. Each backend runs in a fresh subprocess so resident memory is measured in
+isolation. Reports load time, single-sentence and batched latency, RSS after loading,
+peak RSS, model file size, the installed size of the runtime package (the image-size
+cost of shipping it) and the lowest cosine similarity to the torch embeddings.
+
+Requires the ONNX files from install_models.py (or ONNX_MODEL_DIR).
+
+Usage: python benchmarks/bench_encoder_backends.py [--backends torch,onnx,onnx-int8] [--repeats 20]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from onnx_encoder import (  # noqa: E402
+    DEFAULT_ONNX_MODEL_DIR, ONNX_MODEL_FILE, QUANTIZED_MODEL_FILE, OnnxSentenceEncoder,
+)
+
+SENTENCE_MODEL_NAME = "all-MiniLM-L6-v2"
+BATCH_SIZE = 64
+
+SKILLS = ["python", "java", "react", "aws", "docker", "kubernetes", "sql", "spark", "figma", "jira", "salesforce", "excel"]
+TEMPLATES = [
+    "Built and maintained {a} services with {b} for a team of {n} engineers",
+    "{n} years of experience with {a}, {b} and related tooling",
+    "Responsible for migrating legacy {a} applications to {b}",
+    "Looking for a candidate with strong {a} skills and exposure to {b}",
+    "Led the {a} initiative, improving delivery time by {n} percent",
+]
+
+
+def make_sentences(count: int, seed: int = 7) -> list:
+    """Deterministic resume/job-like sentences"""
+    rng = np.random.default_rng(seed)
+    sentences = []
+    for _ in range(count):
+        a, b = rng.choice(SKILLS, size=2, replace=False)
+        sentences.append(TEMPLATES[rng.integers(len(TEMPLATES))].format(a=a, b=b, n=int(rng.integers(2, 15))))
+    return sentences
+
+
+def memory_mb() -> tuple:
+    """(current RSS, peak RSS) of this process in MB"""
+    current = peak = 0.0
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    current = int(line.split()[1]) / 1024
+                elif line.startswith("VmHWM:"):
+                    peak = int(line.split()[1]) / 1024
+    except OSError:
+        import resource
+        peak = current = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return current, peak
+
+
+def directory_size_mb(path: str) -> float:
+    total = 0
+    for root, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return total / 1024 / 1024
+
+
+def package_size_mb(module_name: str) -> Optional[float]:
+    """Installed size of a package directory, or None if it is not installed"""
+    try:
+        module = __import__(module_name)
+    except ImportError:
+        return None
+    return directory_size_mb(os.path.dirname(module.__file__))
+
+
+def load_backend(backend: str, model_dir: str):
+    """Load an encoder and return it with its model file size in MB"""
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(SENTENCE_MODEL_NAME, device="cpu")
+        return model, directory_size_mb(model[0].auto_model.config._name_or_path)
+    model = OnnxSentenceEncoder(model_dir, quantized=backend == "onnx-int8")
+    return model, os.path.getsize(os.path.join(model_dir, model.model_file)) / 1024 / 1024
+
+
+def best_ms(func, repeats: int) -> float:
+    """Best wall time in milliseconds over the given number of repeats"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def run_worker(backend: str, model_dir: str, repeats: int, output: str):
+    """Measure one backend in this process and print the results as JSON"""
+    sentences = make_sentences(256)
+    start = time.perf_counter()
+    model, model_mb = load_backend(backend, model_dir)
+    load_s = time.perf_counter() - start
+    loaded_rss, _ = memory_mb()
+
+    model.encode(sentences[:BATCH_SIZE], batch_size=BATCH_SIZE)  # warm-up
+    single_ms = best_ms(lambda: model.encode([sentences[0]]), repeats)
+    batch_ms = best_ms(lambda: model.encode(sentences[:BATCH_SIZE], batch_size=BATCH_SIZE), max(1, repeats // 4))
+    np.save(output, np.asarray(model.encode(sentences, batch_size=BATCH_SIZE), dtype=np.float32))
+    _, peak_rss = memory_mb()
+
+    print(json.dumps({
+        "load_s": load_s, "single_ms": single_ms, "batch_ms": batch_ms,
+        "loaded_rss_mb": loaded_rss, "peak_rss_mb": peak_rss, "model_mb": model_mb,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8", help="comma-separated backends to compare")
+    parser.add_argument("--model-dir", default=os.getenv("ONNX_MODEL_DIR", DEFAULT_ONNX_MODEL_DIR))
+    parser.add_argument("--repeats", type=int, default=20, help="timed runs per measurement (best is reported)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.model_dir, args.repeats, args.output)
+        return
+
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    for name, filename in [("onnx", ONNX_MODEL_FILE), ("onnx-int8", QUANTIZED_MODEL_FILE)]:
+        if name in backends and not os.path.exists(os.path.join(args.model_dir, filename)):
+            print(f"skipping {name}: {os.path.join(args.model_dir, filename)} not found (run install_models.py)")
+            backends.remove(name)
+
+    results = {}
+    embeddings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in backends:
+            output = os.path.join(tmp, f"{backend}.npy")
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", backend, "--model-dir", args.model_dir,
+                 "--repeats", str(args.repeats), "--output", output],
+                capture_output=True, text=True,
+            )
+            if completed.returncode != 0:
+                print(f"{backend} failed:\n{completed.stderr.strip()[-2000:]}")
+                continue
+            results[backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+            embeddings[backend] = np.load(output)
+
+    reference = embeddings.get("torch")
+    print(f"{'backend':<10} {'load s':>7} {'1 sent ms':>10} {f'{BATCH_SIZE} sent ms':>11} "
+          f"{'RSS MB':>8} {'peak MB':>8} {'model MB':>9} {'min cos':>8}")
+    for backend, result in results.items():
+        if reference is not None:
+            cosine = f"{float(np.min(np.sum(reference * embeddings[backend], axis=1))):.5f}"
+        else:
+            cosine = "n/a"
+        print(
+            f"{backend:<10} {result['load_s']:>7.2f} {result['single_ms']:>10.2f} {result['batch_ms']:>11.1f} "
+            f"{result['loaded_rss_mb']:>8.0f} {result['peak_rss_mb']:>8.0f} {result['model_mb']:>9.1f} {cosine:>8}"
+        )
+
+    print("\ninstalled runtime size (what an image without torch saves):")
+    for package in ("torch", "onnxruntime"):
+        size = package_size_mb(package)
+        print(f"  {package:<12} {f'{size:.0f} MB' if size is not None else 'not installed':>14}")
+
+
+if __name__ == "__main__":
+    main()
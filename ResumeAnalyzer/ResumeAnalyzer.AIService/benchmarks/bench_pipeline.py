@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Per-stage micro-benchmarks for the analysis pipeline.
+Times skill extraction, semantic similarity, skill match scoring, experience
+detection, recommendation generation and the full analysis on deterministic
+synthetic resume/JD pairs (short, typical and long documents). Reports the median
+and best wall time plus the tracemalloc peak for each stage, optionally saved as
+JSON so two commits can be compared.
+
+Usage:
+  python benchmarks/bench_pipeline.py [--encoder stub|real|none] [--spacy none|ner]
+                                      [--sizes short,typical,long] [--repeats 20] [--output run.json]
+  python benchmarks/bench_pipeline.py --compare baseline.json run.json [--threshold 0.10]
+
+--encoder stub (default) runs offline with a hashing encoder; real loads the configured
+ENCODER_BACKEND. Compare mode exits with status 1 if any stage got slower than the threshold.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+from text_chunker import TextChunker  # noqa: E402
+from synthetic import DOCUMENT_SIZES, HashingEncoder, generate_job, generate_resume  # noqa: E402
+
+PAIRS_PER_SIZE = 3
+
+
+def build_stages(resume_text: str, job_text: str) -> dict:
+    """Stage name -> zero-argument callable, with features precomputed so each stage runs alone"""
+    resume_skills = main.flatten_skills(main.extract_advanced_skills(resume_text))
+    job_skills = main.flatten_skills(main.extract_advanced_skills(job_text))
+    missing_skills = list(job_skills - resume_skills)
+    return {
+        "extract_skills": lambda: (main.extract_advanced_skills(resume_text), main.extract_advanced_skills(job_text)),
+        "semantic_similarity": lambda: main.calculate_semantic_similarity(resume_text, job_text),
+        "skill_match": lambda: main.calculate_skill_match_score(resume_skills, job_skills),
+        "experience": lambda: (main.detect_experience_level(resume_text), main.detect_job_experience_requirement(job_text)),
+        "recommendation": lambda: main.generate_smart_recommendation(60.0, missing_skills, resume_skills, job_skills),
+        "end_to_end": lambda: main.score_analysis(*main.compute_analysis_features(resume_text, job_text)),
+    }
+
+
+def measure(func, repeats: int) -> dict:
+    """Median and best wall time in ms over the repeats, then the tracemalloc peak of one extra run"""
+    func()  # warm-up
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"median_ms": statistics.median(times), "best_ms": min(times), "peak_kb": peak / 1024}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def setup_models(encoder: str, spacy_mode: str):
+    """Install the requested encoder and spaCy pipeline on the main module"""
+    if encoder == "stub":
+        main.sentence_model = HashingEncoder()
+    elif encoder == "real":
+        main.sentence_model, main.encoder_backend = main.load_sentence_model()
+        if main.sentence_model is None:
+            sys.exit("Could not load the sentence encoder; use --encoder stub to run offline")
+    if main.sentence_model is not None:
+        main.text_chunker = TextChunker.for_model(main.sentence_model, main.CHUNK_MAX_TOKENS, main.CHUNK_MAX_PER_DOCUMENT)
+    if spacy_mode == "ner":
+        import spacy
+        main.spacy_nlp = spacy.load("en_core_web_sm", exclude=main.SPACY_NON_NER_COMPONENTS)
+
+
+def run(args) -> dict:
+    setup_models(args.encoder, args.spacy)
+    results = {}
+    for size in args.sizes:
+        pairs = [
+            (generate_resume(main.taxonomy.domain_skills, size, seed), generate_job(main.taxonomy.domain_skills, size, seed))
+            for seed in range(PAIRS_PER_SIZE)
+        ]
+        stage_runs = {}
+        for resume_text, job_text in pairs:
+            for stage, func in build_stages(resume_text, job_text).items():
+                stage_runs.setdefault(stage, []).append(measure(func, args.repeats))
+        # Average the per-pair measurements
+        results[size] = {
+            stage: {key: round(statistics.mean(run[key] for run in runs), 4) for key in runs[0]}
+            for stage, runs in stage_runs.items()
+        }
+        results[size]["_document"] = {
+            "resume_chars": round(statistics.mean(len(resume) for resume, _ in pairs)),
+            "job_chars": round(statistics.mean(len(job) for _, job in pairs)),
+        }
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "encoder": args.encoder if args.encoder != "real" else f"real ({main.encoder_backend})",
+            "spacy": args.spacy,
+            "repeats": args.repeats,
+            "pairs_per_size": PAIRS_PER_SIZE,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def print_report(report: dict):
+    meta = report["meta"]
+    print(f"revision {meta['revision']}  encoder {meta['encoder']}  spacy {meta['spacy']}  repeats {meta['repeats']}")
+    for size, stages in report["results"].items():
+        document = stages["_document"]
+        print(f"\n{size}: resume {document['resume_chars']} chars, job {document['job_chars']} chars")
+        print(f"  {'stage':<22} {'median ms':>10} {'best ms':>10} {'peak KB':>10}")
+        for stage, result in stages.items():
+            if stage.startswith("_"):
+                continue
+            print(f"  {stage:<22} {result['median_ms']:>10.3f} {result['best_ms']:>10.3f} {result['peak_kb']:>10.1f}")
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    """Print per-stage median time ratios; returns 1 if any stage regressed beyond the threshold"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+    print(f"baseline {baseline['meta']['revision']} ({baseline['meta']['encoder']}) -> "
+          f"current {current['meta']['revision']} ({current['meta']['encoder']})")
+    print(f"{'size':<8} {'stage':<22} {'base ms':>10} {'new ms':>10} {'ratio':>7} {'base KB':>9} {'new KB':>9}")
+    regressions = 0
+    for size, stages in current["results"].items():
+        for stage, result in stages.items():
+            before = baseline["results"].get(size, {}).get(stage)
+            if stage.startswith("_") or before is None:
+                continue
+            ratio = result["median_ms"] / max(before["median_ms"], 1e-9)
+            flag = ""
+            if ratio > 1 + threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            elif ratio < 1 - threshold:
+                flag = "  faster"
+            print(f"{size:<8} {stage:<22} {before['median_ms']:>10.3f} {result['median_ms']:>10.3f} {ratio:>6.2f}x "
+                  f"{before['peak_kb']:>9.1f} {result['peak_kb']:>9.1f}{flag}")
+    print(f"\n{regressions} stage(s) slower than {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--encoder", choices=["stub", "real", "none"], default="stub")
+    parser.add_argument("--spacy", choices=["none", "ner"], default="none")
+    parser.add_argument("--sizes", default=",".join(DOCUMENT_SIZES), help="comma-separated document sizes")
+    parser.add_argument("--repeats", type=int, default=20, help="timed runs per stage and document pair")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="compare two JSON reports")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(compare(*args.compare, args.threshold))
+
+    args.sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    unknown = [size for size in args.sizes if size not in DOCUMENT_SIZES]
+    if unknown:
+        parser.error(f"unknown sizes {unknown}, choose from {list(DOCUMENT_SIZES)}")
+
+    # The per-call analysis logging would dominate the timings
+    logging.disable(logging.INFO)
+    report = run(args)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nreport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
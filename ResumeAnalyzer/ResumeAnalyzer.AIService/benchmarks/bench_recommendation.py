@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark generate_smart_recommendation at batch scale.
+Compares the previous implementation (core and domain skill sets rebuilt on every
+call, likely domain from ten set intersections, missing skills partitioned with
+list membership checks) with the precomputed RecommendationIndex, on skill sets
+extracted from deterministic synthetic resume/JD pairs. Every recommendation is
+checked to be identical.
+
+Usage: python benchmarks/bench_recommendation.py [--batch 10000] [--repeats 5]
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main  # noqa: E402
+from synthetic import DOCUMENT_SIZES, generate_job, generate_resume  # noqa: E402
+
+PAIRS_PER_SIZE = 20
+
+
+def legacy_recommendation(match_percentage: float, missing_skills: List[str],
+                          resume_skills: set, job_skills: set) -> str:
+    """The previous implementation; the set copies stand in for the literals it built on every call"""
+    core_skills = set(main.taxonomy.core_skills)
+    domain_core_skills = {domain: set(skills) for domain, skills in main.taxonomy.domain_core_skills.items()}
+
+    likely_domain = None
+    max_overlap = 0
+    for domain, skills in domain_core_skills.items():
+        overlap = len(skills & job_skills)
+        if overlap > max_overlap:
+            max_overlap = overlap
+            likely_domain = domain
+
+    if likely_domain:
+        domain_priority_skills = domain_core_skills[likely_domain]
+        high_priority_missing = [s for s in missing_skills if s in domain_priority_skills or s in core_skills]
+        other_missing = [s for s in missing_skills if s not in high_priority_missing]
+    else:
+        high_priority_missing = [s for s in missing_skills if s in core_skills]
+        other_missing = [s for s in missing_skills if s not in high_priority_missing]
+
+    if match_percentage >= 85:
+        if high_priority_missing:
+            return f"Excellent match! Your profile is very strong. To make it even better, consider highlighting or gaining some exposure to {', '.join(high_priority_missing[:2])}."
+        else:
+            return "Outstanding match! Your profile shows excellent alignment with the role requirements. Focus on highlighting your relevant experiences in these areas."
+    elif match_percentage >= 70:
+        if high_priority_missing:
+            return f"Strong match! Your background aligns well with the role. To strengthen your profile further, consider focusing on {', '.join(high_priority_missing[:2])}. These skills are particularly valuable in this field."
+        else:
+            return f"Very good match! While you have the core skills, you might want to explore {', '.join(other_missing[:2])} to broaden your expertise."
+    elif match_percentage >= 50:
+        core_gaps = len(high_priority_missing)
+        if core_gaps > 0:
+            return f"Good foundation! Focus first on these key skills: {', '.join(high_priority_missing[:3])}. These are fundamental for this role and will significantly strengthen your profile."
+        else:
+            return f"Good potential! You have the core skills. Consider developing knowledge in {', '.join(other_missing[:3])} to become an even stronger candidate."
+    else:
+        if high_priority_missing:
+            return f"Your profile shows potential, but there are some gaps in core skills. Focus on building expertise in: {', '.join(high_priority_missing[:3])}. These are fundamental skills for this role."
+        else:
+            return f"Consider focusing on building a foundation in {', '.join(missing_skills[:4])}. Look for courses, projects, or certifications in these areas to strengthen your candidacy."
+
+
+def build_batch(size: int) -> list:
+    """(match percentage, missing skills, resume skills, job skills) argument tuples from synthetic pairs"""
+    pairs = []
+    vocabulary = main.taxonomy.domain_skills
+    for document_size in DOCUMENT_SIZES:
+        for seed in range(PAIRS_PER_SIZE):
+            resume_skills = main.flatten_skills(main.extract_advanced_skills(generate_resume(vocabulary, document_size, seed)))
+            job_skills = main.flatten_skills(main.extract_advanced_skills(generate_job(vocabulary, document_size, seed)))
+            pairs.append((list(job_skills - resume_skills), resume_skills, job_skills))
+    rng = random.Random(42)
+    return [(rng.uniform(5, 95), *pairs[i % len(pairs)]) for i in range(size)]
+
+
+def time_batch(func, batch: list, repeats: int) -> float:
+    """Best wall time in milliseconds for one pass over the batch"""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for args in batch:
+            func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", type=int, default=10000, help="recommendations per timed pass")
+    parser.add_argument("--repeats", type=int, default=5, help="timed passes (best is reported)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    batch = build_batch(args.batch)
+    # Without the metrics decorator, so both sides do the same work
+    current = main.generate_smart_recommendation.__wrapped__
+
+    mismatches = sum(legacy_recommendation(*item) != current(*item) for item in batch)
+    missing_counts = sorted(len(item[1]) for item in batch)
+    legacy_ms = time_batch(legacy_recommendation, batch, args.repeats)
+    index_ms = time_batch(current, batch, args.repeats)
+
+    print(f"{len(batch)} recommendations, missing skills per call: median {missing_counts[len(batch) // 2]}, max {missing_counts[-1]}")
+    print(f"{'implementation':<22} {'batch ms':>10} {'us/call':>9} {'calls/s':>10}")
+    for label, ms in (("previous", legacy_ms), ("recommendation index", index_ms)):
+        print(f"{label:<22} {ms:>10.2f} {ms * 1000 / len(batch):>9.2f} {len(batch) / (ms / 1000):>10.0f}")
+    print(f"speedup {legacy_ms / index_ms:.1f}x, {mismatches} differing recommendations")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Benchmark serve.py throughput and memory by worker count.
+For each worker count the server is started in a subprocess with the result cache
+and embedding store off, so every request runs the full pipeline. Concurrent
+clients post distinct synthetic resume/JD pairs to /analyze for a fixed time, each
+request on a new connection so requests spread across the workers. Reports
+requests per second, scaling relative to the first worker count, latency
+percentiles, and the RSS and PSS totals of the server's process tree. PSS counts
+the model pages shared by the workers once, so its growth per added worker is the
+real memory cost of a worker.
+
+Uses the configured ENCODER_BACKEND and SPACY_PIPELINE, like the service.
+
+Usage: python benchmarks/bench_workers.py [--workers 1,2,4] [--concurrency 16] [--seconds 20]
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import List
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+from process_memory import memory_usage  # noqa: E402
+from synthetic import generate_job, generate_resume  # noqa: E402
+from taxonomy import DEFAULT_TAXONOMY_PATH, read_source  # noqa: E402
+
+PAIRS = 200
+READY_TIMEOUT = 600
+
+
+def build_requests(size: str) -> List[bytes]:
+    """Distinct /analyze bodies from deterministic synthetic pairs"""
+    vocabulary = read_source(DEFAULT_TAXONOMY_PATH)[0]["domain_skills"]
+    return [
+        json.dumps({
+            "resume_text": generate_resume(vocabulary, size, seed),
+            "job_text": generate_job(vocabulary, size, seed),
+        }).encode("utf-8")
+        for seed in range(PAIRS)
+    ]
+
+
+def process_tree(pid: int) -> List[int]:
+    """pid and its descendants"""
+    pids = [pid]
+    for current in pids:
+        try:
+            with open(f"/proc/{current}/task/{current}/children") as f:
+                pids.extend(int(child) for child in f.read().split())
+        except OSError:
+            pass
+    return pids
+
+
+def wait_ready(url: str, server: subprocess.Popen):
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"{url}/ready", timeout=5) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.5)
+    raise RuntimeError("server did not become ready")
+
+
+def run_load(url: str, bodies: List[bytes], concurrency: int, seconds: float) -> dict:
+    """Post bodies from concurrent clients for the given time; returns throughput and latency"""
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + seconds
+
+    def client(offset: int):
+        i = offset
+        while time.monotonic() < stop_at:
+            request = urllib.request.Request(
+                f"{url}/analyze", data=bodies[i % len(bodies)],
+                headers={"Content-Type": "application/json", "Connection": "close"},
+            )
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=120) as response:
+                    response.read()
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+            except (urllib.error.URLError, OSError):
+                with lock:
+                    errors[0] += 1
+            i += concurrency
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(offset,)) for offset in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0,
+    }
+
+
+def measure(workers: int, port: int, bodies: List[bytes], concurrency: int, seconds: float) -> dict:
+    """Start serve.py with the given worker count, load it and sum the memory of its processes"""
+    url = f"http://127.0.0.1:{port}"
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ, RESULT_CACHE_MAX_ENTRIES="0", EMBEDDING_STORE_PATH="",
+            SHARED_STORE_PATH=os.path.join(directory, "shared.sqlite3"),
+            CANDIDATE_INDEX_DIR=os.path.join(directory, "candidates") if workers == 1 else "",
+        )
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(SERVICE_DIR, "serve.py"), "--workers", str(workers),
+             "--host", "127.0.0.1", "--port", str(port), "--memory-report-seconds", "0"],
+            cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(url, server)
+            # One pass over a few bodies so lazy initialization is not timed
+            run_load(url, bodies[:concurrency], concurrency, 1.0)
+            result = run_load(url, bodies, concurrency, seconds)
+            usages = [memory_usage(pid) or {} for pid in process_tree(server.pid)]
+            result["rss_mb"] = sum(usage.get("rss_bytes", 0) for usage in usages) / 1024 / 1024
+            result["pss_mb"] = sum(usage.get("pss_bytes", 0) for usage in usages) / 1024 / 1024
+        finally:
+            server.send_signal(signal.SIGTERM)
+            try:
+                server.wait(timeout=60)
+            except subprocess.TimeoutExpired:
+                server.kill()
+    return result
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent clients")
+    parser.add_argument("--seconds", type=float, default=20, help="timed load per worker count")
+    parser.add_argument("--size", default="typical", choices=["short", "typical", "long"], help="synthetic document size")
+    parser.add_argument("--port", type=int, default=7870)
+    args = parser.parse_args()
+
+    bodies = build_requests(args.size)
+    print(f"{os.cpu_count()} CPUs, {args.concurrency} clients, {args.seconds:.0f}s per run, {args.size} documents")
+    print(f"{'workers':>7} {'req/s':>8} {'scaling':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7} {'RSS MB':>8} {'PSS MB':>8}")
+    baseline = None
+    for workers in [int(count) for count in args.workers.split(",")]:
+        result = measure(workers, args.port, bodies, args.concurrency, args.seconds)
+        baseline = baseline or result
+        print(
+            f"{workers:>7} {result['rps']:>8.1f} {result['rps'] / baseline['rps']:>7.2f}x {result['p50_ms']:>8.1f} "
+            f"{result['p95_ms']:>8.1f} {result['errors']:>7} {result['rss_mb']:>8.0f} {result['pss_mb']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main_cli()
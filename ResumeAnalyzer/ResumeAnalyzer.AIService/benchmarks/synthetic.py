@@ -0,0 +1,122 @@
+"""
+Deterministic synthetic resumes and job descriptions for the benchmarks.
+Documents are assembled from sentence templates filled with skills drawn from the
+service's domain_skills vocabulary, so skill extraction, experience detection and
+scoring see realistic input. The same seed always produces the same documents.
+"""
+
+import hashlib
+import random
+from typing import Dict, List
+
+import numpy as np
+
+# Sentences per document for each size
+DOCUMENT_SIZES = {
+    "short": 8,        # a few lines pasted into a form
+    "typical": 40,     # a one or two page resume / detailed JD
+    "long": 400,       # a 20-page academic CV
+}
+
+RESUME_TEMPLATES = [
+    "Built and maintained {a} services using {b} and {c}",
+    "Led a team of {n} engineers delivering {a} features on {b}",
+    "Migrated legacy {a} applications to {b}, cutting costs by {n} percent",
+    "Designed {a} pipelines with {b} for {n} internal teams",
+    "Improved {a} performance by {n}x through profiling and {b} tuning",
+    "Mentored junior developers on {a} best practices",
+    "Introduced {a} and {b} to the team's delivery process",
+    "Collaborated with product managers and designers on {a} projects",
+    "Presented {a} results to stakeholders every quarter",
+    "Volunteered as a tutor for students learning {a}",
+]
+RESUME_EXPERIENCE = [
+    "{n} years of experience in software development",
+    "Senior engineer with {n}+ years of experience",
+    "Junior developer and recent graduate with internship experience",
+    "Lead developer responsible for architecture decisions",
+    "Entry level analyst eager to learn",
+]
+JOB_TEMPLATES = [
+    "We are looking for an engineer with strong {a} skills",
+    "Experience with {a} and {b} is required",
+    "Familiarity with {a} is a plus",
+    "You will build {a} services and maintain our {b} infrastructure",
+    "Work closely with the {a} team on customer-facing features",
+    "Knowledge of {a}, {b} or {c} is preferred",
+    "Our stack includes {a}, {b} and {c}",
+]
+JOB_EXPERIENCE = [
+    "Minimum {n} years of experience required",
+    "{n}+ years of professional experience",
+    "This is a senior position",
+    "Entry level role, fresh graduates welcome",
+    "Mid-level position with room to grow",
+]
+FILLER = [
+    "Strong communication and problem solving skills",
+    "Comfortable working in a fast-paced environment",
+    "Fluent in English",
+    "References available on request",
+    "Hobbies include hiking, chess and photography",
+]
+
+
+def _sentence(rng: random.Random, template: str, skills: List[str]) -> str:
+    a, b, c = rng.sample(skills, 3) if len(skills) >= 3 else (skills * 3)[:3]
+    return template.format(a=a, b=b, c=c, n=rng.randint(2, 15))
+
+
+def _document(rng: random.Random, domain_skills: Dict[str, List[str]], sentences: int,
+              templates: List[str], experience: List[str]) -> str:
+    # Most skills come from two focus domains, the rest from anywhere in the vocabulary
+    domains = sorted(domain_skills)
+    focus = [skill for domain in rng.sample(domains, 2) for skill in domain_skills[domain]]
+    everything = sorted({skill for skills in domain_skills.values() for skill in skills})
+
+    lines = [_sentence(rng, rng.choice(experience), focus)]
+    for _ in range(sentences - 1):
+        roll = rng.random()
+        if roll < 0.7:
+            lines.append(_sentence(rng, rng.choice(templates), focus))
+        elif roll < 0.85:
+            lines.append(_sentence(rng, rng.choice(templates), everything))
+        elif roll < 0.9:
+            lines.append(_sentence(rng, rng.choice(experience), focus))
+        else:
+            lines.append(rng.choice(FILLER))
+    return ". ".join(lines) + "."
+
+
+def generate_resume(domain_skills: Dict[str, List[str]], size: str, seed: int) -> str:
+    """A synthetic resume of the given size ("short", "typical" or "long")"""
+    rng = random.Random(f"resume-{size}-{seed}")
+    return _document(rng, domain_skills, DOCUMENT_SIZES[size], RESUME_TEMPLATES, RESUME_EXPERIENCE)
+
+
+def generate_job(domain_skills: Dict[str, List[str]], size: str, seed: int) -> str:
+    """A synthetic job description of the given size; job texts are a quarter of the resume length"""
+    rng = random.Random(f"job-{size}-{seed}")
+    return _document(rng, domain_skills, max(4, DOCUMENT_SIZES[size] // 4), JOB_TEMPLATES, JOB_EXPERIENCE)
+
+
+class HashingEncoder:
+    """Offline stand-in for the sentence transformer: deterministic vectors from a hash of each sentence"""
+
+    max_seq_length = 256
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def encode(self, sentences, batch_size: int = 32, **kwargs) -> np.ndarray:
+        if isinstance(sentences, str):
+            return self.encode([sentences])[0]
+        embeddings = np.empty((len(sentences), self.dimension), dtype=np.float32)
+        for i, sentence in enumerate(sentences):
+            seed = int.from_bytes(hashlib.sha256(sentence.encode()).digest()[:8], "little")
+            embeddings[i] = np.random.default_rng(seed).standard_normal(self.dimension)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings
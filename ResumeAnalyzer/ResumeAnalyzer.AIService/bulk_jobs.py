@@ -0,0 +1,363 @@
+"""
+Bulk analysis jobs: JSONL uploads analyzed in the background with checkpoints.
+Each job is a directory under the bulk job directory holding the uploaded input,
+the results written so far and a small state file. Input is read and analyzed in
+batches with a bounded number in flight, so memory stays constant however large
+the upload is. Results are appended in input order; after each batch the results
+file is synced and the state file records the input offset and the committed
+results size. A job interrupted by a restart continues from its last checkpoint
+when the service starts again. A lock file makes sure only one process works on
+a job, so every worker of serve.py can resume jobs safely. A job whose lock is
+held elsewhere is retried until it is finished, so when a worker is replaced
+while it runs a job, the worker that found the job at startup takes it over.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import shutil
+import time
+import uuid
+from collections import deque
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+UNFINISHED = (QUEUED, RUNNING)
+
+_STATE_FILE = "state.json"
+_INPUT_FILE = "input.jsonl"
+_RESULTS_FILE = "results.jsonl"
+_LOCK_FILE = "lock"
+_CANCEL_FILE = "cancel"
+_READ_CHUNK = 64 * 1024
+LOCK_RETRY_SECONDS = 5.0  # Delay before retrying a job another process holds the lock of
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured maximum size"""
+
+
+class BulkJobManager:
+    """Bulk jobs stored on disk, run one at a time per process by a background task"""
+
+    def __init__(self, directory: str, analyze_batch: Callable[[List[dict]], Awaitable[List[dict]]],
+                 batch_size: int, concurrency: int, max_upload_bytes: int, retention_seconds: float,
+                 is_ready: Callable[[], bool] = lambda: True, lock_retry_seconds: float = LOCK_RETRY_SECONDS):
+        # analyze_batch maps records to outcomes ({"result": ...} or {"error": ...}) in order
+        self.directory = directory
+        self.analyze_batch = analyze_batch
+        self.batch_size = max(1, batch_size)
+        self.concurrency = max(1, concurrency)
+        self.max_upload_bytes = max_upload_bytes
+        self.retention_seconds = retention_seconds
+        self.is_ready = is_ready
+        self.lock_retry_seconds = lock_retry_seconds
+        self.completed = 0
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._waiting: Dict[str, asyncio.TimerHandle] = {}  # Jobs locked by another process -> pending retry
+        self._runner: Optional[asyncio.Task] = None
+        self._current: Optional[str] = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, job_id: str, name: str = "") -> str:
+        # Job ids are generated hex uuids; anything else could escape the directory
+        if len(job_id) != 32 or not all(c in "0123456789abcdef" for c in job_id):
+            raise KeyError(job_id)
+        return os.path.join(self.directory, job_id, name)
+
+    def start(self):
+        """Remove expired jobs, queue the unfinished ones and start the background runner"""
+        now = time.time()
+        unfinished = []
+        for job_id in os.listdir(self.directory):
+            state = self._read_state(job_id)
+            if state is None:
+                continue
+            if state["status"] in UNFINISHED:
+                unfinished.append(state)
+            elif now - (state["finished_at"] or state["created_at"]) > self.retention_seconds:
+                shutil.rmtree(self._path(job_id), ignore_errors=True)
+        for state in sorted(unfinished, key=lambda state: state["created_at"]):
+            self._queue.put_nowait(state["job_id"])
+        if unfinished:
+            logger.info(f"Resuming {len(unfinished)} unfinished bulk jobs")
+        self._runner = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Stop the runner; the batch in progress is redone from the last checkpoint next time"""
+        if self._runner is not None:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        for handle in self._waiting.values():
+            handle.cancel()
+        self._waiting.clear()
+
+    async def create(self, chunks: AsyncIterator[bytes]) -> dict:
+        """Store an uploaded JSONL stream as a new queued job and return its state"""
+        job_id = uuid.uuid4().hex
+        os.makedirs(self._path(job_id))
+        size = 0
+        lines = 0
+        last_byte = b"\n"
+        try:
+            with open(self._path(job_id, _INPUT_FILE), "wb") as f:
+                async for chunk in chunks:
+                    if not chunk:
+                        continue
+                    size += len(chunk)
+                    if size > self.max_upload_bytes:
+                        raise UploadTooLargeError(f"Upload exceeds {self.max_upload_bytes} bytes")
+                    lines += chunk.count(b"\n")
+                    last_byte = chunk[-1:]
+                    await asyncio.to_thread(f.write, chunk)
+            if size == 0:
+                raise ValueError("The upload is empty")
+        except BaseException:
+            shutil.rmtree(self._path(job_id), ignore_errors=True)
+            raise
+        state = {
+            "job_id": job_id,
+            "status": QUEUED,
+            "total_lines": lines + (last_byte != b"\n"),
+            "lines_read": 0,
+            "succeeded": 0,
+            "failed": 0,
+            "input_offset": 0,
+            "results_bytes": 0,
+            "created_at": time.time(),
+            "started_at": None,
+            "updated_at": None,
+            "finished_at": None,
+            "error": None,
+        }
+        self._write_state(state)
+        self._queue.put_nowait(job_id)
+        logger.info(f"Bulk job {job_id} queued: {state['total_lines']} lines, {size} bytes")
+        return state
+
+    def status(self, job_id: str) -> Optional[dict]:
+        """Current state of a job, or None if it does not exist"""
+        return self._read_state(job_id)
+
+    def iter_results(self, job_id: str) -> Iterator[bytes]:
+        """Committed results so far, in input order (a job still running has more to come)"""
+        state = self._read_state(job_id)
+        remaining = state["results_bytes"]
+        with open(self._path(job_id, _RESULTS_FILE), "rb") as f:
+            while remaining > 0:
+                chunk = f.read(min(_READ_CHUNK, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+
+    def delete(self, job_id: str) -> bool:
+        """Cancel a job and remove its files; a job being processed is removed by its runner"""
+        try:
+            job_dir = self._path(job_id)
+        except KeyError:
+            return False
+        if not os.path.isdir(job_dir):
+            return False
+        lock_fd = self._try_lock(job_id)
+        if lock_fd is None:
+            # Another task or process is working on it: it stops at the next batch
+            open(self._path(job_id, _CANCEL_FILE), "w").close()
+            return True
+        try:
+            shutil.rmtree(job_dir, ignore_errors=True)
+        finally:
+            os.close(lock_fd)
+        return True
+
+    def stats(self) -> dict:
+        """Jobs waiting in this process's queue, jobs waiting for another process to release them,
+        the job being processed and jobs completed since startup"""
+        return {
+            "queued": self._queue.qsize(),
+            "waiting": len(self._waiting),
+            "running": self._current is not None,
+            "completed": self.completed,
+        }
+
+    def _read_state(self, job_id: str) -> Optional[dict]:
+        try:
+            with open(self._path(job_id, _STATE_FILE)) as f:
+                return json.load(f)
+        except (KeyError, OSError, ValueError):
+            return None
+
+    def _write_state(self, state: dict):
+        # Written to a temporary file and renamed, so readers never see a partial state
+        path = self._path(state["job_id"], _STATE_FILE)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(state, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f"{path}.tmp", path)
+
+    def _try_lock(self, job_id: str) -> Optional[int]:
+        """Exclusive lock on a job, or None if another task or process holds it"""
+        fd = os.open(self._path(job_id, _LOCK_FILE), os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return None
+        return fd
+
+    async def _run(self):
+        while True:
+            job_id = await self._queue.get()
+            while not self.is_ready():
+                await asyncio.sleep(1)
+            self._current = job_id
+            try:
+                await self._process(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Bulk job {job_id} failed: {str(e)}")
+                state = self._read_state(job_id)
+                if state is not None:
+                    state.update(status=FAILED, error=str(e), finished_at=time.time())
+                    self._write_state(state)
+            finally:
+                self._current = None
+
+    async def _process(self, job_id: str):
+        if not os.path.isdir(self._path(job_id)):
+            return
+        lock_fd = self._try_lock(job_id)
+        if lock_fd is None:
+            # The holder may be a worker that is being replaced; if it stops before the job
+            # is finished, the retry finds the lock free and resumes from the checkpoint
+            logger.info(f"Bulk job {job_id} is being processed by another process, retrying in {self.lock_retry_seconds}s")
+            self._retry_later(job_id)
+            return
+        try:
+            state = self._read_state(job_id)
+            if state is None or state["status"] not in UNFINISHED:
+                return
+            resumed = state["lines_read"] > 0
+            state.update(status=RUNNING, started_at=state["started_at"] or time.time())
+            self._write_state(state)
+            logger.info(f"{'Resuming' if resumed else 'Starting'} bulk job {job_id} at line {state['lines_read']}")
+
+            with open(self._path(job_id, _INPUT_FILE), "rb") as source, \
+                    open(self._path(job_id, _RESULTS_FILE), "ab") as results:
+                # Results written after the last checkpoint belong to a batch that is redone
+                results.truncate(state["results_bytes"])
+                source.seek(state["input_offset"])
+                if not await self._run_batches(job_id, state, source, results):
+                    return
+            state.update(status=COMPLETED, finished_at=time.time())
+            self._write_state(state)
+            self.completed += 1
+            logger.info(
+                f"Bulk job {job_id} completed: {state['succeeded']} analyzed, {state['failed']} failed "
+                f"in {state['finished_at'] - state['started_at']:.1f}s"
+            )
+        finally:
+            os.close(lock_fd)
+
+    def _retry_later(self, job_id: str):
+        def requeue():
+            self._waiting.pop(job_id, None)
+            self._queue.put_nowait(job_id)
+
+        if job_id not in self._waiting:
+            self._waiting[job_id] = asyncio.get_running_loop().call_later(self.lock_retry_seconds, requeue)
+
+    async def _run_batches(self, job_id: str, state: dict, source, results) -> bool:
+        """Analyze the remaining input with up to `concurrency` batches in flight; False if cancelled"""
+        in_flight: deque = deque()  # (analysis task, input offset after the batch, lines in the batch)
+        line_number = state["lines_read"]
+        try:
+            while True:
+                entries, lines, offset = await asyncio.to_thread(self._read_batch, source, line_number)
+                line_number += lines
+                if lines:
+                    in_flight.append((asyncio.ensure_future(self._analyze(entries)), offset, lines))
+                while in_flight and (len(in_flight) >= self.concurrency or not lines):
+                    if os.path.exists(self._path(job_id, _CANCEL_FILE)):
+                        logger.info(f"Bulk job {job_id} cancelled at line {state['lines_read']}")
+                        shutil.rmtree(self._path(job_id), ignore_errors=True)
+                        return False
+                    await self._commit(state, results, *in_flight.popleft())
+                if not lines:
+                    return True
+        finally:
+            for task, _, _ in in_flight:
+                task.cancel()
+
+    def _read_batch(self, source, line_number: int) -> Tuple[List[Tuple[int, object]], int, int]:
+        """Up to batch_size non-blank lines as (line number, record or parse error), lines consumed, offset"""
+        entries = []
+        lines = 0
+        while len(entries) < self.batch_size:
+            line = source.readline()
+            if not line:
+                break
+            lines += 1
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("each line must be a JSON object")
+            except ValueError as e:
+                record = ValueError(f"Invalid JSON: {str(e)}")
+            entries.append((line_number + lines, record))
+        return entries, lines, source.tell()
+
+    async def _analyze(self, entries: List[Tuple[int, object]]) -> Tuple[bytes, int, int]:
+        """Result lines for a batch, with the number of successes and failures"""
+        records = [record for _, record in entries if isinstance(record, dict)]
+        try:
+            outcomes = iter(await self.analyze_batch(records)) if records else iter(())
+        except Exception as e:
+            logger.error(f"Bulk batch analysis failed: {str(e)}")
+            outcomes = iter([{"error": f"Analysis failed: {str(e)}"}] * len(records))
+        lines = []
+        failed = 0
+        for line_number, record in entries:
+            if isinstance(record, dict):
+                outcome = next(outcomes)
+                output = {"line": line_number, "id": record.get("id"), **outcome}
+            else:
+                output = {"line": line_number, "id": None, "error": str(record)}
+            failed += "error" in output
+            lines.append(json.dumps(output))
+        return ("\n".join(lines) + "\n").encode("utf-8") if lines else b"", len(lines) - failed, failed
+
+    async def _commit(self, state: dict, results, task: asyncio.Task, offset: int, lines: int):
+        """Append a finished batch's results and checkpoint the job after it"""
+        data, succeeded, failed = await task
+
+        def write():
+            results.write(data)
+            results.flush()
+            os.fsync(results.fileno())
+            return results.tell()
+
+        state.update(
+            results_bytes=await asyncio.to_thread(write),
+            input_offset=offset,
+            lines_read=state["lines_read"] + lines,
+            succeeded=state["succeeded"] + succeeded,
+            failed=state["failed"] + failed,
+            updated_at=time.time(),
+        )
+        await asyncio.to_thread(self._write_state, state)
@@ -0,0 +1,220 @@
+"""
+Indexed resume corpus for candidate search.
+Each resume gets one row: a normalized MiniLM document vector in a memory-mapped
+float32 array, plus its extracted skills in an inverted skill -> rows index.
+Metadata (resume id, text, skills, experience) is kept in SQLite next to the vectors.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_CAPACITY = 1024
+SCORE_BLOCK_ROWS = 8192  # Candidate vectors scored per block in shortlist (12MB at 384 dimensions)
+
+
+@dataclass
+class CandidateEntry:
+    """A resume ready to be added to the index"""
+    resume_id: str
+    resume_text: str
+    skills: set
+    experience: str
+    vector: Optional[np.ndarray] = None  # Normalized document vector, None without the sentence model
+
+
+class CandidateIndex:
+    """Memory-mapped vector store with an inverted skill index"""
+
+    def __init__(self, directory: str, dim: int):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "candidates.sqlite3"), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS resumes ("
+            "row INTEGER PRIMARY KEY, resume_id TEXT NOT NULL, resume_text TEXT NOT NULL, "
+            "skills TEXT NOT NULL, experience TEXT NOT NULL, deleted INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS resumes_resume_id ON resumes (resume_id)")
+
+        stored_dim = self._conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        if stored_dim is None:
+            self._conn.execute("INSERT INTO meta VALUES ('dim', ?)", (str(dim),))
+        elif int(stored_dim[0]) != dim:
+            raise ValueError(f"Candidate index at {directory} has dimension {stored_dim[0]}, model has {dim}")
+        self.dim = dim
+
+        # Rebuild the in-memory state: row count, active flags, resume_id -> row and skill postings
+        self._size = self._conn.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM resumes").fetchone()[0]
+        self._vectors_path = os.path.join(directory, "vectors.f32")
+        self._vectors = self._open_vectors(max(self._size, _INITIAL_CAPACITY))
+        self._active = np.zeros(len(self._vectors), dtype=bool)
+        self._rows: Dict[str, int] = {}
+        self._postings: Dict[str, array] = {}
+        for row, resume_id, skills in self._conn.execute("SELECT row, resume_id, skills FROM resumes WHERE deleted = 0"):
+            self._active[row] = True
+            self._rows[resume_id] = row
+            for skill in json.loads(skills):
+                self._postings.setdefault(skill, array("q")).append(row)
+        logger.info(f"Candidate index opened at {directory} with {len(self._rows)} resumes")
+
+    def _open_vectors(self, capacity: int) -> np.memmap:
+        """Map the vector file, growing it to hold at least capacity rows"""
+        required_bytes = capacity * self.dim * 4
+        mode = "r+" if os.path.exists(self._vectors_path) else "w+"
+        if mode == "r+" and os.path.getsize(self._vectors_path) < required_bytes:
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(required_bytes)
+        rows = max(capacity, os.path.getsize(self._vectors_path) // (self.dim * 4)) if mode == "r+" else capacity
+        return np.memmap(self._vectors_path, dtype=np.float32, mode=mode, shape=(rows, self.dim))
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= len(self._vectors):
+            return
+        capacity = len(self._vectors)
+        while capacity < rows:
+            capacity *= 2
+        self._vectors.flush()
+        self._vectors = self._open_vectors(capacity)
+        active = np.zeros(capacity, dtype=bool)
+        active[:len(self._active)] = self._active
+        self._active = active
+
+    def add_many(self, entries: List[CandidateEntry]):
+        """Add or replace resumes; an existing resume_id is superseded by the new entry"""
+        with self._lock:
+            self._ensure_capacity(self._size + len(entries))
+            new_rows: Dict[str, int] = {}
+            superseded: List[int] = []
+            self._conn.execute("BEGIN")
+            try:
+                for offset, entry in enumerate(entries):
+                    row = self._size + offset
+                    previous = new_rows.get(entry.resume_id, self._rows.get(entry.resume_id))
+                    if previous is not None:
+                        self._conn.execute("UPDATE resumes SET deleted = 1 WHERE row = ?", (previous,))
+                        superseded.append(previous)
+                    self._conn.execute(
+                        "INSERT INTO resumes (row, resume_id, resume_text, skills, experience) VALUES (?, ?, ?, ?, ?)",
+                        (row, entry.resume_id, entry.resume_text, json.dumps(sorted(entry.skills)), entry.experience),
+                    )
+                    # Rows past _size are never searched, so a rolled-back vector is simply overwritten later
+                    self._vectors[row] = entry.vector if entry.vector is not None else 0.0
+                    new_rows[entry.resume_id] = row
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+            # The in-memory index changes only once the rows are committed, so it never
+            # disagrees with the database
+            for offset, entry in enumerate(entries):
+                row = self._size + offset
+                self._active[row] = True
+                for skill in entry.skills:
+                    self._postings.setdefault(skill, array("q")).append(row)
+            # Postings keep superseded rows; inactive rows are filtered out at search time
+            self._active[superseded] = False
+            self._rows.update(new_rows)
+            self._size += len(entries)
+            self._vectors.flush()
+
+    def _remove_locked(self, resume_id: str) -> bool:
+        row = self._rows.get(resume_id)
+        if row is None:
+            return False
+        self._conn.execute("UPDATE resumes SET deleted = 1 WHERE row = ?", (row,))
+        del self._rows[resume_id]
+        self._active[row] = False
+        return True
+
+    def remove(self, resume_id: str) -> bool:
+        """Remove a resume from the index, returning whether it existed"""
+        with self._lock:
+            return self._remove_locked(resume_id)
+
+    def shortlist(self, job_skills: set, job_vector: Optional[np.ndarray],
+                  min_skill_overlap: int, limit: int) -> List[Tuple[int, Optional[float], int]]:
+        """
+        Pre-filter resumes sharing at least min_skill_overlap skills with the job, then
+        return the top rows by cosine similarity to the job vector (by skill overlap without
+        one) as (row, similarity, skill overlap) tuples, best first. The similarity is None
+        without a job vector; resumes indexed without a vector have similarity 0.
+        """
+        with self._lock:
+            size = self._size
+            vectors = self._vectors
+            overlap = np.zeros(size, dtype=np.int32)
+            for skill in job_skills:
+                rows = self._postings.get(skill)
+                if rows:
+                    overlap[np.frombuffer(rows, dtype=np.int64)] += 1
+            candidates = np.nonzero(self._active[:size] & (overlap >= min_skill_overlap))[0]
+        if len(candidates) == 0:
+            return []
+
+        if job_vector is not None:
+            # Candidate vectors are gathered a block at a time, keeping a running top-k,
+            # so a broad query never copies every matching row out of the memory map
+            job_vector = job_vector.astype(np.float32)
+            rows = np.empty(0, dtype=np.int64)
+            scores = np.empty(0, dtype=np.float32)
+            for start in range(0, len(candidates), SCORE_BLOCK_ROWS):
+                block = candidates[start:start + SCORE_BLOCK_ROWS]
+                rows, scores = _top(
+                    np.concatenate([rows, block]), np.concatenate([scores, vectors[block] @ job_vector]), limit
+                )
+        else:
+            rows, scores = _top(candidates, overlap[candidates].astype(np.float32), limit)
+
+        # Best first; ties keep row order
+        order = np.lexsort((rows, -scores))
+        return [
+            (int(rows[i]), float(scores[i]) if job_vector is not None else None, int(overlap[rows[i]]))
+            for i in order
+        ]
+
+    def resumes(self, rows: List[int]) -> Dict[int, Tuple[str, str, set, str]]:
+        """Return (resume_id, resume_text, skills, experience) for the given rows"""
+        placeholders = ",".join("?" * len(rows))
+        with self._lock:
+            found = self._conn.execute(
+                f"SELECT row, resume_id, resume_text, skills, experience FROM resumes WHERE row IN ({placeholders})",
+                rows,
+            ).fetchall()
+        return {
+            row: (resume_id, resume_text, set(json.loads(skills)), experience)
+            for row, resume_id, resume_text, skills, experience in found
+        }
+
+    def stats(self) -> dict:
+        """Indexed resume count and storage location"""
+        return {
+            "directory": self.directory,
+            "resumes": len(self._rows),
+            "rows": self._size,
+            "skills_indexed": len(self._postings),
+        }
+
+
+def _top(rows: np.ndarray, scores: np.ndarray, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+    """The limit highest-scoring rows, unordered"""
+    if len(rows) <= limit:
+        return rows, scores
+    keep = np.argpartition(-scores, limit - 1)[:limit]
+    return rows[keep], scores[keep]
@@ -0,0 +1,148 @@
+"""
+Persistent, content-addressed store for sentence embeddings.
+Chunks are keyed by a hash of the model name and chunk text, so an embedding
+computed once is reused across requests and across process restarts.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+_QUERY_BATCH = 500
+
+# Hits update last_used in memory; the pending updates are written in one transaction
+# with the next put_many, or from a lookup once this many are pending or this old
+TOUCH_FLUSH_ROWS = 1024
+TOUCH_FLUSH_SECONDS = 30.0
+
+
+class EmbeddingStore:
+    """SQLite-backed embedding cache with least-recently-used eviction"""
+
+    def __init__(self, path: str, model_name: str, max_entries: int):
+        self.path = path
+        self.model_name = model_name
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._touched: Dict[bytes, float] = {}  # key -> last use not yet written
+        self._last_flush = time.monotonic()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key BLOB PRIMARY KEY, dim INTEGER NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        logger.info(f"Embedding store opened at {path} with {self._count} cached embeddings")
+
+    def _key(self, chunk: str) -> bytes:
+        return hashlib.sha256(f"{self.model_name}\0{chunk}".encode("utf-8")).digest()
+
+    def get_many(self, chunks: List[str]) -> Dict[str, np.ndarray]:
+        """Return the cached embeddings for the given chunks, keyed by chunk text"""
+        keys = {self._key(chunk): chunk for chunk in chunks}
+        found = {}
+        try:
+            with self._lock:
+                key_list = list(keys)
+                for start in range(0, len(key_list), _QUERY_BATCH):
+                    batch = key_list[start:start + _QUERY_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    rows = self._conn.execute(
+                        f"SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                    ).fetchall()
+                    now = time.time()
+                    for key, dim, vector in rows:
+                        found[keys[key]] = np.frombuffer(vector, dtype=np.float32, count=dim)
+                        self._touched[key] = now
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding store lookup failed: {str(e)}")
+        with self._lock:
+            if len(self._touched) >= TOUCH_FLUSH_ROWS or time.monotonic() - self._last_flush >= TOUCH_FLUSH_SECONDS:
+                try:
+                    self._conn.execute("BEGIN")
+                    self._flush_touched()
+                    self._conn.execute("COMMIT")
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding store last-use update failed: {str(e)}")
+                    if self._conn.in_transaction:
+                        self._conn.execute("ROLLBACK")
+                    self._touched.clear()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, chunks: List[str], embeddings: np.ndarray):
+        """Store embeddings for the given chunks, evicting the least recently used when full"""
+        now = time.time()
+        rows = [
+            (self._key(chunk), int(embedding.shape[0]), np.asarray(embedding, dtype=np.float32).tobytes(), now)
+            for chunk, embedding in zip(chunks, embeddings)
+        ]
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                # Keys are content hashes, so a chunk already stored (by another worker) has the
+                # same vector; it is kept and only its last use is updated
+                inserted = self._conn.executemany("INSERT OR IGNORE INTO embeddings VALUES (?, ?, ?, ?)", rows).rowcount
+                if inserted < len(rows):
+                    self._touched.update((row[0], now) for row in rows)
+                self._flush_touched()
+                self._conn.execute("COMMIT")
+                self._count += inserted
+                if self._count > self.max_entries:
+                    self._evict()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding store write failed: {str(e)}")
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+
+    def _flush_touched(self):
+        """Write the pending last-use times, inside the caller's transaction"""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE embeddings SET last_used = ? WHERE key = ?", [(used, key) for key, used in self._touched.items()]
+            )
+            self._touched.clear()
+        self._last_flush = time.monotonic()
+
+    def _evict(self):
+        # Trim to 90% of capacity so eviction doesn't run on every insert
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = self._count - int(self.max_entries * 0.9)
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (excess,),
+            )
+            self._count -= excess
+            logger.info(f"Evicted {excess} least recently used embeddings")
+
+    def stats(self) -> dict:
+        """Entry count and hit ratio since startup"""
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": self._count,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
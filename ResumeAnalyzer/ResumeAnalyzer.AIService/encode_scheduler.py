@@ -0,0 +1,124 @@
+"""
+Dynamic micro-batching for sentence transformer inference.
+Concurrent requests submit their chunks to a shared queue; a single background
+worker merges them into one encode call of up to max_batch_size sentences,
+waiting at most max_wait_ms for a batch to fill, and routes the vectors back.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class EncodeScheduler:
+    """Merges concurrent encode requests into batched model calls"""
+
+    def __init__(self, encode_func: Callable[[List[str]], np.ndarray], max_batch_size: int, max_wait_ms: float):
+        self.encode_func = encode_func
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.batches = 0
+        self.sentences = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background batching worker"""
+        if not self.running:
+            self._thread = threading.Thread(target=self._run, name="encode-scheduler", daemon=True)
+            self._thread.start()
+            logger.info(
+                f"Encode scheduler started: max batch {self.max_batch_size} sentences, "
+                f"max wait {self.max_wait * 1000:.1f} ms"
+            )
+
+    def stop(self):
+        """Stop the worker; requests still queued fail instead of waiting forever"""
+        if self.running:
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                item[1].set_exception(RuntimeError("Encode scheduler stopped"))
+
+    def queue_depth(self) -> int:
+        """Encode requests waiting for the worker"""
+        return self._queue.qsize()
+
+    def encode(self, chunks: List[str]) -> np.ndarray:
+        """Encode chunks as part of a shared batch, blocking until the vectors are ready"""
+        if not self.running:
+            return self.encode_func(chunks)
+        future: Future = Future()
+        self._queue.put((chunks, future))
+        return future.result()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            size = len(item[0])
+
+            # Keep collecting until the batch is full or the oldest request has waited max_wait
+            deadline = time.monotonic() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: list):
+        sentences = [chunk for chunks, _ in batch for chunk in chunks]
+        try:
+            vectors = self.encode_func(sentences)
+        except Exception as e:
+            logger.error(f"Batched encode of {len(sentences)} sentences failed: {str(e)}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.sentences += len(sentences)
+        offset = 0
+        for chunks, future in batch:
+            future.set_result(vectors[offset:offset + len(chunks)])
+            offset += len(chunks)
+
+    def stats(self) -> dict:
+        """Batching settings and the average batch size so far"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "average_batch_size": round(self.sentences / self.batches, 2) if self.batches else 0.0,
+            "queue_depth": self.queue_depth(),
+        }
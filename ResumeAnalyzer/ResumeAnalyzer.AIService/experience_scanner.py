@@ -0,0 +1,110 @@
+"""
+Single-pass experience extraction shared by resume and job classification.
+One precompiled regex walks the lowercased text once and reports every year
+mention (tagged with the phrasings it satisfies) and every seniority keyword.
+Each alternative consumes only its first character and checks the rest with a
+lookahead, so overlapping mentions are all found, exactly as when each pattern
+and keyword was searched separately.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+SENIOR_INDICATORS = ['senior', 'lead', 'principal', 'architect', 'manager', 'director']
+MID_INDICATORS = ['associate', 'specialist', 'analyst']
+JUNIOR_INDICATORS = ['intern', 'trainee', 'graduate', 'entry', 'fresher', 'junior']
+
+# Year phrasings:
+#   experience - "5 years experience", "5+ years of experience"
+#   tenure     - "5 years in", "5 years working"
+#   labelled   - "experience: 5 years"
+#   minimum    - "minimum 5 years"
+#   at_least   - "at least 5 years"
+RESUME_YEAR_KINDS = ("experience", "tenure", "labelled")
+JOB_YEAR_KINDS = ("experience", "minimum", "at_least")
+
+# Labels written before the number (each starts with a plain letter, see below)
+_YEAR_LABELS = {
+    "labelled": r"experience\s*:\s*",
+    "minimum": r"minimum\s*",
+    "at_least": r"at\s*least\s*",
+}
+
+# Every alternative starts with a literal character, which lets the regex engine skip
+# ahead to candidate characters in C instead of trying each alternative at every offset.
+# Numbers consume their digits; labels and keywords consume only their first letter.
+# No label or keyword is a prefix of another, so at most one alternative can match at
+# any offset and nothing is hidden by an earlier match.
+_SCAN_PATTERN = re.compile("|".join(
+    [rf"{digit}\d*" for digit in "0123456789"]
+    + [rf"{label[0]}(?={label[1:]}(?P<{kind}>\d+)\+?\s*years?)" for kind, label in _YEAR_LABELS.items()]
+    + [rf"{keyword[0]}(?={keyword[1:]})(?P<{keyword}>)"
+       for keyword in SENIOR_INDICATORS + MID_INDICATORS + JUNIOR_INDICATORS]
+))
+# Phrasings that follow a number, checked where the number ends
+_YEAR_TAILS = re.compile(
+    r"(?=(?P<experience>\+?\s*years?\s*(?:of\s*)?experience)?)"
+    r"(?=(?P<tenure>\+?\s*years?\s*(?:in|working))?)"
+)
+# Decimal digits outside 0-9 (e.g. Arabic-Indic), mapped to ASCII before scanning
+_NON_ASCII_DIGIT = re.compile(r"[^\D0-9]")
+
+
+@dataclass
+class YearMention:
+    """A number of years and the phrasings it appeared in"""
+    years: int
+    position: int  # Offset of the number in the lowercased text
+    kinds: Tuple[str, ...]
+
+
+@dataclass
+class ExperienceScan:
+    """Everything the experience classifiers need from one document"""
+    years: List[YearMention] = field(default_factory=list)
+    indicators: Dict[str, List[int]] = field(default_factory=dict)  # Keyword -> offsets in the lowercased text
+
+    def max_years(self, kinds: Tuple[str, ...]) -> Optional[int]:
+        """Largest number of years mentioned in any of the given phrasings"""
+        matching = [mention.years for mention in self.years if any(kind in mention.kinds for kind in kinds)]
+        return max(matching) if matching else None
+
+    def level(self, kinds: Tuple[str, ...], default: str) -> str:
+        """Classify as junior/mid/senior from years, then keywords, then the default"""
+        max_years = self.max_years(kinds)
+        if max_years is not None:
+            if max_years >= 5:
+                return "senior"
+            elif max_years >= 2:
+                return "mid"
+            return "junior"
+
+        for level, indicators in (("senior", SENIOR_INDICATORS), ("mid", MID_INDICATORS), ("junior", JUNIOR_INDICATORS)):
+            if any(indicator in self.indicators for indicator in indicators):
+                return level
+        return default
+
+
+def scan_experience(text: str) -> ExperienceScan:
+    """Collect year mentions and seniority keywords from text in one regex pass"""
+    text = text.lower()
+    if not text.isascii():
+        text = _NON_ASCII_DIGIT.sub(lambda match: str(int(match.group())), text)
+
+    scan = ExperienceScan()
+    labelled: Dict[int, List[str]] = {}  # Number offset -> labels ending at that number
+    for match in _SCAN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind is None:
+            # A number: note the phrasings around it, keep it if there are any
+            tails = _YEAR_TAILS.match(text, match.end())
+            kinds = [name for name in ("experience", "tenure") if tails.group(name) is not None]
+            kinds.extend(labelled.pop(match.start(), []))
+            if kinds:
+                scan.years.append(YearMention(int(match.group()), match.start(), tuple(kinds)))
+        elif kind in _YEAR_LABELS:
+            labelled.setdefault(match.start(kind), []).append(kind)
+        else:
+            scan.indicators.setdefault(kind, []).append(match.start())
+    return scan
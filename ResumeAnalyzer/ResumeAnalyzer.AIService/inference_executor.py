@@ -0,0 +1,112 @@
+"""
+Execution layer that keeps CPU-bound analysis work off the asyncio event loop.
+Model inference (spaCy, sentence transformers) releases the GIL and runs on a
+thread pool; pure-Python scoring can optionally run on a process pool.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when more requests are queued than the configured maximum queue depth"""
+
+
+class InferenceExecutor:
+    """Thread pool for model inference, optional process pool for scoring, bounded admission"""
+
+    def __init__(self, inference_threads: int, scoring_processes: int, max_queue_depth: int):
+        self.inference_threads = max(1, inference_threads)
+        self.scoring_processes = max(0, scoring_processes)
+        self.max_queue_depth = max(1, max_queue_depth)
+        self.in_flight = 0
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls) -> "InferenceExecutor":
+        """Build an executor from the INFERENCE_THREADS, SCORING_PROCESSES and MAX_QUEUE_DEPTH settings"""
+        cpu_count = os.cpu_count() or 1
+        return cls(
+            inference_threads=int(os.getenv("INFERENCE_THREADS", str(cpu_count))),
+            scoring_processes=int(os.getenv("SCORING_PROCESSES", "0")),
+            max_queue_depth=int(os.getenv("MAX_QUEUE_DEPTH", "64")),
+        )
+
+    def start(self):
+        """Create the worker pools"""
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.inference_threads, thread_name_prefix="inference")
+        if self._process_pool is None and self.scoring_processes > 0:
+            # Spawn (not fork) so workers never inherit locks held by model threads
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.scoring_processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        logger.info(
+            f"Inference executor started: {self.inference_threads} inference threads, "
+            f"{self.scoring_processes} scoring processes, max queue depth {self.max_queue_depth}"
+        )
+
+    def restart_scoring_pool(self):
+        """Replace the scoring processes with fresh ones (after data they loaded at import changed);
+        tasks already submitted finish on the old processes"""
+        if self._process_pool is None:
+            return
+        old_pool = self._process_pool
+        self._process_pool = ProcessPoolExecutor(
+            max_workers=self.scoring_processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        old_pool.shutdown(wait=False)
+        logger.info(f"Restarted {self.scoring_processes} scoring processes")
+
+    def shutdown(self):
+        """Stop the worker pools"""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+            self._thread_pool = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    @asynccontextmanager
+    async def admission(self):
+        """Admit one request, rejecting it when the queue is already at its maximum depth"""
+        if self.in_flight >= self.max_queue_depth:
+            raise ExecutorSaturatedError(f"Too many requests in progress ({self.in_flight})")
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    async def _run(self, use_processes: bool, func: Callable, *args, **kwargs):
+        if self._thread_pool is None:
+            self.start()
+        pool = self._process_pool if use_processes and self._process_pool is not None else self._thread_pool
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(pool, partial(func, *args, **kwargs))
+
+    async def run_inference(self, func: Callable, *args, **kwargs):
+        """Run model inference on the thread pool"""
+        return await self._run(False, func, *args, **kwargs)
+
+    async def run_scoring(self, func: Callable, *args, **kwargs):
+        """Run pure-Python scoring on the process pool, or the thread pool when none is configured"""
+        return await self._run(True, func, *args, **kwargs)
+
+    def stats(self) -> dict:
+        """Worker counts and current queue depth"""
+        return {
+            "inference_threads": self.inference_threads,
+            "scoring_processes": self.scoring_processes,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self.in_flight,
+        }
@@ -128,6 +128,44 @@ def verify_models():
         logger.error(f"Model verification failed: {e}")
         return False
 
+def export_onnx_models():
+    """Export the sentence transformer to ONNX (fp32 and int8) for the onnxruntime backend"""
+    if os.getenv("ONNX_EXPORT", "1") != "1":
+        logger.info("ONNX export skipped (ONNX_EXPORT=0)")
+        return True
+
+    try:
+        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+        from onnx_encoder import DEFAULT_ONNX_MODEL_DIR, export_onnx_model
+
+        output_dir = os.getenv("ONNX_MODEL_DIR", DEFAULT_ONNX_MODEL_DIR)
+        logger.info(f"Exporting sentence transformer to ONNX in {output_dir}...")
+        parity = export_onnx_model('all-MiniLM-L6-v2', output_dir)
+        for model_file, cosine in parity.items():
+            logger.info(f"✓ {model_file}: min cosine similarity to torch {cosine:.5f}")
+        return True
+    except Exception as e:
+        # Not fatal: the service keeps using the torch backend
+        logger.warning(f"⚠️ ONNX export failed: {e}")
+        logger.info("✓ Service will use the torch encoder backend")
+        return False
+
+def compile_skill_taxonomy():
+    """Compile the skill taxonomy data file into the artifact the service memory-maps at startup"""
+    try:
+        sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+        from taxonomy import DEFAULT_ARTIFACT_DIR, DEFAULT_TAXONOMY_PATH, compile_taxonomy
+
+        source_path = os.getenv("TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+        artifact_dir = os.getenv("TAXONOMY_ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR)
+        logger.info(f"Compiling skill taxonomy {source_path}...")
+        logger.info(f"✓ Skill taxonomy compiled into {compile_taxonomy(source_path, artifact_dir)}")
+        return True
+    except Exception as e:
+        # Not fatal: the service builds the indexes in memory at startup instead
+        logger.warning(f"⚠️ Skill taxonomy compilation failed: {e}")
+        return False
+
 def check_system_requirements():
     """Check system requirements"""
     logger.info("Checking system requirements...")
@@ -172,6 +210,10 @@ def main():
         logger.error("Model verification failed!")
         sys.exit(1)
     
+    # Compile the skill taxonomy and export the ONNX encoder (both optional)
+    compile_skill_taxonomy()
+    export_onnx_models()
+    
     logger.info("🎉 Installation completed successfully!")
     logger.info("\n" + "="*50)
     logger.info("NEXT STEPS:")
@@ -0,0 +1,80 @@
+"""
+In-memory registry of pre-analyzed job profiles.
+A job description is parsed and encoded once at registration; every later
+analysis against its job_id reuses the stored profile. With a SharedStore,
+profiles are also written to a table shared by the worker processes of the host,
+so a job_id registered on one worker resolves on every other.
+"""
+
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+from shared_store import SharedStore
+
+
+class JobRegistry:
+    """Bounded job_id -> profile store with least-recently-used eviction"""
+
+    def __init__(self, max_entries: int, shared: Optional[SharedStore] = None):
+        self.max_entries = max(1, max_entries)
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._profiles: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: Any) -> str:
+        """Store a profile under a new job_id, evicting the least recently used one when full"""
+        job_id = uuid.uuid4().hex
+        self._store_locally(job_id, profile)
+        if self.shared is not None:
+            self.shared.put(job_id, profile)
+        return job_id
+
+    def _store_locally(self, job_id: str, profile: Any):
+        with self._lock:
+            self._profiles[job_id] = profile
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+
+    def get(self, job_id: str) -> Optional[Any]:
+        """Return the profile for a job_id, or None if it is unknown or was evicted"""
+        with self._lock:
+            profile = self._profiles.get(job_id)
+            if profile is not None:
+                self._profiles.move_to_end(job_id)
+                self.hits += 1
+                return profile
+        # Registered on another worker, or evicted here but still in the shared table
+        profile = self.shared.get(job_id) if self.shared is not None else None
+        if profile is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        self._store_locally(job_id, profile)
+        with self._lock:
+            self.hits += 1
+        return profile
+
+    def remove(self, job_id: str) -> bool:
+        """Remove a job profile, returning whether it existed"""
+        with self._lock:
+            removed = self._profiles.pop(job_id, None) is not None
+        if self.shared is not None:
+            # Other workers may still hold the profile in memory until they evict it
+            removed = self.shared.delete(job_id) or removed
+        return removed
+
+    def stats(self) -> dict:
+        """Entry count, lookup hit counts and hit ratio"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._profiles),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "shared": self.shared.stats() if self.shared is not None else None,
+        }
@@ -1,17 +1,38 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import List, Dict, Optional
+from dataclasses import dataclass
 import logging
+import hmac
+import json
+import signal
+import threading
+import time
 import numpy as np
-import re
 import os
 from collections import Counter
 import asyncio
-from functools import lru_cache
+from functools import lru_cache, partial
 from rapidfuzz import fuzz, process
-import spacy
 from collections import defaultdict
 from fastapi.middleware.cors import CORSMiddleware
+from inference_executor import InferenceExecutor, ExecutorSaturatedError
+from embedding_store import EmbeddingStore
+from encode_scheduler import EncodeScheduler
+from job_registry import JobRegistry
+from candidate_index import CandidateIndex, CandidateEntry
+from experience_scanner import scan_experience, RESUME_YEAR_KINDS, JOB_YEAR_KINDS
+from result_cache import ResultCache, normalize_text, result_key
+from shared_store import SharedStore
+from process_memory import memory_usage
+from onnx_encoder import OnnxSentenceEncoder, DEFAULT_ONNX_MODEL_DIR
+from text_chunker import TextChunker
+from bulk_jobs import BulkJobManager, UploadTooLargeError
+from taxonomy import load_taxonomy, compile_taxonomy, DEFAULT_TAXONOMY_PATH, DEFAULT_ARTIFACT_DIR
+from model_status import ModelStatus, READY, FAILED
+import metrics
+from metrics import stage_timer, timed
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,173 +51,484 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Observe request latency per route template (not raw path, to keep label cardinality bounded)"""
+    start = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    metrics.observe_request(route.path if route is not None else "unmatched", response.status_code, time.perf_counter() - start)
+    return response
+
 # Global model instances
+SENTENCE_MODEL_NAME = 'all-MiniLM-L6-v2'
 sentence_model = None
 spacy_nlp = None
 
-# Domain-specific skill mapping
-# domain_skills = {
-#     "programming_languages": ["python", "java", "javascript", "typescript", "c++", "c#", "ruby", "php", "go", "rust", "kotlin", "swift", "scala", "perl", "r", "matlab", "julia", "cobol", "fortran", "assembly", "vb.net", "objective-c", "dart", "haskell", "erlang", "clojure", "f#", "groovy", "lua", "vhdl", "verilog", "solidity"],
-#     "web_development": ["html", "css", "sass", "scss", "less", "bootstrap", "tailwind", "jquery", "ajax", "json", "xml", "yaml", "react", "angular", "vue", "svelte", "ember", "backbone", "next.js", "nuxt.js", "gatsby", "webpack", "parcel", "vite", "babel"],
-#     "backend_development": ["node.js", "express", "django", "flask", "spring", "laravel", "rails", "asp.net", "fastapi", "tornado", "nestjs", "koa", "graphql", "rest", "microservices", "docker", "kubernetes", "nginx", "apache", "iis"],
-#     "database": ["sql", "mysql", "postgresql", "mongodb", "redis", "elasticsearch", "cassandra", "oracle", "sqlite", "mariadb", "dynamodb", "neo4j", "couchdb", "firebase", "supabase"],
-#     "cloud_services": ["aws", "azure", "gcp", "heroku", "digitalocean", "cloudflare", "vercel", "netlify", "lambda", "s3", "ec2", "rds", "kubernetes", "docker"],
-#     "devops": ["git", "jenkins", "travis", "circleci", "ansible", "terraform", "puppet", "chef", "kubernetes", "docker", "prometheus", "grafana", "elk", "nagios", "zabbix"],
-#     "testing": ["jest", "mocha", "cypress", "selenium", "junit", "pytest", "phpunit", "karma", "jasmine", "enzyme", "testing-library", "postman", "swagger", "cucumber", "behave"],
-#     "mobile_development": ["react-native", "flutter", "ionic", "xamarin", "android", "ios", "swift", "kotlin", "objective-c", "cordova", "capacitor", "expo", "android-studio", "xcode"],
-#     "data_science": ["python", "r", "pandas", "numpy", "scipy", "scikit-learn", "tensorflow", "pytorch", "keras", "matplotlib", "seaborn", "plotly", "tableau", "power-bi", "hadoop", "spark"],
-#     "machine_learning": ["tensorflow", "pytorch", "scikit-learn", "keras", "opencv", "nltk", "spacy", "transformers", "huggingface", "mlflow", "kubeflow", "sagemaker", "vertex-ai"],
-#     "security": ["oauth", "jwt", "encryption", "authentication", "authorization", "firewall", "vpn", "ssl", "tls", "penetration-testing", "vulnerability-assessment", "security-audit"],
-#     "version_control": ["git", "github", "gitlab", "bitbucket", "svn", "mercurial", "azure-devops", "sourcetree", "git-flow", "trunk-based-development"],
-#     "project_management": ["agile", "scrum", "kanban", "jira", "trello", "asana", "confluence", "notion", "slack", "teams", "project-planning", "risk-management"],
-#     "design_tools": ["figma", "sketch", "adobe-xd", "photoshop", "illustrator", "indesign", "after-effects", "premiere-pro", "invision", "zeplin"]
-# }
-
-domain_skills = {
-    "programming_languages": ["python", "java", "javascript", "typescript", "c++", "c#", "ruby", "php", "go", "rust", "kotlin", "swift", "scala", "perl", "r", "matlab", "julia", "cobol", "fortran", "assembly", "vb.net", "objective-c", "dart", "haskell", "erlang", "clojure", "f#", "groovy", "lua", "vhdl", "verilog", "solidity"],
-    "web_development": ["html", "css", "sass", "scss", "less", "bootstrap", "tailwind", "jquery", "ajax", "json", "xml", "yaml", "react", "angular", "vue", "svelte", "ember", "backbone", "next.js", "nuxt.js", "gatsby", "webpack", "parcel", "vite", "babel"],
-    "backend_development": ["node.js", "express", "django", "flask", "spring", "laravel", "rails", "asp.net", "fastapi", "tornado", "nestjs", "koa", "graphql", "rest", "microservices", "docker", "kubernetes", "nginx", "apache", "iis"],
-    "database": ["sql", "mysql", "postgresql", "mongodb", "redis", "elasticsearch", "cassandra", "oracle", "sqlite", "mariadb", "dynamodb", "neo4j", "couchdb", "firebase", "supabase"],
-    "cloud_services": ["aws", "azure", "gcp", "heroku", "digitalocean", "cloudflare", "vercel", "netlify", "lambda", "s3", "ec2", "rds", "kubernetes", "docker"],
-    "devops": ["git", "jenkins", "travis", "circleci", "ansible", "terraform", "puppet", "chef", "kubernetes", "docker", "prometheus", "grafana", "elk", "nagios", "zabbix"],
-    "testing": ["jest", "mocha", "cypress", "selenium", "junit", "pytest", "phpunit", "karma", "jasmine", "enzyme", "testing-library", "postman", "swagger", "cucumber", "behave"],
-    "mobile_development": ["react-native", "flutter", "ionic", "xamarin", "android", "ios", "swift", "kotlin", "objective-c", "cordova", "capacitor", "expo", "android-studio", "xcode"],
-    "data_science": ["python", "r", "pandas", "numpy", "scipy", "scikit-learn", "tensorflow", "pytorch", "keras", "matplotlib", "seaborn", "plotly", "tableau", "power-bi", "hadoop", "spark"],
-    "machine_learning": ["tensorflow", "pytorch", "scikit-learn", "keras", "opencv", "nltk", "spacy", "transformers", "huggingface", "mlflow", "kubeflow", "sagemaker", "vertex-ai"],
-    "security": ["oauth", "jwt", "encryption", "authentication", "authorization", "firewall", "vpn", "ssl", "tls", "penetration-testing", "vulnerability-assessment", "security-audit"],
-    "version_control": ["git", "github", "gitlab", "bitbucket", "svn", "mercurial", "azure-devops", "sourcetree", "git-flow", "trunk-based-development"],
-    "project_management": ["agile", "scrum", "kanban", "jira", "trello", "asana", "confluence", "notion", "slack", "teams", "project-planning", "risk-management"],
-    "design_tools": ["figma", "sketch", "adobe-xd", "photoshop", "illustrator", "indesign", "after-effects", "premiere-pro", "invision", "zeplin"],
-    "cloud_devops": ["aws", "azure", "google cloud", "docker", "kubernetes", "terraform", "ansible", "jenkins", "github actions", "circleci", "travis ci", "openshift", "helm", "vagrant", "linux", "nginx", "apache", "load balancing", "prometheus", "grafana", "new relic", "splunk"],
-    "ai_ml_data_science": ["machine learning", "deep learning", "pytorch", "tensorflow", "scikit-learn", "keras", "xgboost", "lightgbm", "pandas", "numpy", "scipy", "matplotlib", "seaborn", "jupyter", "huggingface", "transformers", "openai", "langchain", "llama", "cv", "nlp", "llm", "mlops"],
-    "bi_analytics": ["excel", "power bi", "tableau", "looker", "qlik", "google data studio", "superset", "metabase", "dax", "data mining", "dashboards", "data visualization"],
-    "finance_accounting": ["quickbooks", "sap", "xero", "netsuite", "tally", "zoho books", "oracle financials", "financial analysis", "reconciliation", "budgeting", "forecasting"],
-    "marketing_sales": ["seo", "sem", "google analytics", "hubspot", "mailchimp", "salesforce", "facebook ads", "linkedin ads", "content marketing", "email marketing", "social media", "lead generation", "crm"],
-    "design_creative": ["figma", "sketch", "adobe xd", "photoshop", "illustrator", "invision", "canva", "after effects", "premiere pro", "blender", "3ds max", "maya", "procreate"],
-    "engineering": ["autocad", "solidworks", "ansys", "matlab", "simulink", "cad", "cam", "catia", "revit", "staad.pro", "etabs"],
-    "healthcare_medical": ["epic", "cerner", "meditech", "emr", "ehr", "icd-10", "cpt", "hipaa", "telemedicine", "medical billing", "pharmacology", "nursing", "radiology", "labview"],
-    "legal_compliance": ["contract review", "litigation", "compliance", "gdpr", "hipaa", "legal research", "case management", "regulatory affairs", "legal writing", "due diligence"],
-    "hr_recruitment": ["recruitment", "interviewing", "payroll", "hrms", "workday", "successfactors", "bamboohr", "employee relations", "training and development", "benefits administration"],
-    "education_research": ["moodle", "blackboard", "canvas", "research methods", "academic writing", "curriculum development", "instructional design", "pedagogy", "qualitative analysis", "quantitative research"],
-    "operations_supply_chain": ["supply chain", "logistics", "inventory management", "sap scm", "erp", "warehouse management", "s&op", "procurement", "lean", "six sigma"],
-    "sales_customer_service": ["crm", "cold calling", "salesforce", "customer support", "live chat", "zendesk", "intercom", "sales strategy", "upselling", "negotiation", "ticketing systems"],
-    "project_management": ["jira", "trello", "asana", "monday.com", "confluence", "scrum", "kanban", "agile", "waterfall", "pmp", "business analysis", "requirements gathering", "stakeholder management"],
-    "manufacturing_production": ["lean manufacturing", "iso", "quality control", "kaizen", "sap pp", "mes", "production planning", "tqm", "5s", "oee", "process improvement"],
-    "research_development": ["r&d", "innovation", "product development", "prototyping", "design thinking", "a/b testing", "usability testing", "experiment design", "market research"],
-    "certifications": ["pmp", "aws certified", "azure certified", "gcp certified", "scrum master", "cfa", "cpa", "cisa", "cissp", "comptia", "six sigma", "itil", "google ads certification", "hubspot inbound certified"]
-}
+# Sentence encoder backend: "torch" (sentence-transformers), "onnx" or "onnx-int8"
+# (onnxruntime on the files exported by install_models.py into ONNX_MODEL_DIR)
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch").lower()
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", DEFAULT_ONNX_MODEL_DIR)
+encoder_backend = None  # Backend actually in use after load_models
+
+# Models load on a background thread after startup (BACKGROUND_MODEL_LOAD=0 loads them
+# before the server accepts connections); /ready reports per-component state
+BACKGROUND_MODEL_LOAD = os.getenv("BACKGROUND_MODEL_LOAD", "1") == "1"
+model_status = ModelStatus(["sentence_model", "embedding_store", "candidate_index", "spacy", "warmup"])
+WARMUP_TEXT = (
+    "Senior Python developer with 5 years of experience building Django and FastAPI services on AWS. "
+    "Worked with React, PostgreSQL, Docker and Kubernetes in an agile team"
+)
+
+# Persistent embedding cache (EMBEDDING_STORE_PATH, empty to disable)
+EMBEDDING_STORE_PATH = os.getenv("EMBEDDING_STORE_PATH", "/tmp/resume_analyzer/embeddings.sqlite3")
+EMBEDDING_STORE_MAX_ENTRIES = int(os.getenv("EMBEDDING_STORE_MAX_ENTRIES", "100000"))
+embedding_store = None
+
+# Micro-batching of concurrent encode calls (ENCODE_BATCHING=0 disables it); a merged
+# batch of up to ENCODE_MAX_BATCH_SIZE sentences is also a single model batch
+ENCODE_BATCHING = os.getenv("ENCODE_BATCHING", "1") == "1"
+ENCODE_MAX_BATCH_SIZE = int(os.getenv("ENCODE_MAX_BATCH_SIZE", "128"))
+ENCODE_MAX_WAIT_MS = float(os.getenv("ENCODE_MAX_WAIT_MS", "5"))
+encode_scheduler = None
+
+# Worker pools for CPU-bound analysis (INFERENCE_THREADS, SCORING_PROCESSES, MAX_QUEUE_DEPTH)
+inference_executor = InferenceExecutor.from_env()
+
+# spaCy pipeline mode: "ner" (NER component only), "full" (every component) or
+# "none" (skip NER and rely on the lexicon matcher), and the NER input length limit
+SPACY_PIPELINE = os.getenv("SPACY_PIPELINE", "ner").lower()
+SPACY_MAX_CHARS = int(os.getenv("SPACY_MAX_CHARS", "50000"))
+SPACY_NON_NER_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
+SKILL_ENTITY_LABELS = ("PRODUCT", "ORG", "GPE")
+
+# Batch sizes for sentence transformer and spaCy calls, and the /analyze/batch size limit
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", "64"))
+SPACY_BATCH_SIZE = int(os.getenv("SPACY_BATCH_SIZE", "32"))
+MAX_BATCH_RESUMES = int(os.getenv("MAX_BATCH_RESUMES", "500"))
+
+# Encoder inputs per document: sentences packed into windows of at most CHUNK_MAX_TOKENS
+# tokens (never more than the encoder's max_seq_length), at most CHUNK_MAX_PER_DOCUMENT
+# windows per document
+CHUNK_MAX_TOKENS = int(os.getenv("CHUNK_MAX_TOKENS", "128"))
+CHUNK_MAX_PER_DOCUMENT = int(os.getenv("CHUNK_MAX_PER_DOCUMENT", "64"))
+text_chunker = TextChunker(CHUNK_MAX_TOKENS, CHUNK_MAX_PER_DOCUMENT)  # Re-created for the encoder in load_models
+
+# Candidate search index (CANDIDATE_INDEX_DIR, empty to disable); the vector shortlist is
+# SEARCH_RERANK_FACTOR x top_k resumes, re-ranked with the full scoring formula
+CANDIDATE_INDEX_DIR = os.getenv("CANDIDATE_INDEX_DIR", "/tmp/resume_analyzer/candidates")
+SEARCH_RERANK_FACTOR = int(os.getenv("SEARCH_RERANK_FACTOR", "5"))
+MAX_SEARCH_TOP_K = int(os.getenv("MAX_SEARCH_TOP_K", "100"))
+candidate_index = None
+
+# SQLite file through which the worker processes of serve.py share cached results and
+# registered jobs (SHARED_STORE_PATH, empty keeps both in this process only)
+SHARED_STORE_PATH = os.getenv("SHARED_STORE_PATH", "")
+worker_supervisor_pid = None  # serve.py parent process, set in its forked workers
+
+# Registered job profiles (POST /jobs), least recently used evicted beyond the limit
+JOB_REGISTRY_MAX_ENTRIES = int(os.getenv("JOB_REGISTRY_MAX_ENTRIES", "1000"))
+job_registry = JobRegistry(
+    JOB_REGISTRY_MAX_ENTRIES,
+    shared=SharedStore(SHARED_STORE_PATH, "jobs", JOB_REGISTRY_MAX_ENTRIES) if SHARED_STORE_PATH else None
+)
+
+# Cache of /analyze results with coalescing of identical in-flight requests
+# (RESULT_CACHE_MAX_ENTRIES=0 disables it). Bump SCORING_VERSION whenever a change
+# to extraction or scoring alters results, so stale cached results are not served.
+SCORING_VERSION = "4"
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))
+RESULT_CACHE_TTL_SECONDS = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+result_cache = ResultCache(
+    RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS,
+    shared=SharedStore(SHARED_STORE_PATH, "results", RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS) if SHARED_STORE_PATH else None
+) if RESULT_CACHE_MAX_ENTRIES > 0 else None
+
+# Bulk analysis jobs (POST /bulk-jobs): JSONL uploads stored under BULK_JOB_DIR (empty
+# disables them) and analyzed in batches of BULK_BATCH_SIZE records, at most
+# BULK_CONCURRENCY batches at a time; finished jobs are kept BULK_JOB_RETENTION_HOURS
+BULK_JOB_DIR = os.getenv("BULK_JOB_DIR", "/tmp/resume_analyzer/bulk")
+BULK_BATCH_SIZE = int(os.getenv("BULK_BATCH_SIZE", "32"))
+BULK_CONCURRENCY = int(os.getenv("BULK_CONCURRENCY", "2"))
+BULK_MAX_UPLOAD_MB = int(os.getenv("BULK_MAX_UPLOAD_MB", "1024"))
+BULK_JOB_RETENTION_HOURS = float(os.getenv("BULK_JOB_RETENTION_HOURS", "168"))
+bulk_jobs = None  # BulkJobManager, created at startup
+
+# Component statistics exported on /metrics, read at scrape time
+metrics.register_stats_source("executor", lambda: inference_executor.stats())
+metrics.register_stats_source("embedding_store", lambda: embedding_store.stats() if embedding_store is not None else None)
+metrics.register_stats_source("encode_scheduler", lambda: encode_scheduler.stats() if encode_scheduler is not None else None)
+metrics.register_stats_source("job_registry", lambda: job_registry.stats())
+metrics.register_stats_source("result_cache", lambda: result_cache.stats() if result_cache is not None else None)
+metrics.register_stats_source("taxonomy", lambda: taxonomy.stats())
+metrics.register_stats_source("candidate_index", lambda: candidate_index.stats() if candidate_index is not None else None)
+metrics.register_stats_source("shared_results", lambda: result_cache.shared.stats() if result_cache is not None and result_cache.shared is not None else None)
+metrics.register_stats_source("process", lambda: memory_usage())
+metrics.register_stats_source("bulk_jobs", lambda: bulk_jobs.stats() if bulk_jobs is not None else None)
+
+# Skill taxonomy (vocabulary, domain groups, core skills) from TAXONOMY_PATH, loaded from
+# the artifact install_models.py compiles into TAXONOMY_ARTIFACT_DIR when there is one.
+# POST /admin/taxonomy/reload swaps in a new version (needs ADMIN_TOKEN).
+TAXONOMY_PATH = os.getenv("TAXONOMY_PATH", DEFAULT_TAXONOMY_PATH)
+TAXONOMY_ARTIFACT_DIR = os.getenv("TAXONOMY_ARTIFACT_DIR", DEFAULT_ARTIFACT_DIR)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+taxonomy = load_taxonomy(TAXONOMY_PATH, TAXONOMY_ARTIFACT_DIR)
+taxonomy_reload_lock = asyncio.Lock()
 
 
 class AnalysisRequest(BaseModel):
     resume_text: str
-    job_text: str
+    job_text: Optional[str] = None
+    job_id: Optional[str] = None  # A job registered through POST /jobs, used instead of job_text
 
 class AnalysisResponse(BaseModel):
     match_percentage: float
     missing_skills: List[str]
     recommendation: str
 
-@lru_cache(maxsize=1)
-def load_models():
-    """Load AI models with caching"""
-    global sentence_model, spacy_nlp
-    
+class JobRegistrationRequest(BaseModel):
+    job_text: str
+
+class JobProfileResponse(BaseModel):
+    job_id: str
+    skills: List[str]
+    experience_level: str
+    domain: Optional[str]
+    chunk_count: int
+
+class IndexedResume(BaseModel):
+    resume_id: str
+    resume_text: str
+
+class IndexResumesRequest(BaseModel):
+    resumes: List[IndexedResume]
+
+class IndexResumesResponse(BaseModel):
+    indexed: int
+    total: int  # Resumes in the index after this request
+
+class SearchRequest(BaseModel):
+    job_text: Optional[str] = None
+    job_id: Optional[str] = None  # A job registered through POST /jobs, used instead of job_text
+    top_k: int = 10
+    min_skill_overlap: int = 1  # Resumes sharing fewer skills with the job are skipped
+
+class CandidateMatch(AnalysisResponse):
+    resume_id: str
+    vector_similarity: Optional[float] = None  # Cosine similarity of the document vectors, None without the sentence model
+    skill_overlap: int
+
+class SearchResponse(BaseModel):
+    results: List[CandidateMatch]  # Best match first
+
+class TaxonomyReloadResponse(BaseModel):
+    version: str
+    previous_version: str
+    changed: bool  # False when the data file was unchanged
+    origin: str  # "artifact" (compiled, memory-mapped) or "source" (built in memory)
+    skills: int
+    domains: int
+    aliases: int
+    load_seconds: float
+
+class BulkJobResponse(BaseModel):
+    job_id: str
+    status: str  # queued, running, completed or failed
+    total_lines: int
+    lines_read: int  # Input lines processed so far, blank lines included
+    succeeded: int
+    failed: int  # Records answered with an error line
+    progress: float  # lines_read / total_lines
+    lines_per_second: Optional[float]
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    error: Optional[str]  # Why a failed job stopped
+
+class BatchAnalysisRequest(BaseModel):
+    job_text: str
+    resumes: List[str]
+
+class RankedAnalysisResponse(AnalysisResponse):
+    resume_index: int  # Position of the resume in the request
+
+class BatchAnalysisResponse(BaseModel):
+    results: List[RankedAnalysisResponse]  # Best match first
+
+@dataclass
+class JobProfile:
+    """Job-side analysis features, computed once and reused for every resume"""
+    job_text: str
+    skills: set
+    experience: str
+    domain: Optional[str] = None  # Dominant domain group of the job skills
+    embeddings: Optional[np.ndarray] = None  # Chunk embeddings, None without the sentence model
+
+def load_sentence_model():
+    """Load the sentence encoder on the configured backend, falling back to torch and then to None"""
+    if ENCODER_BACKEND in ("onnx", "onnx-int8"):
+        try:
+            logger.info(f"Loading sentence encoder on ONNX Runtime ({ENCODER_BACKEND})...")
+            onnx_threads = os.getenv("ONNX_NUM_THREADS")
+            model = OnnxSentenceEncoder(
+                ONNX_MODEL_DIR, quantized=ENCODER_BACKEND == "onnx-int8",
+                num_threads=int(onnx_threads) if onnx_threads else None
+            )
+            logger.info(f"✓ ONNX sentence encoder loaded from {ONNX_MODEL_DIR}/{model.model_file}")
+            return model, ENCODER_BACKEND
+        except Exception as e:
+            logger.error(f"Error loading ONNX sentence encoder: {str(e)}")
+            logger.info("Falling back to the torch sentence transformer...")
+    elif ENCODER_BACKEND != "torch":
+        logger.error(f"Unknown ENCODER_BACKEND '{ENCODER_BACKEND}', using torch")
+
     try:
         logger.info("Loading sentence transformer model...")
         # Try to load sentence transformer
         from sentence_transformers import SentenceTransformer
-        sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+        model = SentenceTransformer(SENTENCE_MODEL_NAME)
+        # Optionally cap torch intra-op threads so parallel inference threads don't oversubscribe cores
+        torch_threads = os.getenv("TORCH_NUM_THREADS")
+        if torch_threads:
+            import torch
+            torch.set_num_threads(int(torch_threads))
         logger.info("✓ Sentence transformer model loaded successfully!")
+        return model, "torch"
     except Exception as e:
         logger.error(f"Error loading sentence transformer: {str(e)}")
         logger.info("Falling back to basic similarity calculation...")
-        sentence_model = None
+        return None, None
+
+@lru_cache(maxsize=1)
+def load_models():
+    """Load AI models with caching, recording each component's state for /ready.
+    Nothing loaded here is written to afterwards, so serve.py calls this in its parent
+    process and the forked workers share the model pages instead of each loading a copy."""
+    global sentence_model, encoder_backend, spacy_nlp, text_chunker
+    
+    model_status.begin("sentence_model")
+    sentence_model, encoder_backend = load_sentence_model()
+    if sentence_model is not None:
+        text_chunker = TextChunker.for_model(sentence_model, CHUNK_MAX_TOKENS, CHUNK_MAX_PER_DOCUMENT)
+        model_status.end("sentence_model", READY, detail=f"{SENTENCE_MODEL_NAME} ({encoder_backend})")
+    else:
+        model_status.end("sentence_model", FAILED, detail="using word-based similarity")
+    if SPACY_PIPELINE == "none":
+        logger.info("spaCy NER disabled, skills come from the lexicon matcher only")
+        spacy_nlp = None
+        model_status.skip("spacy", "SPACY_PIPELINE=none")
+        return True
+    model_status.begin("spacy")
     try:
-        logger.info("Loading spaCy NER model...")
-        spacy_nlp = spacy.load('en_core_web_sm')
-        logger.info("✓ spaCy NER model loaded successfully!")
+        logger.info(f"Loading spaCy NER model ({SPACY_PIPELINE} pipeline)...")
+        # Imported here so the server starts accepting connections before spaCy is loaded
+        import spacy
+        if SPACY_PIPELINE == "full":
+            spacy_nlp = spacy.load('en_core_web_sm')
+        else:
+            # Only doc.ents is used; the NER component has its own tok2vec layer in
+            # en_core_web_sm, so everything else can be left out of the pipeline
+            spacy_nlp = spacy.load('en_core_web_sm', exclude=SPACY_NON_NER_COMPONENTS)
+        logger.info(f"✓ spaCy NER model loaded successfully! Pipeline: {spacy_nlp.pipe_names}")
+        model_status.end("spacy", READY, detail=", ".join(spacy_nlp.pipe_names))
     except Exception as e:
         logger.error(f"Error loading spaCy model: {str(e)}")
         spacy_nlp = None
+        model_status.end("spacy", FAILED, detail=str(e))
     return True
 
+def open_worker_resources():
+    """Start the encode scheduler and open the embedding store and candidate index.
+    These hold threads, SQLite connections and file mappings, which must not cross a
+    fork, so each process opens its own after load_models."""
+    global embedding_store, encode_scheduler, candidate_index
+    
+    if sentence_model is not None and ENCODE_BATCHING:
+        encode_scheduler = EncodeScheduler(
+            partial(encode_sentences, batch_size=ENCODE_MAX_BATCH_SIZE), ENCODE_MAX_BATCH_SIZE, ENCODE_MAX_WAIT_MS
+        )
+        encode_scheduler.start()
+    if sentence_model is not None and EMBEDDING_STORE_PATH:
+        model_status.begin("embedding_store")
+        try:
+            # Quantized and exported encoders produce slightly different vectors, so each
+            # backend other than torch caches under its own key
+            model_key = SENTENCE_MODEL_NAME if encoder_backend == "torch" else f"{SENTENCE_MODEL_NAME}:{encoder_backend}"
+            embedding_store = EmbeddingStore(EMBEDDING_STORE_PATH, model_key, EMBEDDING_STORE_MAX_ENTRIES)
+            model_status.end("embedding_store", READY)
+        except Exception as e:
+            logger.error(f"Error opening embedding store: {str(e)}")
+            embedding_store = None
+            model_status.end("embedding_store", FAILED, detail=str(e))
+    else:
+        model_status.skip("embedding_store", "no sentence model" if sentence_model is None else "EMBEDDING_STORE_PATH is empty")
+    if CANDIDATE_INDEX_DIR:
+        model_status.begin("candidate_index")
+        try:
+            dim = sentence_model.get_sentence_embedding_dimension() if sentence_model is not None else 384
+            candidate_index = CandidateIndex(CANDIDATE_INDEX_DIR, dim)
+            model_status.end("candidate_index", READY)
+        except Exception as e:
+            logger.error(f"Error opening candidate index: {str(e)}")
+            candidate_index = None
+            model_status.end("candidate_index", FAILED, detail=str(e))
+    else:
+        model_status.skip("candidate_index", "CANDIDATE_INDEX_DIR is empty")
+
+def warm_up_models():
+    """Run one encode and one NER pass so the first request doesn't pay for lazy initialization"""
+    if sentence_model is not None:
+        sentence_model.encode(split_text_chunks(WARMUP_TEXT), batch_size=ENCODE_BATCH_SIZE)
+    if spacy_nlp is not None:
+        spacy_nlp(WARMUP_TEXT.lower())
+    extract_advanced_skills(WARMUP_TEXT)
 
-def extract_advanced_skills(text: str) -> dict:
-    """Extract skills from text using NLP and domain knowledge"""
+def prepare_models():
+    """Load and warm up the models, then mark the service ready (runs on a background thread)"""
+    model_status.start()
     try:
-        # Use global domain_skills
-        global domain_skills
-        
-        # Extract skills using spaCy NER
-        doc = spacy_nlp(text.lower())
+        load_models()
+        open_worker_resources()
+        model_status.begin("warmup")
+        try:
+            warm_up_models()
+            model_status.end("warmup", READY)
+        except Exception as e:
+            logger.error(f"Model warm-up failed: {str(e)}")
+            model_status.end("warmup", FAILED, detail=str(e))
+    finally:
+        model_status.finish()
+    logger.info(f"✓ Service ready after {model_status.snapshot()['load_seconds']:.2f}s of model loading")
+
+def extract_advanced_skills(text: str, doc=None) -> dict:
+    """Extract skills from text using NLP and domain knowledge (doc: optional pre-parsed spaCy doc of the lowercased text)"""
+    try:
+        text_lower = text.lower()
         extracted_skills = set()
         
-        # Extract named entities that might be skills
-        for ent in doc.ents:
-            if ent.label_ in ["PRODUCT", "ORG", "GPE"]:
-                extracted_skills.add(ent.text.lower())
+        # Extract named entities that might be skills using spaCy NER
+        if doc is None and spacy_nlp is not None:
+            with stage_timer("spacy_ner"):
+                doc = spacy_nlp(text_lower[:SPACY_MAX_CHARS])
+        if doc is not None:
+            # Entities that are aliases ("postgres") count as their skill, others are kept as they are
+            aliases = taxonomy.aliases
+            extracted_skills.update(
+                aliases.get(ent.text, ent.text) for ent in doc.ents if ent.label_ in SKILL_ENTITY_LABELS
+            )
         
-        # Add words that match our domain skills
-        for domain, skills in domain_skills.items():
-            skills_set = set(skills)  # Convert list to set
-            for skill in skills_set:
-                if skill.lower() in text.lower():
-                    extracted_skills.add(skill.lower())
+        # Add every domain skill mentioned in the text (single pass over the text)
+        skill_matcher = taxonomy.skill_matcher
+        with stage_timer("lexicon_match"):
+            extracted_skills.update(skill_matcher.find_skills(text_lower))
         
-        # Categorize skills by domain
+        # Categorize skills by domain using the precomputed reverse index
         categorized_skills = defaultdict(list)
         for skill in extracted_skills:
-            for domain, domain_skill_list in domain_skills.items():
-                domain_skill_set = set(domain_skill_list)  # Convert list to set
-                if skill in domain_skill_set:
-                    categorized_skills[domain].append(skill)
-                    break
-            else:
-                categorized_skills["other"].append(skill)
+            categorized_skills[skill_matcher.domain_of(skill)].append(skill)
         
         return dict(categorized_skills)
     except Exception as e:
         logger.error(f"Error in skill extraction: {str(e)}")
         return {"error": str(e)}
 
+def extract_skill_sets(texts: List[str], docs: list) -> List[set]:
+    """Flat skill sets of several documents and their pre-parsed spaCy docs"""
+    return [flatten_skills(extract_advanced_skills(text, doc)) for text, doc in zip(texts, docs)]
+
+def parse_documents(texts: List[str]) -> list:
+    """Run spaCy over lowercased texts in one nlp.pipe call (None entries when NER is disabled)"""
+    if spacy_nlp is None:
+        return [None] * len(texts)
+    with stage_timer("spacy_ner"):
+        return list(spacy_nlp.pipe([text.lower()[:SPACY_MAX_CHARS] for text in texts], batch_size=SPACY_BATCH_SIZE))
+
+def split_text_chunks(text: str) -> List[str]:
+    """Split text into sentence windows sized for the encoder, recording the chunk count"""
+    with stage_timer("chunking"):
+        chunks = text_chunker.chunk(text)
+    metrics.observe_batch_size("chunks", len(chunks))
+    return chunks
+
+def encode_sentences(sentences: List[str], batch_size: Optional[int] = None) -> np.ndarray:
+    """One sentence model call, recording its batch size (batch_size defaults to ENCODE_BATCH_SIZE)"""
+    metrics.observe_batch_size("encode", len(sentences))
+    return sentence_model.encode(sentences, batch_size=batch_size or ENCODE_BATCH_SIZE)
+
+def encode_chunks(chunks: List[str]) -> np.ndarray:
+    """Get sentence transformer embeddings for a list of chunks, reusing cached embeddings"""
+    if not chunks:
+        return np.zeros((0, sentence_model.get_sentence_embedding_dimension()), dtype=np.float32)
+    
+    unique_chunks = list(dict.fromkeys(chunks))
+    embeddings = embedding_store.get_many(unique_chunks) if embedding_store is not None else {}
+    
+    # Only chunks missing from the store go through the model
+    missing = [chunk for chunk in unique_chunks if chunk not in embeddings]
+    if missing:
+        with stage_timer("encode"):
+            if encode_scheduler is not None:
+                encoded = encode_scheduler.encode(missing)
+            else:
+                encoded = encode_sentences(missing)
+        embeddings.update(zip(missing, encoded))
+        if embedding_store is not None:
+            embedding_store.put_many(missing, encoded)
+    
+    return np.stack([embeddings[chunk] for chunk in chunks])
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """Scale embeddings to unit length so dot products are cosine similarities"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+def document_vector(embeddings: Optional[np.ndarray]) -> Optional[np.ndarray]:
+    """Collapse chunk embeddings into one normalized document vector"""
+    if embeddings is None or len(embeddings) == 0:
+        return None
+    vector = normalize_embeddings(embeddings).mean(axis=0)
+    return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+@timed("similarity")
+def similarity_from_embeddings(resume_embeddings: np.ndarray, job_embeddings: np.ndarray) -> float:
+    """Score resume chunk embeddings against job chunk embeddings"""
+    if len(job_embeddings) == 0:
+        weighted_sim = 0
+    else:
+        if len(resume_embeddings) == 0:
+            similarities = np.zeros(len(job_embeddings), dtype=np.float32)
+        else:
+            # Full job x resume cosine similarity matrix in one multiply,
+            # then the best matching resume chunk for each job chunk
+            similarity_matrix = normalize_embeddings(job_embeddings) @ normalize_embeddings(resume_embeddings).T
+            similarities = similarity_matrix.max(axis=1)
+        
+        # Overall similarity is weighted average of chunk similarities
+        # Give more weight to higher similarities
+        similarities = np.sort(similarities)[::-1]
+        weights = np.linspace(1.0, 0.5, len(similarities))  # Linear decay weights
+        weighted_sim = np.average(similarities, weights=weights)
+    
+    # Apply small boost to avoid extremely low scores
+    boosted_sim = 0.25 + (0.75 * weighted_sim)  # 30% base boost for better UX
+    return float(boosted_sim)
+
 def calculate_semantic_similarity(resume_text: str, job_text: str) -> float:
     """Calculate semantic similarity using sentence transformers or fallback"""
     try:
         if sentence_model is not None:
-            # Split text into smaller chunks for better semantic understanding
-            resume_chunks = [s.strip() for s in resume_text.split('.') if s.strip()]
-            job_chunks = [s.strip() for s in job_text.split('.') if s.strip()]
-            
-            # Get embeddings for all chunks
-            resume_embeddings = sentence_model.encode(resume_chunks)
-            job_embeddings = sentence_model.encode(job_chunks)
-            
-            # Calculate similarity matrix between all chunks
-            similarities = []
-            for job_emb in job_embeddings:
-                # Find the best matching resume chunk for each job chunk
-                chunk_similarities = []
-                for resume_emb in resume_embeddings:
-                    sim = np.dot(job_emb, resume_emb) / (
-                        np.linalg.norm(job_emb) * np.linalg.norm(resume_emb)
-                    )
-                    chunk_similarities.append(sim)
-                # Take the best match for this job chunk
-                similarities.append(max(chunk_similarities) if chunk_similarities else 0)
-            
-            # Overall similarity is weighted average of chunk similarities
-            # Give more weight to higher similarities
-            similarities.sort(reverse=True)
-            weights = np.linspace(1.0, 0.5, len(similarities))  # Linear decay weights
-            weighted_sim = np.average(similarities, weights=weights) if similarities else 0
-            
-            # Apply small boost to avoid extremely low scores
-            boosted_sim = 0.25 + (0.75 * weighted_sim)  # 30% base boost for better UX
-            return float(boosted_sim)
+            # Encode resume and job chunks together in one batch
+            resume_chunks = split_text_chunks(resume_text)
+            job_chunks = split_text_chunks(job_text)
+            embeddings = encode_chunks(resume_chunks + job_chunks)
+            return similarity_from_embeddings(embeddings[:len(resume_chunks)], embeddings[len(resume_chunks):])
         else:
+            metrics.count_word_similarity_fallback("no_model")
             return calculate_word_similarity(resume_text, job_text)
     except Exception as e:
         logger.error(f"Similarity calculation failed: {str(e)}")
+        metrics.count_word_similarity_fallback("error")
         return calculate_word_similarity(resume_text, job_text)
 
 def calculate_word_similarity(text1: str, text2: str) -> float:
@@ -206,352 +538,659 @@ def calculate_word_similarity(text1: str, text2: str) -> float:
     return score
 
 
+@timed("experience")
 def detect_experience_level(resume_text: str) -> str:
     """Detect experience level from resume text"""
-    resume_lower = resume_text.lower()
-    
-    # Look for explicit experience mentions
-    experience_patterns = [
-        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-        r'(\d+)\+?\s*years?\s*in',
-        r'experience\s*:\s*(\d+)\+?\s*years?',
-        r'(\d+)\+?\s*years?\s*working',
-    ]
-    
-    years_found = []
-    for pattern in experience_patterns:
-        matches = re.findall(pattern, resume_lower)
-        for match in matches:
-            try:
-                years_found.append(int(match))
-            except ValueError:
-                continue
-    
-    # Determine experience level
-    if years_found:
-        max_years = max(years_found)
-        if max_years >= 5:
-            return "senior"
-        elif max_years >= 2:
-            return "mid"
-        else:
-            return "junior"
-    
-    # Look for other indicators
-    senior_indicators = ['senior', 'lead', 'principal', 'architect', 'manager', 'director']
-    mid_indicators = ['associate', 'specialist', 'analyst']
-    junior_indicators = ['intern', 'trainee', 'graduate', 'entry', 'fresher', 'junior']
-    
-    for indicator in senior_indicators:
-        if indicator in resume_lower:
-            return "senior"
-    
-    for indicator in mid_indicators:
-        if indicator in resume_lower:
-            return "mid"
-    
-    for indicator in junior_indicators:
-        if indicator in resume_lower:
-            return "junior"
-    
-    # Default to junior if no clear indicators
-    return "junior"
+    # Explicit years ("5 years experience", "experience: 5 years", ...), then title keywords
+    return scan_experience(resume_text).level(RESUME_YEAR_KINDS, default="junior")
 
+@timed("experience")
 def detect_job_experience_requirement(job_text: str) -> str:
     """Detect required experience level from job description"""
-    job_lower = job_text.lower()
-    
-    # Look for explicit experience requirements
-    experience_patterns = [
-        r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
-        r'minimum\s*(\d+)\+?\s*years?',
-        r'at\s*least\s*(\d+)\+?\s*years?',
-    ]
-    
-    years_found = []
-    for pattern in experience_patterns:
-        matches = re.findall(pattern, job_lower)
-        for match in matches:
-            try:
-                years_found.append(int(match))
-            except ValueError:
-                continue
-    
-    # Determine required experience level
-    if years_found:
-        max_years = max(years_found)
-        if max_years >= 5:
-            return "senior"
-        elif max_years >= 2:
-            return "mid"
-        else:
-            return "junior"
-    
-    # Look for other indicators
-    senior_indicators = ['senior', 'lead', 'principal', 'architect', 'manager', 'director']
-    mid_indicators = ['associate', 'specialist', 'analyst']
-    junior_indicators = ['intern', 'trainee', 'graduate', 'entry', 'fresher', 'junior']
-    
-    for indicator in senior_indicators:
-        if indicator in job_lower:
-            return "senior"
-    
-    for indicator in mid_indicators:
-        if indicator in job_lower:
-            return "mid"
-    
-    for indicator in junior_indicators:
-        if indicator in job_lower:
-            return "junior"
-    
-    # Default to mid level
-    return "mid"
+    # Explicit requirements ("5+ years of experience", "minimum 5 years", ...), then title keywords
+    return scan_experience(job_text).level(JOB_YEAR_KINDS, default="mid")
+
+# Domain multipliers: a bonus when resume and job share a dominant domain, a penalty otherwise
+DOMAIN_MATCH_BONUSES = {
+    'ai_ml': 1.1,  # 25% bonus for AI/ML matches
+    'tech': 1.15,   # 20% bonus for tech matches
+    'design': 1.15, # 15% bonus for design matches
+    'marketing': 1.1, # 10% bonus for marketing matches
+    'business': 1.1  # 10% bonus for business matches
+}
+DOMAIN_MISMATCH_PENALTIES = {
+    ('ai_ml', 'marketing'): 0.3,
+    ('ai_ml', 'design'): 0.4,
+    ('tech', 'marketing'): 0.4,
+    ('tech', 'design'): 0.6,
+    ('design', 'ai_ml'): 0.3,
+    ('design', 'marketing'): 0.5,
+    ('marketing', 'ai_ml'): 0.2,
+    ('marketing', 'tech'): 0.3,
+    ('marketing', 'design'): 0.4,
+}
 
-def calculate_domain_mismatch_penalty(resume_skills: set, job_skills: set) -> float:
+def dominant_skill_domain(skills: set) -> Optional[str]:
+    """Return the domain group with the most matching skills, or None if no group matches"""
+    return taxonomy.dominant_domain(skills)
+
+@timed("domain_penalty")
+def calculate_domain_mismatch_penalty(resume_skills: set, job_skills: set, domains: Optional[tuple] = None) -> float:
     """Calculate penalty for domain mismatch (e.g., AI/ML resume for marketing job)"""
-    # Define domain skill groups
-    domain_groups = {
-        'tech': {'python', 'java', 'javascript', 'typescript', 'react', 'angular', 'vue', 'node.js', 'django', 'flask', 'spring', 'html', 'css', 'sql', 'mongodb', 'postgresql', 'git', 'docker', 'kubernetes', 'aws', 'azure', 'gcp'},
-        'ai_ml': {'machine learning', 'deep learning', 'pytorch', 'tensorflow', 'scikit-learn', 'keras', 'pandas', 'numpy', 'nlp', 'cv', 'computer vision', 'neural networks', 'data science', 'statistics', 'matplotlib', 'seaborn', 'jupyter', 'transformers', 'huggingface', 'llm', 'openai'},
-        'design': {'figma', 'sketch', 'adobe-xd', 'photoshop', 'illustrator', 'ui/ux', 'user experience', 'user interface', 'prototyping', 'wireframing', 'design thinking', 'user research', 'accessibility', 'responsive design', 'visual design'},
-        'marketing': {'seo', 'sem', 'google ads', 'facebook ads', 'social media', 'content marketing', 'email marketing', 'analytics', 'google analytics', 'marketing automation', 'copywriting', 'brand management', 'campaign management', 'market research', 'conversion optimization'},
-        'business': {'project management', 'agile', 'scrum', 'leadership', 'strategy', 'analysis', 'communication', 'presentation', 'excel', 'powerpoint', 'stakeholder management', 'process improvement'}
-    }
-    
-    # Find dominant domains in resume and job
-    resume_domain_scores = {}
-    job_domain_scores = {}
-    
-    for domain, domain_skills in domain_groups.items():
-        resume_domain_scores[domain] = len(resume_skills & domain_skills)
-        job_domain_scores[domain] = len(job_skills & domain_skills)
-    
-    # Get the dominant domain for each
-    resume_dominant = max(resume_domain_scores, key=resume_domain_scores.get) if max(resume_domain_scores.values()) > 0 else None
-    job_dominant = max(job_domain_scores, key=job_domain_scores.get) if max(job_domain_scores.values()) > 0 else None
+    # Find dominant domains in resume and job (domains: precomputed (resume, job) pair)
+    if domains is None:
+        domains = dominant_skill_domain(resume_skills), dominant_skill_domain(job_skills)
+    resume_dominant, job_dominant = domains
     
     # Apply penalty for domain mismatch OR bonus for good matches
     if resume_dominant and job_dominant:
         if resume_dominant == job_dominant:
             # Bonus for perfect domain match
-            domain_match_bonuses = {
-                'ai_ml': 1.1,  # 25% bonus for AI/ML matches
-                'tech': 1.15,   # 20% bonus for tech matches
-                'design': 1.15, # 15% bonus for design matches
-                'marketing': 1.1, # 10% bonus for marketing matches
-                'business': 1.1  # 10% bonus for business matches
-            }
-            return domain_match_bonuses.get(resume_dominant, 1.1)
+            return DOMAIN_MATCH_BONUSES.get(resume_dominant, 1.1)
         else:
             # Penalty for domain mismatch
-            domain_mismatch_penalties = {
-                ('ai_ml', 'marketing'): 0.3,
-                ('ai_ml', 'design'): 0.4,
-                ('tech', 'marketing'): 0.4,
-                ('tech', 'design'): 0.6,
-                ('design', 'ai_ml'): 0.3,
-                ('design', 'marketing'): 0.5,
-                ('marketing', 'ai_ml'): 0.2,
-                ('marketing', 'tech'): 0.3,
-                ('marketing', 'design'): 0.4,
-            }
-            
             penalty_key = (resume_dominant, job_dominant)
-            return domain_mismatch_penalties.get(penalty_key, 0.7)  # Default moderate penalty
+            return DOMAIN_MISMATCH_PENALTIES.get(penalty_key, 0.7)  # Default moderate penalty
     
     return 1.0  # No penalty if domains match or are unclear
 
+@timed("skill_scoring")
 def calculate_skill_match_score(resume_skills: set, job_skills: set) -> float:
     """Calculate a more nuanced skill match score using fuzzy matching"""
     if not job_skills:
         return 1.0
 
-    # Use domain_skills from outer scope
-    # Create a map of related skills
-    related_skills = {}
-    for domain_skills_list in domain_skills.values():
-        for skill in domain_skills_list:
-            related = set(domain_skills_list) - {skill}
-            related_skills[skill] = related
+    # Fuzzy match (> 87) against the resume, or partial credit (0.7) when a related
+    # skill from the same domain fuzzy-matches (> 82); see SkillSimilarityIndex
+    job_skill_list = list(job_skills)
+    matched, related = taxonomy.skill_similarity.match_flags(job_skill_list, resume_skills)
 
     score = 0
-    total_weight = len(job_skills)
+    total_weight = len(job_skill_list)
 
-    for skill in job_skills:
-        # Fuzzy match: consider a skill matched if similarity > 87 (balanced)
-        matched = any(fuzz.ratio(skill, r_skill) > 87 for r_skill in resume_skills)
-        if matched:
+    for is_matched, is_related in zip(matched, related):
+        if is_matched:
             score += 1
-        else:
-            # Check for related skills (balanced fuzzy matching)
-            related = related_skills.get(skill, set())
-            if any(fuzz.ratio(r, s) > 82 for r in related for s in resume_skills):
-                score += 0.7  # Moderate score for related skills
+        elif is_related:
+            score += 0.7  # Moderate score for related skills
 
     final_score = score / total_weight
     
     # Apply bonus for high skill density (many relevant skills)
-    if len(resume_skills & job_skills) >= 5:  # If 5+ skills match
+    shared_skills = len(resume_skills & job_skills)
+    if shared_skills >= 5:  # If 5+ skills match
         final_score *= 1.15  # 15% bonus for skill-rich matches
-    elif len(resume_skills & job_skills) >= 3:  # If 3+ skills match
+    elif shared_skills >= 3:  # If 3+ skills match
         final_score *= 1.1   # 10% bonus for decent skill matches
     
     return min(1.0, final_score)  # Cap at 1.0
 
-@app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_resume(request: AnalysisRequest) -> AnalysisResponse:
-    """Analyze a resume against a job description using AI"""
+def flatten_skills(skills_dict: dict) -> set:
+    """Convert categorized skills to a flat set"""
+    skills = set()
+    for domain_skills in skills_dict.values():
+        if isinstance(domain_skills, list):
+            skills.update(domain_skills)
+    return skills
+
+def compute_skill_features(resume_text: str, job_text: str) -> tuple:
+    """Run the fast stages: skill extraction and experience detection"""
+    # Extract skills using advanced techniques (both documents in one spaCy batch)
+    resume_skills, job_skills = extract_skill_sets([resume_text, job_text], parse_documents([resume_text, job_text]))
+    
+    # Detect experience levels
+    resume_experience = detect_experience_level(resume_text)
+    job_experience = detect_job_experience_requirement(job_text)
+    
+    return resume_skills, job_skills, resume_experience, job_experience
+
+def compute_analysis_features(resume_text: str, job_text: str) -> tuple:
+    """Run the model-backed stages: skill extraction, experience detection and semantic similarity"""
+    skill_features = compute_skill_features(resume_text, job_text)
+    
+    # Calculate semantic similarity
+    semantic_sim = calculate_semantic_similarity(resume_text, job_text)
+    
+    return (*skill_features, semantic_sim)
+
+def score_analysis(resume_skills: set, job_skills: set, resume_experience: str,
+                   job_experience: str, semantic_sim: float, domains: Optional[tuple] = None) -> AnalysisResponse:
+    """Combine extracted features into the final match percentage and recommendation (domains: see calculate_domain_mismatch_penalty)"""
+    # Find missing skills
+    missing_skills = list(job_skills - resume_skills)
+    
+    # Calculate skill match score
+    skill_score = calculate_skill_match_score(resume_skills, job_skills)
+    
+    # Apply experience level penalty/bonus (more lenient)
+    experience_multiplier = 1.0
+    if resume_experience == "junior" and job_experience == "senior":
+        experience_multiplier = 0.5  # Moderate penalty for junior applying to senior role
+    elif resume_experience == "junior" and job_experience == "mid":
+        experience_multiplier = 0.8  # Light penalty for junior applying to mid role
+    elif resume_experience == "mid" and job_experience == "senior":
+        experience_multiplier = 0.85  # Small penalty for mid applying to senior role
+    elif resume_experience == "senior" and job_experience == "junior":
+        experience_multiplier = 1.1  # Small bonus for overqualified
+    elif resume_experience == "senior" and job_experience == "mid":
+        experience_multiplier = 1.05  # Tiny bonus for overqualified
+    
+    # Calculate domain mismatch penalty
+    domain_penalty = calculate_domain_mismatch_penalty(resume_skills, job_skills, domains)
+    
+    # Combine scores with much higher weight on skills (80% skills, 20% semantic)
+    base_score = (semantic_sim * 0.2 + skill_score * 0.8) * 100
+    match_percentage = base_score * experience_multiplier * domain_penalty
+    
+    # Apply realistic scaling with some base boost for better UX
+    # Add a small base score to avoid extremely low scores
+    match_percentage = max(5, match_percentage)  # Minimum 5% to avoid zeros
+    match_percentage = min(95, match_percentage)  # Cap at 95% to be more realistic
+    
+    # Generate intelligent recommendation
+    recommendation = generate_smart_recommendation(
+        match_percentage, missing_skills, resume_skills, job_skills
+    )
+    
+    logger.info(f"Analysis complete. Match percentage: {match_percentage:.2f}%")
+    logger.debug(f"Debug - Resume experience: {resume_experience}, Job experience: {job_experience}")
+    logger.debug(f"Debug - Semantic similarity: {semantic_sim:.3f}, Skill score: {skill_score:.3f}")
+    logger.debug(f"Debug - Experience multiplier: {experience_multiplier:.3f}, Domain penalty: {domain_penalty:.3f}")
+    logger.debug(f"Debug - Resume skills count: {len(resume_skills)}, Job skills count: {len(job_skills)}")
+    logger.debug(f"Debug - Missing skills: {missing_skills[:5]}")
+    
+    return AnalysisResponse(
+        match_percentage=round(match_percentage, 2),
+        missing_skills=missing_skills[:6],  # Show fewer missing skills
+        recommendation=recommendation
+    )
+
+def build_job_profile(job_text: str) -> JobProfile:
+    """Parse, classify and encode a job description once"""
+    embeddings = None
+    if sentence_model is not None:
+        try:
+            embeddings = encode_chunks(split_text_chunks(job_text))
+        except Exception as e:
+            logger.error(f"Job encoding failed: {str(e)}")
+    
+    skills = flatten_skills(extract_advanced_skills(job_text))
+    return JobProfile(
+        job_text=job_text,
+        skills=skills,
+        experience=detect_job_experience_requirement(job_text),
+        domain=dominant_skill_domain(skills),
+        embeddings=embeddings
+    )
+
+def batch_semantic_similarity(resume_texts: List[str], job_profile: JobProfile) -> List[float]:
+    """Semantic similarity of many resumes to one job, encoding all resume chunks together"""
     try:
+        if sentence_model is not None and job_profile.embeddings is not None:
+            resume_chunks = [split_text_chunks(text) for text in resume_texts]
+            all_embeddings = encode_chunks([chunk for chunks in resume_chunks for chunk in chunks])
+            
+            similarities = []
+            offset = 0
+            for chunks in resume_chunks:
+                resume_embeddings = all_embeddings[offset:offset + len(chunks)]
+                similarities.append(similarity_from_embeddings(resume_embeddings, job_profile.embeddings))
+                offset += len(chunks)
+            return similarities
+        metrics.count_word_similarity_fallback("no_model", len(resume_texts))
+    except Exception as e:
+        logger.error(f"Batch similarity calculation failed: {str(e)}")
+        metrics.count_word_similarity_fallback("error", len(resume_texts))
+    return [calculate_word_similarity(text, job_profile.job_text) for text in resume_texts]
+
+def compute_batch_features(job_profile: JobProfile, resume_texts: List[str]) -> List[tuple]:
+    """Run the model-backed stages for many resumes against one pre-built job profile"""
+    resume_skills = extract_skill_sets(resume_texts, parse_documents(resume_texts))
+    resume_experiences = [detect_experience_level(text) for text in resume_texts]
+    semantic_sims = batch_semantic_similarity(resume_texts, job_profile)
+    
+    return [
+        (skills, job_profile.skills, experience, job_profile.experience, semantic_sim)
+        for skills, experience, semantic_sim in zip(resume_skills, resume_experiences, semantic_sims)
+    ]
+
+def compute_profile_skill_features(job_profile: JobProfile, resume_text: str) -> tuple:
+    """Run the fast stages for one resume against a pre-built job profile"""
+    resume_skills, = extract_skill_sets([resume_text], parse_documents([resume_text]))
+    return resume_skills, job_profile.skills, detect_experience_level(resume_text), job_profile.experience
+
+def build_candidate_entries(resumes: List[IndexedResume]) -> List[CandidateEntry]:
+    """Extract skills, experience and a document vector for resumes being indexed"""
+    texts = [resume.resume_text for resume in resumes]
+    docs = parse_documents(texts)
+    
+    vectors = [None] * len(texts)
+    if sentence_model is not None:
+        try:
+            resume_chunks = [split_text_chunks(text) for text in texts]
+            all_embeddings = encode_chunks([chunk for chunks in resume_chunks for chunk in chunks])
+            offset = 0
+            for i, chunks in enumerate(resume_chunks):
+                vectors[i] = document_vector(all_embeddings[offset:offset + len(chunks)])
+                offset += len(chunks)
+        except Exception as e:
+            logger.error(f"Resume encoding for the candidate index failed: {str(e)}")
+    
+    return [
+        CandidateEntry(
+            resume_id=resume.resume_id,
+            resume_text=text,
+            skills=skills,
+            experience=detect_experience_level(text),
+            vector=vector
+        )
+        for resume, text, skills, vector in zip(resumes, texts, extract_skill_sets(texts, docs), vectors)
+    ]
+
+def search_candidates(job_profile: JobProfile, top_k: int, min_skill_overlap: int) -> List[CandidateMatch]:
+    """Shortlist indexed resumes by skill overlap and vector similarity, then re-rank with the full score"""
+    shortlist = candidate_index.shortlist(
+        job_profile.skills, document_vector(job_profile.embeddings), min_skill_overlap, top_k * SEARCH_RERANK_FACTOR
+    )
+    if not shortlist:
+        return []
+    
+    # Stored skills and experience are reused; only the semantic similarity is computed
+    # (chunk embeddings were cached when the resumes were indexed)
+    resumes = candidate_index.resumes([row for row, _, _ in shortlist])
+    shortlist = [item for item in shortlist if item[0] in resumes]
+    semantic_sims = batch_semantic_similarity([resumes[row][1] for row, _, _ in shortlist], job_profile)
+    
+    matches = []
+    for (row, vector_similarity, skill_overlap), semantic_sim in zip(shortlist, semantic_sims):
+        resume_id, _, skills, experience = resumes[row]
+        result = score_analysis(skills, job_profile.skills, experience, job_profile.experience, semantic_sim)
+        matches.append(CandidateMatch(
+            resume_id=resume_id,
+            vector_similarity=round(vector_similarity, 4) if vector_similarity is not None else None,
+            skill_overlap=skill_overlap,
+            **result.model_dump()
+        ))
+    
+    matches.sort(key=lambda match: match.match_percentage, reverse=True)
+    return matches[:top_k]
+
+def score_batch(features: List[tuple]) -> List[AnalysisResponse]:
+    """Score a list of feature tuples produced by compute_batch_features"""
+    # Dominant domains of every resume and job skill set in two matrix products
+    domain_group_masks = taxonomy.domain_group_masks
+    resume_domains = domain_group_masks.dominant_many([resume_features[0] for resume_features in features])
+    job_domains = domain_group_masks.dominant_many([resume_features[1] for resume_features in features])
+    return [
+        score_analysis(*resume_features, domains=domains)
+        for resume_features, domains in zip(features, zip(resume_domains, job_domains))
+    ]
+
+def resolve_job_profile(request: BaseModel) -> Optional[JobProfile]:
+    """Return the registered profile for a request using job_id, or None when it sends job_text"""
+    if request.job_id is None:
+        if request.job_text is None:
+            raise HTTPException(status_code=422, detail="Either job_text or job_id is required")
+        return None
+    job_profile = job_registry.get(request.job_id)
+    if job_profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job_id: {request.job_id}")
+    return job_profile
+
+def require_models_ready():
+    """Reject inference requests while models are still loading in the background"""
+    if not model_status.ready:
+        raise HTTPException(status_code=503, detail="Models are still loading, please retry shortly", headers={"Retry-After": "5"})
+
+def analysis_cache_key(request: AnalysisRequest, job_profile: Optional[JobProfile]) -> str:
+    """Result cache key: scoring version, taxonomy and model settings, and the normalized texts"""
+    job_text = job_profile.job_text if job_profile is not None else request.job_text
+    return result_key(
+        SCORING_VERSION, taxonomy.version, str(encoder_backend), SPACY_PIPELINE,
+        str(text_chunker.max_tokens), str(text_chunker.max_chunks),
+        "profile" if job_profile is not None else "text",
+        normalize_text(request.resume_text), normalize_text(job_text)
+    )
+
+async def run_analysis(request: AnalysisRequest, job_profile: Optional[JobProfile]) -> AnalysisResponse:
+    """Run the full analysis pipeline on the worker pools"""
+    async with inference_executor.admission():
         logger.info("Starting resume analysis")
         
-        # Extract skills using advanced techniques
-        resume_skills_dict = extract_advanced_skills(request.resume_text)
-        job_skills_dict = extract_advanced_skills(request.job_text)
-        
-        # Convert categorized skills to flat sets
-        resume_skills = set()
-        for domain_skills in resume_skills_dict.values():
-            if isinstance(domain_skills, list):
-                resume_skills.update(domain_skills)
-        
-        job_skills = set()
-        for domain_skills in job_skills_dict.values():
-            if isinstance(domain_skills, list):
-                job_skills.update(domain_skills)
-        
-        # Find missing skills
-        missing_skills = list(job_skills - resume_skills)
-        
-        # Detect experience levels
-        resume_experience = detect_experience_level(request.resume_text)
-        job_experience = detect_job_experience_requirement(request.job_text)
-        
-        # Calculate semantic similarity
-        semantic_sim = calculate_semantic_similarity(request.resume_text, request.job_text)
-        
-        # Calculate skill match score
-        skill_score = calculate_skill_match_score(resume_skills, job_skills)
-        
-        # Apply experience level penalty/bonus (more lenient)
-        experience_multiplier = 1.0
-        if resume_experience == "junior" and job_experience == "senior":
-            experience_multiplier = 0.5  # Moderate penalty for junior applying to senior role
-        elif resume_experience == "junior" and job_experience == "mid":
-            experience_multiplier = 0.8  # Light penalty for junior applying to mid role
-        elif resume_experience == "mid" and job_experience == "senior":
-            experience_multiplier = 0.85  # Small penalty for mid applying to senior role
-        elif resume_experience == "senior" and job_experience == "junior":
-            experience_multiplier = 1.1  # Small bonus for overqualified
-        elif resume_experience == "senior" and job_experience == "mid":
-            experience_multiplier = 1.05  # Tiny bonus for overqualified
-        
-        # Calculate domain mismatch penalty
-        domain_penalty = calculate_domain_mismatch_penalty(resume_skills, job_skills)
-        
-        # Combine scores with much higher weight on skills (80% skills, 20% semantic)
-        base_score = (semantic_sim * 0.2 + skill_score * 0.8) * 100
-        match_percentage = base_score * experience_multiplier * domain_penalty
-        
-        # Apply realistic scaling with some base boost for better UX
-        # Add a small base score to avoid extremely low scores
-        match_percentage = max(5, match_percentage)  # Minimum 5% to avoid zeros
-        match_percentage = min(95, match_percentage)  # Cap at 95% to be more realistic
-        
-        # Generate intelligent recommendation
-        recommendation = generate_smart_recommendation(
-            match_percentage, missing_skills, resume_skills, job_skills
+        # Model inference runs on the executor so the event loop stays responsive
+        if job_profile is None:
+            features = await inference_executor.run_inference(
+                compute_analysis_features, request.resume_text, request.job_text
+            )
+        else:
+            # Registered job: only the resume side needs to be computed
+            features, = await inference_executor.run_inference(
+                compute_batch_features, job_profile, [request.resume_text]
+            )
+        return await inference_executor.run_scoring(score_analysis, *features)
+
+@app.post("/analyze", response_model=AnalysisResponse)
+async def analyze_resume(request: AnalysisRequest) -> AnalysisResponse:
+    """Analyze a resume against a job description (or a registered job_id) using AI"""
+    require_models_ready()
+    job_profile = resolve_job_profile(request)
+    try:
+        if result_cache is None:
+            return await run_analysis(request, job_profile)
+        # Repeated and concurrent identical requests share one computation
+        return await result_cache.get_or_compute(
+            analysis_cache_key(request, job_profile), lambda: run_analysis(request, job_profile)
         )
         
-        logger.info(f"Analysis complete. Match percentage: {match_percentage:.2f}%")
-        logger.info(f"Debug - Resume experience: {resume_experience}, Job experience: {job_experience}")
-        logger.info(f"Debug - Semantic similarity: {semantic_sim:.3f}, Skill score: {skill_score:.3f}")
-        logger.info(f"Debug - Experience multiplier: {experience_multiplier:.3f}, Domain penalty: {domain_penalty:.3f}")
-        logger.info(f"Debug - Resume skills count: {len(resume_skills)}, Job skills count: {len(job_skills)}")
-        logger.info(f"Debug - Missing skills: {missing_skills[:5]}")
+    except ExecutorSaturatedError as e:
+        logger.warning(f"Rejecting analysis request: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service is busy, please retry shortly")
+    except Exception as e:
+        logger.error(f"Error during analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+@app.post("/analyze/stream")
+async def analyze_resume_stream(request: AnalysisRequest) -> StreamingResponse:
+    """Analyze a resume, streaming NDJSON events as each stage finishes (skills, semantic, result)"""
+    require_models_ready()
+    job_profile = resolve_job_profile(request)
+    if inference_executor.in_flight >= inference_executor.max_queue_depth:
+        raise HTTPException(status_code=503, detail="Service is busy, please retry shortly")
+    
+    async def events():
+        try:
+            async with inference_executor.admission():
+                logger.info("Starting streaming resume analysis")
+                
+                # Cheap stages first: skills and experience levels
+                if job_profile is None:
+                    skill_features = await inference_executor.run_inference(
+                        compute_skill_features, request.resume_text, request.job_text
+                    )
+                else:
+                    skill_features = await inference_executor.run_inference(
+                        compute_profile_skill_features, job_profile, request.resume_text
+                    )
+                resume_skills, job_skills, resume_experience, job_experience = skill_features
+                yield json.dumps({
+                    "stage": "skills",
+                    "missing_skills": list(job_skills - resume_skills)[:6],
+                    "resume_experience": resume_experience,
+                    "job_experience": job_experience
+                }) + "\n"
+                
+                # Transformer similarity
+                if job_profile is None:
+                    semantic_sim = await inference_executor.run_inference(
+                        calculate_semantic_similarity, request.resume_text, request.job_text
+                    )
+                else:
+                    semantic_sim, = await inference_executor.run_inference(
+                        batch_semantic_similarity, [request.resume_text], job_profile
+                    )
+                yield json.dumps({"stage": "semantic", "semantic_similarity": round(semantic_sim, 4)}) + "\n"
+                
+                # Final score and recommendation
+                result = await inference_executor.run_scoring(
+                    score_analysis, resume_skills, job_skills, resume_experience, job_experience, semantic_sim
+                )
+                yield json.dumps({"stage": "result", **result.model_dump()}) + "\n"
         
-        return AnalysisResponse(
-            match_percentage=round(match_percentage, 2),
-            missing_skills=missing_skills[:6],  # Show fewer missing skills
-            recommendation=recommendation
+        except ExecutorSaturatedError as e:
+            logger.warning(f"Rejecting streaming analysis request: {str(e)}")
+            yield json.dumps({"stage": "error", "detail": "Service is busy, please retry shortly"}) + "\n"
+        except Exception as e:
+            logger.error(f"Error during streaming analysis: {str(e)}")
+            yield json.dumps({"stage": "error", "detail": f"Analysis failed: {str(e)}"}) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+def job_profile_response(job_id: str, job_profile: JobProfile) -> JobProfileResponse:
+    """Describe a registered job profile"""
+    return JobProfileResponse(
+        job_id=job_id,
+        skills=sorted(job_profile.skills),
+        experience_level=job_profile.experience,
+        domain=job_profile.domain,
+        chunk_count=len(job_profile.embeddings) if job_profile.embeddings is not None else 0
+    )
+
+@app.post("/jobs", response_model=JobProfileResponse)
+async def register_job(request: JobRegistrationRequest) -> JobProfileResponse:
+    """Analyze a job description once and store its profile for later /analyze calls by job_id"""
+    require_models_ready()
+    try:
+        async with inference_executor.admission():
+            job_profile = await inference_executor.run_inference(build_job_profile, request.job_text)
+    except ExecutorSaturatedError as e:
+        logger.warning(f"Rejecting job registration: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service is busy, please retry shortly")
+    except Exception as e:
+        logger.error(f"Error during job registration: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Job registration failed: {str(e)}")
+    
+    job_id = job_registry.add(job_profile)
+    logger.info(f"Registered job {job_id} with {len(job_profile.skills)} skills")
+    return job_profile_response(job_id, job_profile)
+
+@app.get("/jobs/{job_id}", response_model=JobProfileResponse)
+async def get_job(job_id: str) -> JobProfileResponse:
+    """Return a registered job profile"""
+    job_profile = job_registry.get(job_id)
+    if job_profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown job_id: {job_id}")
+    return job_profile_response(job_id, job_profile)
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    """Remove a registered job profile"""
+    if not job_registry.remove(job_id):
+        raise HTTPException(status_code=404, detail=f"Unknown job_id: {job_id}")
+    return {"job_id": job_id, "deleted": True}
+
+def require_candidate_index():
+    """Fail requests to the candidate search endpoints when the index is not available"""
+    require_models_ready()
+    if candidate_index is None:
+        raise HTTPException(
+            status_code=503, detail="Candidate index is not available; it needs CANDIDATE_INDEX_DIR and a single worker (WORKERS=1)"
         )
+
+@app.post("/resumes", response_model=IndexResumesResponse)
+async def index_resumes(request: IndexResumesRequest) -> IndexResumesResponse:
+    """Add resumes to the candidate search index (an existing resume_id is replaced)"""
+    require_candidate_index()
+    if len(request.resumes) > MAX_BATCH_RESUMES:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds the limit of {MAX_BATCH_RESUMES} resumes")
+    
+    metrics.observe_batch_size("index_resumes", len(request.resumes))
+    try:
+        async with inference_executor.admission():
+            entries = await inference_executor.run_inference(build_candidate_entries, request.resumes)
+            await inference_executor.run_inference(candidate_index.add_many, entries)
+    except ExecutorSaturatedError as e:
+        logger.warning(f"Rejecting resume indexing request: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service is busy, please retry shortly")
+    except Exception as e:
+        logger.error(f"Error during resume indexing: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Resume indexing failed: {str(e)}")
+    
+    return IndexResumesResponse(indexed=len(entries), total=candidate_index.stats()["resumes"])
+
+@app.delete("/resumes/{resume_id}")
+async def delete_resume(resume_id: str):
+    """Remove a resume from the candidate search index"""
+    require_candidate_index()
+    if not candidate_index.remove(resume_id):
+        raise HTTPException(status_code=404, detail=f"Unknown resume_id: {resume_id}")
+    return {"resume_id": resume_id, "deleted": True}
+
+@app.post("/search", response_model=SearchResponse)
+async def search_resumes(request: SearchRequest) -> SearchResponse:
+    """Find the best-matching indexed resumes for a job description (or a registered job_id)"""
+    require_candidate_index()
+    if not 1 <= request.top_k <= MAX_SEARCH_TOP_K:
+        raise HTTPException(status_code=422, detail=f"top_k must be between 1 and {MAX_SEARCH_TOP_K}")
+    job_profile = resolve_job_profile(request)
+    
+    try:
+        async with inference_executor.admission():
+            if job_profile is None:
+                job_profile = await inference_executor.run_inference(build_job_profile, request.job_text)
+            results = await inference_executor.run_inference(
+                search_candidates, job_profile, request.top_k, request.min_skill_overlap
+            )
+    except ExecutorSaturatedError as e:
+        logger.warning(f"Rejecting search request: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service is busy, please retry shortly")
+    except Exception as e:
+        logger.error(f"Error during candidate search: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Candidate search failed: {str(e)}")
+    
+    return SearchResponse(results=results)
+
+@app.post("/analyze/batch", response_model=BatchAnalysisResponse)
+async def analyze_resume_batch(request: BatchAnalysisRequest) -> BatchAnalysisResponse:
+    """Analyze many resumes against one job description, ranked by match percentage"""
+    require_models_ready()
+    if len(request.resumes) > MAX_BATCH_RESUMES:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds the limit of {MAX_BATCH_RESUMES} resumes")
+    
+    metrics.observe_batch_size("analyze_batch", len(request.resumes))
+    try:
+        async with inference_executor.admission():
+            logger.info(f"Starting batch analysis of {len(request.resumes)} resumes")
+            
+            # The job is parsed and encoded once, resumes are processed in batches
+            job_profile = await inference_executor.run_inference(build_job_profile, request.job_text)
+            features = await inference_executor.run_inference(compute_batch_features, job_profile, request.resumes)
+            results = await inference_executor.run_scoring(score_batch, features)
         
+    except ExecutorSaturatedError as e:
+        logger.warning(f"Rejecting batch analysis request: {str(e)}")
+        raise HTTPException(status_code=503, detail="Service is busy, please retry shortly")
     except Exception as e:
-        logger.error(f"Error during analysis: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        logger.error(f"Error during batch analysis: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
+    
+    ranked = sorted(enumerate(results), key=lambda item: item[1].match_percentage, reverse=True)
+    return BatchAnalysisResponse(results=[
+        RankedAnalysisResponse(resume_index=index, **result.model_dump()) for index, result in ranked
+    ])
+
+@lru_cache(maxsize=64)
+def cached_job_profile(job_text: str, taxonomy_version: str) -> JobProfile:
+    """Job profile for bulk and offline records that send job_text; such runs score many resumes against few jobs"""
+    return build_job_profile(job_text)
+
+def analyze_records(records: List[dict]) -> List[dict]:
+    """Analyze a list of analysis records, returning {"result": ...} or {"error": ...} per record.
+    Records are grouped by job, so each job is parsed and encoded once and its resumes are
+    encoded together. Used by bulk jobs and by the offline scorer (score_offline.py)."""
+    outcomes: List[Optional[dict]] = [None] * len(records)
+    groups: Dict[tuple, List[int]] = defaultdict(list)
+    profiles: Dict[tuple, Optional[JobProfile]] = {}
+    resume_texts: Dict[int, str] = {}
+    for index, record in enumerate(records):
+        try:
+            request = AnalysisRequest(**record)
+            job_profile = resolve_job_profile(request)
+        except ValidationError as e:
+            outcomes[index] = {"error": "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())}
+            continue
+        except HTTPException as e:
+            outcomes[index] = {"error": e.detail}
+            continue
+        key = ("job_id", request.job_id) if job_profile is not None else ("job_text", request.job_text)
+        profiles[key] = job_profile
+        groups[key].append(index)
+        resume_texts[index] = request.resume_text
+    
+    for key, indexes in groups.items():
+        try:
+            job_profile = profiles[key]
+            if job_profile is None:
+                job_profile = cached_job_profile(key[1], taxonomy.version)
+            features = compute_batch_features(job_profile, [resume_texts[index] for index in indexes])
+            for index, result in zip(indexes, score_batch(features)):
+                outcomes[index] = {"result": result.model_dump()}
+        except Exception as e:
+            logger.error(f"Error during bulk analysis: {str(e)}")
+            for index in indexes:
+                outcomes[index] = {"error": f"Analysis failed: {str(e)}"}
+    return outcomes
+
+async def analyze_bulk_batch(records: List[dict]) -> List[dict]:
+    """Analyze one batch of bulk job records on the inference threads"""
+    outcomes = await inference_executor.run_inference(analyze_records, records)
+    metrics.observe_batch_size("bulk", len(records))
+    return outcomes
+
+def require_bulk_jobs():
+    """Fail bulk job requests when bulk jobs are disabled"""
+    if bulk_jobs is None:
+        raise HTTPException(status_code=503, detail="Bulk jobs are disabled (BULK_JOB_DIR is empty or not writable)")
+
+def bulk_job_response(state: dict) -> BulkJobResponse:
+    """Describe a bulk job's progress"""
+    elapsed = (state["finished_at"] or state["updated_at"] or 0) - (state["started_at"] or 0)
+    return BulkJobResponse(
+        progress=round(state["lines_read"] / state["total_lines"], 4) if state["total_lines"] else 1.0,
+        lines_per_second=round(state["lines_read"] / elapsed, 2) if state["updated_at"] and elapsed > 0 else None,
+        **{field: state[field] for field in BulkJobResponse.model_fields if field in state}
+    )
+
+def get_bulk_job_state(job_id: str) -> dict:
+    require_bulk_jobs()
+    state = bulk_jobs.status(job_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail=f"Unknown bulk job: {job_id}")
+    return state
+
+@app.post("/bulk-jobs", response_model=BulkJobResponse, status_code=202)
+async def create_bulk_job(request: Request) -> BulkJobResponse:
+    """Queue a JSONL upload for background analysis; the request body is streamed to disk"""
+    require_bulk_jobs()
+    try:
+        state = await bulk_jobs.create(request.stream())
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return bulk_job_response(state)
+
+@app.get("/bulk-jobs/{job_id}", response_model=BulkJobResponse)
+async def get_bulk_job(job_id: str) -> BulkJobResponse:
+    """Progress of a bulk job"""
+    return bulk_job_response(get_bulk_job_state(job_id))
+
+@app.get("/bulk-jobs/{job_id}/results")
+async def get_bulk_job_results(job_id: str) -> StreamingResponse:
+    """Stream the results committed so far as JSONL, in input order"""
+    state = get_bulk_job_state(job_id)
+    return StreamingResponse(
+        bulk_jobs.iter_results(job_id), media_type="application/x-ndjson",
+        headers={"X-Bulk-Job-Status": state["status"]}
+    )
+
+@app.delete("/bulk-jobs/{job_id}")
+async def delete_bulk_job(job_id: str):
+    """Cancel a bulk job and delete its input and results"""
+    require_bulk_jobs()
+    if not bulk_jobs.delete(job_id):
+        raise HTTPException(status_code=404, detail=f"Unknown bulk job: {job_id}")
+    return {"job_id": job_id, "deleted": True}
 
+@timed("recommendation")
 def generate_smart_recommendation(match_percentage: float, missing_skills: List[str], 
                                 resume_skills: set, job_skills: set) -> str:
     """Generate intelligent recommendations based on analysis"""
-    # Identify core vs nice-to-have skills
-    core_skills = {
-        'python', 'java', 'javascript', 'sql', 'git', 'agile', 'communication', 'problem solving', 'analytical', 'teamwork',
-        'leadership', 'project management', 'excel', 'presentation', 'critical thinking', 'adaptability', 'time management',
-        'collaboration', 'creativity', 'attention to detail', 'organization', 'customer service', 'data analysis', 'reporting',
-        'negotiation', 'decision making', 'self-motivation', 'initiative', 'conflict resolution', 'mentoring', 'training'
-    }
-    domain_core_skills = {
-        'data_science': {
-            'python', 'sql', 'machine learning', 'statistics', 'data analysis', 'pandas', 'numpy', 'scikit-learn',
-            'deep learning', 'tensorflow', 'pytorch', 'data visualization', 'matplotlib', 'seaborn', 'feature engineering',
-            'nlp', 'computer vision', 'jupyter', 'big data', 'spark', 'data wrangling'
-        },
-        'web_dev': {
-            'html', 'css', 'javascript', 'typescript', 'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask',
-            'api development', 'responsive design', 'bootstrap', 'sass', 'webpack', 'git', 'rest', 'graphql'
-        },
-        'devops': {
-            'linux', 'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'terraform', 'ansible', 'jenkins', 'ci/cd', 'monitoring',
-            'prometheus', 'grafana', 'scripting', 'bash', 'cloudformation', 'nginx', 'load balancing', 'automation'
-        },
-        'design': {
-            'figma', 'sketch', 'ui/ux', 'adobe', 'photoshop', 'illustrator', 'invision', 'prototyping', 'wireframing',
-            'user research', 'accessibility', 'responsive design', 'branding', 'visual design', 'interaction design'
-        },
-        'marketing': {
-            'seo', 'analytics', 'social media', 'content marketing', 'google ads', 'facebook ads', 'email marketing',
-            'copywriting', 'market research', 'crm', 'hubspot', 'salesforce', 'campaign management', 'ppc', 'sem', 'branding'
-        },
-        'finance': {
-            'financial analysis', 'excel', 'accounting', 'modeling', 'budgeting', 'forecasting', 'quickbooks', 'sap',
-            'reconciliation', 'auditing', 'tax', 'compliance', 'risk management', 'valuation', 'reporting', 'erp'
-        },
-        'hr': {
-            'recruitment', 'talent acquisition', 'onboarding', 'payroll', 'employee relations', 'training', 'performance management',
-            'benefits administration', 'hr analytics', 'succession planning', 'labor law', 'diversity and inclusion'
-        },
-        'project_management': {
-            'project management', 'scrum', 'agile', 'kanban', 'jira', 'trello', 'asana', 'risk management', 'stakeholder management',
-            'resource planning', 'gantt', 'waterfall', 'pmp', 'communication', 'leadership'
-        },
-        'quality_assurance': {
-            'quality assurance', 'qa', 'testing', 'test automation', 'selenium', 'cypress', 'unit testing', 'integration testing',
-            'system testing', 'manual testing', 'bug tracking', 'jira', 'test cases', 'test plans', 'regression testing', 'performance testing',
-            'usability testing', 'defect management', 'continuous integration', 'release management'
-        },
-        'machine_learning': {
-            'machine learning', 'deep learning', 'supervised learning', 'unsupervised learning', 'reinforcement learning',
-            'tensorflow', 'pytorch', 'scikit-learn', 'xgboost', 'lightgbm', 'model deployment', 'mlops', 'feature engineering',
-            'hyperparameter tuning', 'model evaluation', 'data preprocessing', 'model interpretability', 'automl', 'transfer learning'
-        }
-    }
-    
     # Determine the likely domain based on job skills
-    likely_domain = None
-    max_overlap = 0
-    for domain, skills in domain_core_skills.items():
-        overlap = len(skills & job_skills)
-        if overlap > max_overlap:
-            max_overlap = overlap
-            likely_domain = domain
+    recommendation_index = taxonomy.recommendation_index
+    likely_domain = recommendation_index.likely_domain(job_skills)
     
     # Prioritize missing skills based on domain and core requirements
-    if likely_domain:
-        domain_priority_skills = domain_core_skills[likely_domain]
-        high_priority_missing = [s for s in missing_skills if s in domain_priority_skills or s in core_skills]
-        other_missing = [s for s in missing_skills if s not in high_priority_missing]
-    else:
-        high_priority_missing = [s for s in missing_skills if s in core_skills]
-        other_missing = [s for s in missing_skills if s not in high_priority_missing]
+    high_priority_missing, other_missing = recommendation_index.prioritize(missing_skills, likely_domain)
     
     if match_percentage >= 85:
         if high_priority_missing:
@@ -580,17 +1219,131 @@ def generate_smart_recommendation(match_percentage: float, missing_skills: List[
 
 @app.on_event("startup")
 async def startup_event():
-    """Load models on startup"""
+    """Start the worker pools and begin loading models without blocking the server"""
+    global bulk_jobs
     logger.info("Starting up Resume Analyzer AI Service...")
-    load_models()
+    inference_executor.start()
+    if BULK_JOB_DIR:
+        try:
+            bulk_jobs = BulkJobManager(
+                BULK_JOB_DIR, analyze_bulk_batch, BULK_BATCH_SIZE, BULK_CONCURRENCY,
+                BULK_MAX_UPLOAD_MB * 1024 * 1024, BULK_JOB_RETENTION_HOURS * 3600,
+                is_ready=lambda: model_status.ready
+            )
+            # Unfinished jobs resume from their last checkpoint once the models are ready
+            bulk_jobs.start()
+        except OSError as e:
+            logger.error(f"Error opening bulk job directory: {str(e)}")
+            bulk_jobs = None
+    if model_status.ready:
+        # serve.py workers load and warm up before they start serving
+        return
+    if BACKGROUND_MODEL_LOAD:
+        # The server accepts connections right away; /ready turns 200 once models are warm
+        threading.Thread(target=prepare_models, name="model-loader", daemon=True).start()
+    else:
+        prepare_models()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the worker pools on shutdown"""
+    if bulk_jobs is not None:
+        await bulk_jobs.stop()
+    if encode_scheduler is not None:
+        encode_scheduler.stop()
+    inference_executor.shutdown()
+
+@app.get("/live")
+async def liveness_check():
+    """Liveness probe: the process is up and the event loop is responding"""
+    return {"status": "alive"}
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 200 once models are loaded and warmed up, 503 before that"""
+    status = model_status.snapshot()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus metrics: stage latency histograms, fallbacks, batch sizes, cache and queue statistics"""
+    body = metrics.render()
+    if body is None:
+        raise HTTPException(status_code=503, detail="prometheus_client is not installed")
+    return Response(content=body, headers={"Content-Type": metrics.CONTENT_TYPE_LATEST})
+
+def require_admin(request: Request):
+    """Check the X-Admin-Token header; admin endpoints are disabled while ADMIN_TOKEN is unset"""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if not hmac.compare_digest(request.headers.get("X-Admin-Token", ""), ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+def reload_taxonomy():
+    """Compile the taxonomy data file if it changed, then load it (runs off the event loop)"""
+    if TAXONOMY_ARTIFACT_DIR:
+        try:
+            compile_taxonomy(TAXONOMY_PATH, TAXONOMY_ARTIFACT_DIR)
+        except OSError as e:
+            # e.g. a read-only artifact directory: the indexes are built in memory instead
+            logger.warning(f"Could not write the taxonomy artifact: {str(e)}")
+    return load_taxonomy(TAXONOMY_PATH, TAXONOMY_ARTIFACT_DIR)
+
+@app.post("/admin/taxonomy/reload", response_model=TaxonomyReloadResponse)
+async def reload_taxonomy_endpoint(request: Request) -> TaxonomyReloadResponse:
+    """Load the taxonomy data file again and swap it in; requests in progress finish on the indexes they started with"""
+    global taxonomy
+    require_admin(request)
+    async with taxonomy_reload_lock:
+        start = time.perf_counter()
+        try:
+            new_taxonomy = await asyncio.to_thread(reload_taxonomy)
+        except Exception as e:
+            logger.error(f"Error reloading taxonomy: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Taxonomy reload failed: {str(e)}")
+        
+        # A single reference swap: each index is read from one Taxonomy object, so no
+        # lookup ever mixes skill IDs or masks of two versions
+        previous_version = taxonomy.version
+        taxonomy = new_taxonomy
+        changed = new_taxonomy.version != previous_version
+        if changed:
+            # Cached results carry the old version in their key; drop them to free the memory
+            if result_cache is not None:
+                result_cache.clear()
+            # Scoring processes loaded the taxonomy at import
+            inference_executor.restart_scoring_pool()
+            if worker_supervisor_pid is not None:
+                # Under serve.py: the parent reloads too and replaces the other workers
+                os.kill(worker_supervisor_pid, signal.SIGHUP)
+        logger.info(f"Taxonomy {new_taxonomy.version} loaded from {new_taxonomy.origin} (previous {previous_version})")
+    
+    return TaxonomyReloadResponse(
+        previous_version=previous_version,
+        changed=changed,
+        load_seconds=round(time.perf_counter() - start, 3),
+        **new_taxonomy.stats()
+    )
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
-        "status": "healthy", 
+        "status": "healthy" if model_status.ready else "starting",
+        "ready": model_status.ready,
         "models_loaded": sentence_model is not None,
-        "ai_mode": "advanced" if sentence_model is not None else "basic"
+        "ai_mode": "advanced" if sentence_model is not None else "basic",
+        "encoder_backend": encoder_backend,
+        "spacy_pipeline": {"mode": SPACY_PIPELINE, "components": spacy_nlp.pipe_names if spacy_nlp is not None else []},
+        "executor": inference_executor.stats(),
+        "embedding_store": embedding_store.stats() if embedding_store is not None else None,
+        "encode_scheduler": encode_scheduler.stats() if encode_scheduler is not None else None,
+        "job_registry": job_registry.stats(),
+        "result_cache": result_cache.stats() if result_cache is not None else None,
+        "taxonomy": taxonomy.stats(),
+        "candidate_index": candidate_index.stats() if candidate_index is not None else None,
+        "bulk_jobs": bulk_jobs.stats() if bulk_jobs is not None else None,
+        "process": {"pid": os.getpid(), "memory": memory_usage()}
     }
 
 if __name__ == "__main__":
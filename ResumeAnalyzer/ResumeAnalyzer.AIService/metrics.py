@@ -0,0 +1,174 @@
+"""
+Prometheus metrics for the analysis service.
+Hot-path instrumentation is limited to histogram observations and counter
+increments; cache, batching and queue statistics are read from the components'
+stats() methods only when /metrics is scraped. Without prometheus_client
+installed every call here is a no-op.
+
+With PROMETHEUS_MULTIPROC_DIR set before this module is imported (serve.py sets
+it), histograms and counters are kept in per-process files in that directory
+and /metrics sums them over every process: all serve.py workers, and the spawned
+scoring processes. The component statistics are read in the process answering
+the scrape and carry its pid as a label.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+    PROMETHEUS_AVAILABLE = False
+
+# Stage latencies range from microseconds (lexicon match) to seconds (encoding a long CV)
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+# Read by prometheus_client at import as well, so it cannot change afterwards
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+
+# Component name -> stats() callable, read at scrape time
+_stats_sources: Dict[str, Callable[[], Optional[dict]]] = {}
+
+if PROMETHEUS_AVAILABLE:
+    registry = CollectorRegistry()
+    STAGE_SECONDS = Histogram(
+        "resume_analyzer_stage_seconds", "Time spent in each analysis pipeline stage",
+        ["stage"], buckets=STAGE_BUCKETS, registry=registry,
+    )
+    REQUEST_SECONDS = Histogram(
+        "resume_analyzer_request_seconds", "HTTP request latency by endpoint and status",
+        ["endpoint", "status"], buckets=REQUEST_BUCKETS, registry=registry,
+    )
+    BATCH_SIZE = Histogram(
+        "resume_analyzer_batch_size", "Items per batch: sentences per model encode call, resumes per batch request",
+        ["kind"], buckets=BATCH_BUCKETS, registry=registry,
+    )
+    WORD_SIMILARITY_FALLBACKS = Counter(
+        "resume_analyzer_word_similarity_fallback_total",
+        "Semantic similarity computed with calculate_word_similarity instead of the sentence model",
+        ["reason"], registry=registry,
+    )
+
+
+# Labelled histogram children, resolved once per stage instead of on every observation
+_stage_histograms: dict = {}
+
+
+def observe_stage(stage: str, seconds: float):
+    if PROMETHEUS_AVAILABLE:
+        histogram = _stage_histograms.get(stage)
+        if histogram is None:
+            histogram = _stage_histograms.setdefault(stage, STAGE_SECONDS.labels(stage))
+        histogram.observe(seconds)
+
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time a block as one observation of the given pipeline stage"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def timed(stage: str):
+    """Decorator timing every call of a function as the given pipeline stage"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe_stage(stage, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def observe_request(endpoint: str, status: int, seconds: float):
+    if PROMETHEUS_AVAILABLE:
+        REQUEST_SECONDS.labels(endpoint, str(status)).observe(seconds)
+
+
+def observe_batch_size(kind: str, size: int):
+    if PROMETHEUS_AVAILABLE:
+        BATCH_SIZE.labels(kind).observe(size)
+
+
+def count_word_similarity_fallback(reason: str, count: int = 1):
+    """reason is "no_model" (sentence model not loaded) or "error" (encoding failed)"""
+    if PROMETHEUS_AVAILABLE:
+        WORD_SIMILARITY_FALLBACKS.labels(reason).inc(count)
+
+
+def register_stats_source(name: str, stats: Callable[[], Optional[dict]]):
+    """Export the numeric fields of a component's stats() dict as resume_analyzer_<name>_<field> gauges"""
+    _stats_sources[name] = stats
+
+
+# Fields that only ever increase are exported as counters
+_COUNTER_FIELDS = {"hits", "misses", "coalesced", "batches"}
+
+
+class _StatsCollector:
+    """Reads the registered stats sources on every scrape"""
+
+    def __init__(self, pid_label: bool = False):
+        self.pid_label = pid_label
+
+    def collect(self):
+        # Forked workers import this module in the parent, so the pid is read per scrape
+        labels = {"pid": str(os.getpid())} if self.pid_label else {}
+        for name, stats in list(_stats_sources.items()):
+            try:
+                values = stats()
+            except Exception as e:
+                logger.error(f"Reading {name} stats for metrics failed: {str(e)}")
+                continue
+            if not values:
+                continue
+            for field, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric_name = f"resume_analyzer_{name}_{field}"
+                family = CounterMetricFamily if field in _COUNTER_FIELDS else GaugeMetricFamily
+                metric = family(metric_name, f"{name} {field}", labels=list(labels))
+                metric.add_metric(list(labels.values()), value)
+                yield metric
+
+
+if PROMETHEUS_AVAILABLE:
+    if MULTIPROCESS_DIR is not None:
+        # Scrapes read every process's files instead of this process's metric objects
+        os.makedirs(MULTIPROCESS_DIR, exist_ok=True)
+        render_registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(render_registry)
+        render_registry.register(_StatsCollector(pid_label=True))
+    else:
+        registry.register(_StatsCollector())
+        render_registry = registry
+
+
+def mark_process_dead(pid: int):
+    """Drop the live-gauge files of an exited process (multiprocess mode only)"""
+    if PROMETHEUS_AVAILABLE and MULTIPROCESS_DIR is not None:
+        multiprocess.mark_process_dead(pid)
+
+
+def render() -> Optional[bytes]:
+    """The metrics in Prometheus text format, or None without prometheus_client"""
+    if not PROMETHEUS_AVAILABLE:
+        return None
+    return generate_latest(render_registry)
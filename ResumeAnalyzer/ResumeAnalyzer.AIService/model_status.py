@@ -0,0 +1,79 @@
+"""
+Load state of the service's models for the readiness probe.
+Models are loaded and warmed up on a background thread after startup; each
+component records whether it is loading, ready, failed or disabled and how long
+loading took, and the service reports ready only once the warm-up has finished.
+"""
+
+import threading
+import time
+from typing import List, Optional
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+DISABLED = "disabled"
+
+
+class ModelStatus:
+    """Thread-safe record of per-component load state and timings"""
+
+    def __init__(self, components: List[str]):
+        self._lock = threading.Lock()
+        self._components: dict = {
+            name: {"state": PENDING, "seconds": None, "detail": None, "_started": None} for name in components
+        }
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._created = time.monotonic()
+
+    @property
+    def ready(self) -> bool:
+        return self._finished is not None
+
+    def start(self):
+        """Mark the beginning of model loading"""
+        with self._lock:
+            self._started = time.monotonic()
+
+    def begin(self, name: str):
+        """Mark a component as loading"""
+        with self._lock:
+            self._components[name] = {"state": LOADING, "seconds": None, "detail": None, "_started": time.monotonic()}
+
+    def end(self, name: str, state: str, detail: Optional[str] = None):
+        """Record the outcome of a component started with begin()"""
+        with self._lock:
+            component = self._components.setdefault(name, {"_started": None})
+            started = component["_started"] if component["_started"] is not None else time.monotonic()
+            component["state"] = state
+            component["seconds"] = round(time.monotonic() - started, 3)
+            component["detail"] = detail
+
+    def skip(self, name: str, detail: str):
+        """Record a component that is turned off by configuration"""
+        with self._lock:
+            self._components[name] = {"state": DISABLED, "seconds": None, "detail": detail, "_started": None}
+
+    def finish(self):
+        """Mark loading and warm-up as done; the service is ready from now on"""
+        with self._lock:
+            self._finished = time.monotonic()
+
+    def snapshot(self) -> dict:
+        """Overall readiness, per-component state and load timings"""
+        with self._lock:
+            now = time.monotonic()
+            load_seconds = None
+            if self._started is not None:
+                load_seconds = round((self._finished or now) - self._started, 3)
+            return {
+                "ready": self.ready,
+                "uptime_seconds": round(now - self._created, 3),
+                "load_seconds": load_seconds,
+                "components": {
+                    name: {key: value for key, value in component.items() if not key.startswith("_")}
+                    for name, component in self._components.items()
+                },
+            }
@@ -0,0 +1,192 @@
+"""
+ONNX Runtime backend for the sentence encoder.
+install_models.py exports the MiniLM transformer to ONNX once at build time, plus an
+int8 dynamically quantized copy. OnnxSentenceEncoder runs either file with the same
+tokenizer, mean pooling and normalization as the sentence-transformers pipeline,
+so torch is not needed at serving time.
+"""
+
+import json
+import logging
+import os
+from typing import List, Optional, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ONNX_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "onnx")
+ONNX_MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model-int8.onnx"
+CONFIG_FILE = "encoder_config.json"
+
+# Minimum cosine similarity to the torch embeddings accepted at export time
+FP32_MIN_COSINE = 0.999
+INT8_MIN_COSINE = 0.98
+
+PARITY_SENTENCES = [
+    "Senior Python developer with 6 years of experience building Django and FastAPI services",
+    "Designed data pipelines on AWS using Spark, Airflow and PostgreSQL",
+    "Led a team of five engineers delivering React and TypeScript dashboards",
+    "Looking for a machine learning engineer familiar with PyTorch, scikit-learn and MLOps",
+    "Managed payroll, recruitment and employee relations for a 200 person company",
+    "Kubernetes, Docker, Terraform, Jenkins, Prometheus, Grafana",
+    "Excellent communication skills",
+    "ok",
+    " ".join(["Responsible for maintaining legacy Java applications and migrating them to microservices."] * 30),
+]
+
+
+class OnnxSentenceEncoder:
+    """Sentence encoder with the SentenceTransformer encode() interface, running on ONNX Runtime"""
+
+    def __init__(self, model_dir: str, quantized: bool = False, num_threads: Optional[int] = None):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(model_dir, CONFIG_FILE)) as f:
+            config = json.load(f)
+        self.model_dir = model_dir
+        self.model_file = QUANTIZED_MODEL_FILE if quantized else ONNX_MODEL_FILE
+        self.max_seq_length = config["max_seq_length"]
+        self.normalize = config["normalize"]
+        self._dimension = config["dimension"]
+
+        # Same settings as the transformers tokenizer call in sentence-transformers:
+        # truncate to max_seq_length (special tokens included) and pad to the longest in the batch
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=config["pad_token_id"], pad_token=config["pad_token"])
+        # Untruncated, unpadded copy for measuring text length in tokens
+        self._counting_tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self._counting_tokenizer.no_truncation()
+        self._counting_tokenizer.no_padding()
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, self.model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self._input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dimension
+
+    def count_tokens(self, sentences: List[str]) -> List[int]:
+        """Length of each sentence in tokens, special tokens excluded"""
+        encodings = self._counting_tokenizer.encode_batch(sentences, add_special_tokens=False)
+        return [len(encoding.ids) for encoding in encodings]
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """Embed sentences as float32 vectors (a single vector for a single string)"""
+        if isinstance(sentences, str):
+            return self.encode([sentences], batch_size=batch_size)[0]
+        embeddings = np.zeros((len(sentences), self._dimension), dtype=np.float32)
+        if not sentences:
+            return embeddings
+
+        # Longest first, like sentence-transformers, so each batch pads to similar lengths
+        order = np.argsort([-len(sentence) for sentence in sentences], kind="stable")
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            encodings = self.tokenizer.encode_batch([sentences[i].strip() for i in batch])
+            attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+            feeds = {
+                "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+                "attention_mask": attention_mask,
+            }
+            if "token_type_ids" in self._input_names:
+                feeds["token_type_ids"] = np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over the non-padding tokens
+            mask = attention_mask[:, :, None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            embeddings[batch] = summed / np.maximum(mask.sum(axis=1), 1e-9)
+
+        if self.normalize:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+
+
+def check_parity(reference, candidate, sentences: List[str] = PARITY_SENTENCES) -> float:
+    """Lowest cosine similarity between two encoders' embeddings of the same sentences"""
+    expected = np.asarray(reference.encode(sentences), dtype=np.float32)
+    actual = np.asarray(candidate.encode(sentences), dtype=np.float32)
+    expected /= np.maximum(np.linalg.norm(expected, axis=1, keepdims=True), 1e-12)
+    actual /= np.maximum(np.linalg.norm(actual, axis=1, keepdims=True), 1e-12)
+    return float(np.min(np.sum(expected * actual, axis=1)))
+
+
+def export_onnx_model(model_name: str, output_dir: str, quantize: bool = True, opset: int = 14) -> dict:
+    """
+    Export a sentence-transformers model to ONNX (and optionally an int8 copy) and check
+    both against the torch embeddings; files failing the parity check are removed so the
+    service falls back to torch. Returns the lowest cosine similarity per exported file.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    pooling = model[1]
+    if pooling.get_pooling_mode_str() != "mean":
+        raise ValueError(f"{model_name} uses {pooling.get_pooling_mode_str()} pooling, only mean pooling is supported")
+
+    os.makedirs(output_dir, exist_ok=True)
+    sample = tokenizer(["export sample sentence"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+
+    class TokenEmbeddings(torch.nn.Module):
+        """Wraps the transformer so the graph has a single last_hidden_state output"""
+
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *inputs):
+            return self.auto_model(**dict(zip(input_names, inputs)))[0]
+
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]}
+    model_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            TokenEmbeddings(transformer), tuple(sample[name] for name in input_names), model_path,
+            input_names=input_names, output_names=["last_hidden_state"], dynamic_axes=dynamic_axes,
+            opset_version=opset, do_constant_folding=True,
+        )
+    tokenizer.save_pretrained(output_dir)
+    with open(os.path.join(output_dir, CONFIG_FILE), "w") as f:
+        json.dump({
+            "model_name": model_name,
+            "max_seq_length": model.max_seq_length,
+            "dimension": model.get_sentence_embedding_dimension(),
+            "normalize": any(type(module).__name__ == "Normalize" for module in model),
+            "pad_token": tokenizer.pad_token,
+            "pad_token_id": tokenizer.pad_token_id,
+        }, f, indent=2)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(model_path, os.path.join(output_dir, QUANTIZED_MODEL_FILE), weight_type=QuantType.QInt8)
+
+    parity = {}
+    for model_file, quantized, min_cosine in [
+        (ONNX_MODEL_FILE, False, FP32_MIN_COSINE),
+        (QUANTIZED_MODEL_FILE, True, INT8_MIN_COSINE),
+    ]:
+        path = os.path.join(output_dir, model_file)
+        if not os.path.exists(path):
+            continue
+        parity[model_file] = check_parity(model, OnnxSentenceEncoder(output_dir, quantized=quantized))
+        if parity[model_file] < min_cosine:
+            logger.error(
+                f"{model_file} failed the parity check (cosine {parity[model_file]:.4f} < {min_cosine}), removing it"
+            )
+            os.remove(path)
+        else:
+            logger.info(f"{model_file} parity with torch: min cosine {parity[model_file]:.5f}")
+    return parity
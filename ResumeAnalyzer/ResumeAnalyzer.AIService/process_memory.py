@@ -0,0 +1,55 @@
+"""
+Per-process memory figures for the multi-worker server.
+RSS counts every resident page a process maps, including the model weights it
+shares copy-on-write with the other workers, so summing RSS over workers
+overstates the footprint. PSS divides each shared page among the processes that
+map it; the PSS of all workers plus the parent is the real total. Read from
+/proc/<pid>/smaps_rollup (Linux 4.14+), with /proc/<pid>/status as a fallback
+that only has RSS.
+"""
+
+import os
+from typing import Dict, Optional
+
+# smaps_rollup fields in kB, reported as bytes under these names
+_SMAPS_FIELDS = {
+    "Rss": "rss_bytes",
+    "Pss": "pss_bytes",
+    "Shared_Clean": "shared_bytes",
+    "Shared_Dirty": "shared_bytes",
+    "Private_Clean": "private_bytes",
+    "Private_Dirty": "private_bytes",
+    "Swap": "swap_bytes",
+}
+
+
+def memory_usage(pid: Optional[int] = None) -> Optional[Dict[str, int]]:
+    """RSS, PSS, shared, private and swapped bytes of a process (this one by default); None if unavailable"""
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            usage = dict.fromkeys(_SMAPS_FIELDS.values(), 0)
+            for line in f:
+                field, _, rest = line.partition(":")
+                if field in _SMAPS_FIELDS:
+                    usage[_SMAPS_FIELDS[field]] += int(rest.split()[0]) * 1024
+            return usage
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return {"rss_bytes": int(line.split()[1]) * 1024}
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def format_usage(usage: Optional[Dict[str, int]]) -> str:
+    """One-line summary in MB for logs"""
+    if not usage:
+        return "unavailable"
+    return ", ".join(
+        f"{name[:-len('_bytes')]} {value / 1024 / 1024:.1f} MB" for name, value in usage.items() if value or name != "swap_bytes"
+    )
@@ -0,0 +1,109 @@
+"""
+Cache of complete analysis results with in-flight request coalescing.
+Results are keyed by a hash of the scoring version and the whitespace-normalized
+inputs, kept for a fixed time and bounded in number. Identical requests that
+arrive while the first one is still being computed wait for that computation
+instead of starting their own. With a SharedStore, results are also looked up in
+and written to a table shared by the worker processes of the host.
+"""
+
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from shared_store import SharedStore
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace runs so re-submitted texts that differ only in spacing share a key"""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def result_key(*parts: str) -> str:
+    """Hash of the key parts (scoring version, settings, normalized texts)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """TTL + LRU bounded result cache; runs on the event loop, so no locking is needed"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, shared: Optional[SharedStore] = None):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl_seconds
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._results: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, result)
+        self._pending: Dict[str, asyncio.Task] = {}
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached result for key, join an identical computation in flight, or run compute"""
+        entry = self._results.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._results.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._results[key]
+
+        task = self._pending.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # The computation runs as its own task so a cancelled caller doesn't cancel it for the others
+            task = asyncio.ensure_future(self._load_or_compute(key, compute))
+            self._pending[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    async def _load_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        if self.shared is None:
+            return await compute()
+        # SQLite calls run off the event loop; the shared store logs and swallows its errors
+        result = await asyncio.to_thread(self.shared.get, key)
+        if result is None:
+            result = await compute()
+            await asyncio.to_thread(self.shared.put, key, result)
+        return result
+
+    def _finish(self, key: str, task: asyncio.Task):
+        self._pending.pop(key, None)
+        # Failures are not cached; retrieving the exception keeps asyncio from logging it as unhandled
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._results[key] = (time.monotonic() + self.ttl, task.result())
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_entries:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached results (computations in flight still finish and are stored)"""
+        self._results.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> dict:
+        """Entry count and hit counts; coalesced requests count as hits in the ratio"""
+        lookups = self.hits + self.coalesced + self.misses
+        return {
+            "entries": len(self._results),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "in_flight": len(self._pending),
+            "hits": self.hits,
+            "coalesced": self.coalesced,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "shared": self.shared.stats() if self.shared is not None else None,
+        }
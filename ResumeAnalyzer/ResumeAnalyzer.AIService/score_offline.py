@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Offline batch scorer: the /analyze pipeline over a JSONL or CSV file, without the HTTP server.
+Input records have resume_text and either job_text or job_id (job ids resolve
+through SHARED_STORE_PATH, where a running service keeps its registered jobs),
+plus an optional id that is copied to the output. CSV input needs a header row
+with those column names. With --job-file every record is scored against that
+job description instead.
+
+The input is read as a stream and cut into chunks of --chunk-size records.
+Chunks are scored by a pool of worker processes. The models are loaded once in
+this process before the pool forks, so the workers share the model pages, and
+each worker reuses them for every chunk it gets. Inside a chunk, records of the
+same job are encoded together, and each job is parsed and encoded once per
+worker. At most two chunks per worker are in flight and results are written in
+input order as they complete, so memory stays flat however long the input is.
+
+Output is JSONL, the same lines as bulk job results:
+  {"line": 1, "id": "applicant-1042", "result": {"match_percentage": ..., ...}}
+  {"line": 2, "id": null, "error": "resume_text: Field required"}
+or CSV (line, id, match_percentage, missing_skills, recommendation, error) when
+the output file ends in .csv. line is the input line (JSONL) or data row (CSV).
+Progress and throughput are logged to stderr.
+
+Usage: python score_offline.py pairs.jsonl results.jsonl [--workers 4] [--chunk-size 64]
+       python score_offline.py resumes.csv results.csv --job-file job.txt
+"""
+
+import argparse
+import csv
+import gc
+import io
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple, Union
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("score_offline")
+
+OUTPUT_CSV_COLUMNS = ["line", "id", "match_percentage", "missing_skills", "recommendation", "error"]
+CHUNKS_PER_WORKER = 2  # Chunks in flight per worker: one being scored, one queued
+PROGRESS_SECONDS = 10
+
+# An input entry is (line number, record) or (line number, message) for a line that could not be parsed
+Entry = Tuple[int, Union[dict, str]]
+
+
+def configure_environment(workers: int):
+    """Offline defaults, set before main reads its settings at import"""
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    if workers > 1:
+        # Parallelism comes from the worker processes; ONNX Runtime threads started
+        # in this process would not survive the fork, so it runs on the caller
+        os.environ.setdefault("TORCH_NUM_THREADS", "1")
+        os.environ["ONNX_NUM_THREADS"] = "1"
+
+
+def read_jsonl(f: io.TextIOBase) -> Iterator[Entry]:
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("each line must be a JSON object")
+        except ValueError as e:
+            record = f"Invalid JSON: {str(e)}"
+        yield line_number, record
+
+
+def read_csv(f: io.TextIOBase) -> Iterator[Entry]:
+    # Resumes are far longer than the csv module's default field limit
+    csv.field_size_limit(2 ** 31 - 1)
+    for row_number, row in enumerate(csv.DictReader(f), 1):
+        # Empty cells are missing values, so a row may fill either job_text or job_id
+        yield row_number, {key: value for key, value in row.items() if key is not None and value not in ("", None)}
+
+
+def read_chunks(entries: Iterator[Entry], chunk_size: int, job_text: Optional[str]) -> Iterator[List[Entry]]:
+    chunk: List[Entry] = []
+    for line_number, record in entries:
+        if job_text is not None and isinstance(record, dict):
+            record = dict(record, job_text=job_text)
+            record.pop("job_id", None)
+        chunk.append((line_number, record))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def init_worker(quiet: bool):
+    """Pool initializer: models are inherited from the parent when forked, loaded here when spawned"""
+    import main
+    # The parent froze everything it loaded; collections here never touch those pages
+    gc.enable()
+    if quiet:
+        # score_analysis logs every result at INFO
+        logging.getLogger("main").setLevel(logging.WARNING)
+    main.load_models()
+    main.warm_up_models()
+
+
+def score_chunk(chunk: List[Entry]) -> List[dict]:
+    """Output rows for a chunk of input entries, in input order"""
+    import main
+    records = [record for _, record in chunk if isinstance(record, dict)]
+    outcomes = iter(main.analyze_records(records))
+    rows = []
+    for line_number, record in chunk:
+        if isinstance(record, dict):
+            rows.append({"line": line_number, "id": record.get("id"), **next(outcomes)})
+        else:
+            rows.append({"line": line_number, "id": None, "error": record})
+    return rows
+
+
+class ResultWriter:
+    """Writes output rows as JSONL, or as CSV with the result fields as columns"""
+
+    def __init__(self, f: io.TextIOBase, as_csv: bool):
+        self.f = f
+        self.csv_writer = csv.DictWriter(f, OUTPUT_CSV_COLUMNS) if as_csv else None
+        if self.csv_writer is not None:
+            self.csv_writer.writeheader()
+
+    def write(self, rows: List[dict]):
+        for row in rows:
+            if self.csv_writer is None:
+                self.f.write(json.dumps(row) + "\n")
+                continue
+            result = row.get("result") or {}
+            self.csv_writer.writerow({
+                "line": row["line"],
+                "id": row["id"],
+                "match_percentage": result.get("match_percentage"),
+                "missing_skills": ";".join(result.get("missing_skills", [])),
+                "recommendation": result.get("recommendation"),
+                "error": row.get("error"),
+            })
+        self.f.flush()
+
+
+class Progress:
+    """Counts written rows and logs progress and throughput"""
+
+    def __init__(self, source: io.TextIOBase):
+        self.source = source
+        try:
+            self.total_bytes = os.fstat(source.fileno()).st_size if source.seekable() else 0
+        except (OSError, io.UnsupportedOperation):
+            self.total_bytes = 0
+        self.started = time.perf_counter()
+        self.next_report = self.started + PROGRESS_SECONDS
+        self.succeeded = 0
+        self.failed = 0
+
+    def add(self, rows: List[dict]):
+        failed = sum("error" in row for row in rows)
+        self.failed += failed
+        self.succeeded += len(rows) - failed
+        if time.perf_counter() >= self.next_report:
+            self.report()
+            self.next_report = time.perf_counter() + PROGRESS_SECONDS
+
+    def report(self, final: bool = False):
+        elapsed = time.perf_counter() - self.started
+        done = self.succeeded + self.failed
+        message = (
+            f"{'Scored' if final else 'Progress:'} {done} records ({self.failed} failed) "
+            f"in {elapsed:.1f}s, {done / elapsed if elapsed else 0.0:.1f} records/s"
+        )
+        if self.total_bytes and not final:
+            # Bytes the reader has consumed, slightly ahead of the rows written
+            message += f", {min(1.0, self.source.buffer.tell() / self.total_bytes):.1%} of the input read"
+        logger.info(message)
+
+
+def run_inline(chunks: Iterator[List[Entry]], writer: ResultWriter, progress: Progress, quiet: bool):
+    init_worker(quiet)
+    for chunk in chunks:
+        rows = score_chunk(chunk)
+        writer.write(rows)
+        progress.add(rows)
+
+
+def run_pool(chunks: Iterator[List[Entry]], writer: ResultWriter, progress: Progress, workers: int, quiet: bool):
+    """Score chunks on worker processes with a bounded number in flight, writing results in order"""
+    # Pool.imap would read the whole input ahead of the workers, so chunks are submitted as results are written
+    if "fork" in multiprocessing.get_all_start_methods():
+        # No collections while loading, and everything loaded is frozen out of the
+        # collector before forking, so the workers' collections don't dirty shared pages
+        import main
+        gc.disable()
+        main.load_models()
+        gc.collect()
+        gc.freeze()
+        context = multiprocessing.get_context("fork")
+    else:
+        context = multiprocessing.get_context("spawn")
+    in_flight: deque = deque()
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=init_worker, initargs=(quiet,)) as pool:
+        gc.enable()
+        try:
+            for chunk in chunks:
+                in_flight.append(pool.submit(score_chunk, chunk))
+                while len(in_flight) >= workers * CHUNKS_PER_WORKER:
+                    write_completed(in_flight.popleft(), writer, progress)
+            while in_flight:
+                write_completed(in_flight.popleft(), writer, progress)
+        finally:
+            for future in in_flight:
+                future.cancel()
+
+
+def write_completed(future: Future, writer: ResultWriter, progress: Progress):
+    rows = future.result()
+    writer.write(rows)
+    progress.add(rows)
+
+
+def open_text(path: str, mode: str) -> io.TextIOBase:
+    if path == "-":
+        return sys.stdin if mode == "r" else sys.stdout
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="JSONL or CSV file of records, or - for JSONL on stdin")
+    parser.add_argument("output", help="JSONL or CSV (.csv) file for the results, or - for JSONL on stdout")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="input format (default: from the input file extension)")
+    parser.add_argument("--job-file", help="score every record against this job description")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="records per chunk sent to a worker")
+    parser.add_argument("--verbose", action="store_true", help="keep the per-record analysis log")
+    args = parser.parse_args()
+
+    input_format = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    job_text = None
+    if args.job_file:
+        with open(args.job_file, encoding="utf-8") as f:
+            job_text = f.read()
+    workers = max(1, args.workers)
+    configure_environment(workers)
+
+    with open_text(args.input, "r") as source, open_text(args.output, "w") as target:
+        entries = read_csv(source) if input_format == "csv" else read_jsonl(source)
+        chunks = read_chunks(entries, max(1, args.chunk_size), job_text)
+        writer = ResultWriter(target, as_csv=args.output.lower().endswith(".csv"))
+        progress = Progress(source)
+        logger.info(f"Scoring {args.input} ({input_format}) with {workers} workers, {args.chunk_size} records per chunk")
+        if workers == 1:
+            run_inline(chunks, writer, progress, not args.verbose)
+        else:
+            run_pool(chunks, writer, progress, workers, not args.verbose)
+        progress.report(final=True)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Multi-worker server for the Resume Analyzer AI Service.
+The parent process loads the sentence encoder, spaCy and the compiled taxonomy
+once, then forks the workers, which serve the same listening socket. Model
+weights are never written after loading, so the workers share those pages with
+the parent copy-on-write instead of each holding its own copy. Nothing runs
+inference before the fork: thread pools, SQLite connections and the embedding
+store are created in each worker (main.open_worker_resources). Cached /analyze
+results and registered jobs are shared between workers through a SQLite file
+(SHARED_STORE_PATH), as is the embedding store.
+
+The parent restarts workers that exit, logs the memory of every process
+(RSS, and PSS, which counts shared pages once) and handles these signals:
+  SIGTERM, SIGINT  stop the workers gracefully and exit
+  SIGHUP           reload the taxonomy, then replace the workers one at a time
+  SIGUSR1          log the memory report now
+
+With one worker (the default) this runs uvicorn directly, exactly like
+`uvicorn main:app`.
+
+Usage: python serve.py [--workers 4] [--host 0.0.0.0] [--port 7860]
+"""
+
+import argparse
+import gc
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+from process_memory import format_usage, memory_usage
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("serve")
+
+DEFAULT_SHARED_STORE_PATH = "/tmp/resume_analyzer/shared.sqlite3"
+DEFAULT_PROMETHEUS_MULTIPROC_DIR = "/tmp/resume_analyzer/prometheus"
+WORKER_START_TIMEOUT = 300  # Seconds a new worker may take to warm up
+WORKER_STOP_TIMEOUT = 30  # Seconds a stopping worker gets to finish its requests
+MAX_RESTART_DELAY = 30  # Longest back-off between restarts of a worker that keeps failing
+SUPERVISOR_TICK = 0.5
+
+
+def configure_environment(workers: int):
+    """Multi-worker defaults, set before main reads its settings at import"""
+    # Each worker gets its share of the cores; parallelism comes from the workers and
+    # their inference threads rather than from intra-op thread pools
+    cores_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    os.environ.setdefault("INFERENCE_THREADS", str(cores_per_worker))
+    os.environ.setdefault("TORCH_NUM_THREADS", "1")
+    # ONNX Runtime starts its intra-op threads when the session is created in the
+    # parent, and threads do not survive fork; with one thread it runs on the caller
+    if os.environ.get("ONNX_NUM_THREADS", "1") != "1":
+        logger.warning("ONNX_NUM_THREADS is ignored with more than one worker")
+    os.environ["ONNX_NUM_THREADS"] = "1"
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    os.environ.setdefault("SHARED_STORE_PATH", DEFAULT_SHARED_STORE_PATH)
+    # Each process would keep its own row counter and skill postings for the same files
+    if os.environ.get("CANDIDATE_INDEX_DIR", "default") != "":
+        logger.warning("The candidate index requires WORKERS=1; /resumes and /search are disabled with more than one worker")
+    os.environ["CANDIDATE_INDEX_DIR"] = ""
+
+
+def configure_metrics():
+    """Prometheus multiprocess mode, set before prometheus_client is imported: every process
+    (workers and spawned scoring processes) writes its metrics to files that /metrics sums"""
+    directory = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", DEFAULT_PROMETHEUS_MULTIPROC_DIR)
+    if not directory:
+        # prometheus_client switches to multiprocess mode whenever the variable is set
+        del os.environ["PROMETHEUS_MULTIPROC_DIR"]
+        return
+    os.makedirs(directory, exist_ok=True)
+    # Files left by a previous run would be added to this run's counts
+    for name in os.listdir(directory):
+        if name.endswith(".db"):
+            os.remove(os.path.join(directory, name))
+
+
+def listen(host: str, port: int) -> socket.socket:
+    """The listening socket every worker accepts connections from"""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(main, sock: socket.socket, ready_fd: int):
+    """Body of a forked worker: open per-process resources, warm up, then serve until stopped"""
+    import uvicorn
+
+    for sig in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGUSR1):
+        signal.signal(sig, signal.SIG_DFL)
+    # The parent froze everything it loaded; collections here never touch those pages
+    gc.enable()
+    main.worker_supervisor_pid = os.getppid()
+    main.prepare_models()
+    os.write(ready_fd, b"1")
+    os.close(ready_fd)
+    uvicorn.Server(uvicorn.Config(main.app, log_level="info")).run(sockets=[sock])
+
+
+class Supervisor:
+    """Forks the workers, replaces those that exit and reports their memory"""
+
+    def __init__(self, main, sock: socket.socket, workers: int, memory_report_seconds: float):
+        self.main = main
+        self.sock = sock
+        self.size = workers
+        self.memory_report_seconds = memory_report_seconds
+        self.workers: Dict[int, Tuple[int, float]] = {}  # pid -> (slot, start time), ready workers
+        # pid -> (slot, start time, ready pipe, deadline, pid of the worker it replaces), warming up
+        self.starting: Dict[int, Tuple[int, float, int, float, Optional[int]]] = {}
+        self.retiring: Dict[int, float] = {}  # pid -> time SIGTERM was sent
+        self.failures: Dict[int, int] = {}  # slot -> consecutive early exits
+        self.restarts: Dict[int, float] = {}  # slot -> time its replacement worker is due
+        self.replacing: List[int] = []  # Workers still to be replaced by the current reload, in slot order
+        self.startup: Optional[float] = None  # Set until the initial workers have all started or failed
+        self.stopping = False
+        self.reload_requested = False
+        self.report_requested = False
+
+    def spawn(self, slot: int, replaces: Optional[int] = None) -> int:
+        """Fork a worker for a slot and return its pid; the main loop picks it up once it is warmed up"""
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            code = 1
+            try:
+                run_worker(self.main, self.sock, write_fd)
+                code = 0
+            except BaseException:
+                logger.exception("Worker failed")
+            finally:
+                # Never return into the parent's supervision loop
+                logging.shutdown()
+                os._exit(code)
+        os.close(write_fd)
+        now = time.monotonic()
+        self.starting[pid] = (slot, now, read_fd, now + WORKER_START_TIMEOUT, replaces)
+        return pid
+
+    def wait_for_starting(self, timeout: float):
+        """Sleep up to timeout, handling workers that become ready, fail or run out of time meanwhile"""
+        fds = {entry[2]: pid for pid, entry in self.starting.items()}
+        if not fds:
+            time.sleep(timeout)
+            return
+        try:
+            readable, _, _ = select.select(list(fds), [], [], timeout)
+        except InterruptedError:
+            readable = []
+        for fd in readable:
+            pid = fds[fd]
+            # One byte when the worker is ready, end of file when it died first
+            self.started(pid, os.read(fd, 1) == b"1")
+        now = time.monotonic()
+        for pid, (slot, _, _, deadline, _) in list(self.starting.items()):
+            if now >= deadline:
+                logger.error(f"Worker {slot} (pid {pid}) did not become ready in {WORKER_START_TIMEOUT}s, killing it")
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                # Collected by reap like a stopping worker
+                self.retiring[pid] = float("inf")
+                self.started(pid, False)
+        if self.startup is not None and not self.starting:
+            logger.info(f"{len(self.workers)} of {self.size} workers ready in {time.perf_counter() - self.startup:.2f}s")
+            self.startup = None
+            self.report_memory()
+
+    def started(self, pid: int, ready: bool):
+        """Move a starting worker to the ready workers, or handle its failure"""
+        slot, start, read_fd, _, replaces = self.starting.pop(pid)
+        os.close(read_fd)
+        if ready:
+            self.workers[pid] = (slot, start)
+            logger.info(f"Worker {slot} ready (pid {pid})")
+            if replaces is not None:
+                if replaces in self.workers:
+                    self.retire(replaces)
+                self.replace_next()
+            return
+        if replaces is not None:
+            self.replacing.clear()
+            if replaces in self.workers:
+                logger.error("Replacement worker failed, the remaining workers keep the previous taxonomy")
+                return
+        self.failures[slot] = self.failures.get(slot, 0) + 1
+        logger.error(f"Worker {slot} failed to start, retrying in {self.schedule_restart(slot)}s")
+
+    def retire(self, pid: int):
+        """Ask a worker to finish its requests and exit"""
+        self.workers.pop(pid, None)
+        self.retiring[pid] = time.monotonic()
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def schedule_restart(self, slot: int) -> float:
+        """Set when a slot's replacement worker is due, backing off while it keeps failing; returns the delay"""
+        failures = self.failures.get(slot, 0)
+        delay = min(MAX_RESTART_DELAY, 2 ** (failures - 1)) if failures else 0
+        self.restarts[slot] = time.monotonic() + delay
+        return delay
+
+    def start_due_workers(self):
+        """Spawn the replacement workers whose restart time has come"""
+        now = time.monotonic()
+        for slot, due in sorted(self.restarts.items()):
+            if self.stopping or due > now:
+                continue
+            del self.restarts[slot]
+            self.spawn(slot)
+
+    def reap(self):
+        """Collect exited workers and schedule replacements for those that were not asked to stop"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.retiring.clear()
+                return
+            if pid == 0:
+                return
+            self.main.metrics.mark_process_dead(pid)
+            if self.retiring.pop(pid, None) is not None:
+                continue
+            # A worker that dies while starting closes its ready pipe, which wait_for_starting handles
+            slot, started = self.workers.pop(pid, (None, None))
+            if slot is None or self.stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if any(entry[4] == pid for entry in self.starting.values()):
+                # Its replacement from a reload is already warming up and takes over the slot
+                logger.error(f"Worker {slot} (pid {pid}) exited with status {code} while being replaced")
+                continue
+            if time.monotonic() - started < WORKER_START_TIMEOUT:
+                self.failures[slot] = self.failures.get(slot, 0) + 1
+            else:
+                self.failures[slot] = 0
+            logger.error(f"Worker {slot} (pid {pid}) exited with status {code}, restarting in {self.schedule_restart(slot)}s")
+
+    def kill_stragglers(self):
+        """SIGKILL retiring workers that are past the stop timeout"""
+        now = time.monotonic()
+        for pid, retired in list(self.retiring.items()):
+            if now - retired > WORKER_STOP_TIMEOUT:
+                logger.warning(f"Worker pid {pid} did not stop within {WORKER_STOP_TIMEOUT}s, killing it")
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                self.retiring[pid] = float("inf")
+
+    def reload(self):
+        """Reload the taxonomy in the parent, then replace the workers one by one so capacity never drops"""
+        try:
+            self.main.taxonomy = self.main.reload_taxonomy()
+        except Exception as e:
+            logger.error(f"Taxonomy reload failed, keeping the current workers: {str(e)}")
+            return
+        gc.freeze()
+        logger.info(f"Taxonomy {self.main.taxonomy.version} loaded, replacing workers")
+        # Workers still warming up were forked with the previous taxonomy as well
+        slots = {pid: entry[0] for pid, entry in list(self.workers.items()) + list(self.starting.items())}
+        self.replacing = sorted(slots, key=slots.get)
+        if not any(entry[4] is not None for entry in self.starting.values()):
+            self.replace_next()
+
+    def replace_next(self):
+        """Start the replacement of the next worker of the current reload; each waits for the previous one"""
+        while self.replacing and not self.stopping:
+            pid = self.replacing.pop(0)
+            if pid in self.workers:
+                self.spawn(self.workers[pid][0], replaces=pid)
+                return
+        if not self.stopping:
+            logger.info("Workers replaced")
+
+    def report_memory(self):
+        """Log RSS and PSS per process; the PSS total is the real footprint of the server"""
+        total_pss = 0
+        processes = [("parent", os.getpid())] + [
+            (f"worker {slot}", pid) for pid, (slot, _) in sorted(self.workers.items(), key=lambda item: item[1][0])
+        ]
+        for label, pid in processes:
+            usage = memory_usage(pid)
+            total_pss += (usage or {}).get("pss_bytes", 0)
+            logger.info(f"Memory of {label} (pid {pid}): {format_usage(usage)}")
+        logger.info(f"Total PSS of the parent and {len(self.workers)} workers: {total_pss / 1024 / 1024:.1f} MB")
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, lambda *_: setattr(self, "reload_requested", True))
+        signal.signal(signal.SIGUSR1, lambda *_: setattr(self, "report_requested", True))
+
+        # The workers warm up in parallel; wait_for_starting logs when they are all up
+        self.startup = time.perf_counter()
+        for slot in range(self.size):
+            self.spawn(slot)
+        next_report = time.monotonic() + self.memory_report_seconds
+
+        while not self.stopping:
+            self.reap()
+            self.start_due_workers()
+            self.kill_stragglers()
+            if self.reload_requested:
+                self.reload_requested = False
+                self.reload()
+            if self.report_requested or (self.memory_report_seconds > 0 and time.monotonic() >= next_report):
+                self.report_requested = False
+                self.report_memory()
+                next_report = time.monotonic() + self.memory_report_seconds
+            self.wait_for_starting(SUPERVISOR_TICK)
+        self.stop()
+
+    def _request_stop(self, *_):
+        self.stopping = True
+
+    def stop(self):
+        """Stop every worker gracefully, killing those still running after the stop timeout"""
+        logger.info(f"Stopping {len(self.workers) + len(self.starting)} workers")
+        for pid, (_, _, read_fd, _, _) in list(self.starting.items()):
+            os.close(read_fd)
+            self.retire(pid)
+        self.starting.clear()
+        for pid in list(self.workers):
+            self.retire(pid)
+        while self.retiring:
+            self.reap()
+            self.kill_stragglers()
+            time.sleep(0.1)
+        logger.info("All workers stopped")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WORKERS", "1")), help="worker processes (default: WORKERS or 1)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "7860")))
+    parser.add_argument(
+        "--memory-report-seconds", type=float, default=float(os.getenv("MEMORY_REPORT_SECONDS", "300")),
+        help="interval between per-worker memory reports in the log (0 disables them)",
+    )
+    args = parser.parse_args()
+
+    configure_metrics()
+    if args.workers <= 1:
+        import uvicorn
+        uvicorn.run("main:app", host=args.host, port=args.port)
+        return
+
+    configure_environment(args.workers)
+    sock = listen(args.host, args.port)
+    # No collections while loading, and everything loaded is frozen out of the
+    # collector before forking, so the workers' collections don't dirty shared pages
+    gc.disable()
+    import main
+    logger.info(f"Loading models in the parent for {args.workers} workers...")
+    main.load_models()
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Serving on {args.host}:{args.port} with {args.workers} workers")
+    Supervisor(main, sock, args.workers, args.memory_report_seconds).run()
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main_cli()
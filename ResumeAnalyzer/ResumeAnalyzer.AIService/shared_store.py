@@ -0,0 +1,132 @@
+"""
+Key-value store shared by the worker processes of one host.
+In the multi-worker server (serve.py) every worker has its own in-memory result
+cache and job registry; they fall back to this SQLite table on a local miss, so
+a result computed or a job registered by one worker is found by the others.
+Values are pickled, so only processes of this service should write to the file.
+"""
+
+import logging
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Writes between checks of the entry count
+_EVICT_INTERVAL = 100
+
+
+class SharedStore:
+    """SQLite table of pickled values with optional expiry and oldest-first eviction"""
+
+    def __init__(self, path: str, table: str, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.path = path
+        self.table = table
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily and again after a fork: a SQLite connection must not be used
+        # by two processes, and the store is usually created before the workers fork
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL, expires_at REAL)"
+            )
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_created ON {self.table} (created)")
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """The stored value for key, or None if it is missing, expired or unreadable"""
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    f"SELECT value FROM {self.table} WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (key, time.time()),
+                ).fetchone()
+            value = pickle.loads(row[0]) if row is not None else None
+        except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            logger.warning(f"Shared store lookup in {self.table} failed: {str(e)}")
+            self.errors += 1
+            return None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any):
+        """Store a value, replacing any previous value for key"""
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            with self._lock:
+                conn = self._connection()
+                conn.execute(f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)", (key, data, now, expires_at))
+                self._writes += 1
+                if self._writes % _EVICT_INTERVAL == 0:
+                    self._evict(conn, now)
+        except (sqlite3.Error, pickle.PicklingError) as e:
+            logger.warning(f"Shared store write to {self.table} failed: {str(e)}")
+            self.errors += 1
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        count = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY created LIMIT ?)",
+                (excess,),
+            )
+
+    def delete(self, key: str) -> bool:
+        """Remove a value, returning whether it existed"""
+        try:
+            with self._lock:
+                cursor = self._connection().execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            return cursor.rowcount > 0
+        except sqlite3.Error as e:
+            logger.warning(f"Shared store delete from {self.table} failed: {str(e)}")
+            self.errors += 1
+            return False
+
+    def clear(self):
+        """Remove every value in the table"""
+        try:
+            with self._lock:
+                self._connection().execute(f"DELETE FROM {self.table}")
+        except sqlite3.Error as e:
+            logger.warning(f"Shared store clear of {self.table} failed: {str(e)}")
+            self.errors += 1
+
+    def stats(self) -> dict:
+        """Lookups made by this process against the shared table"""
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
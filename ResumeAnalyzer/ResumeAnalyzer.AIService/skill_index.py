@@ -0,0 +1,268 @@
+"""
+Precomputed skill vocabulary indexes for the Resume Analyzer AI Service.
+These structures are built once from the domain taxonomy so that the
+per-request code paths only do lookups instead of rescanning the vocabulary.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+# Characters an alias may follow: whitespace and opening punctuation, but not the
+# "." or "/" that join it to a longer name
+ALIAS_PRECEDERS = frozenset(" \t\n\r\f\v(,;")
+
+
+class SkillMatcher:
+    """Trie-based matcher that finds every vocabulary skill in a single pass over the text"""
+
+    def __init__(self, domain_skills: Dict[str, List[str]], aliases: Optional[Dict[str, str]] = None):
+        # Reverse index: skill -> first domain that lists it (taxonomy order)
+        self.skill_domain: Dict[str, str] = {}
+        for domain, skills in domain_skills.items():
+            for skill in skills:
+                self.skill_domain.setdefault(skill.lower(), domain)
+
+        # Character trie; a node's None entry holds (skill, is alias) for the term that
+        # ends there. Aliases end in the skill they stand for, so "k8s" is found as "kubernetes"
+        self._trie: dict = {}
+        terms = [(skill, skill, False) for skill in self.skill_domain]
+        terms += [(alias, skill, True) for alias, skill in (aliases or {}).items()]
+        for term, skill, is_alias in terms:
+            node = self._trie
+            for ch in term:
+                node = node.setdefault(ch, {})
+            node[None] = (skill, is_alias)
+
+        # Candidate match starts: a possible first character that is not
+        # preceded by a letter or digit (the start word boundary)
+        first_chars = "".join(re.escape(ch) for ch in sorted(self._trie))
+        self._start_pattern = re.compile(rf"(?<![^\W_])[{first_chars}]")
+
+    def find_skills(self, text: str) -> Set[str]:
+        """Return all vocabulary skills found in already lowercased text, respecting word boundaries"""
+        trie = self._trie
+        text_length = len(text)
+        found = set()
+
+        for start_match in self._start_pattern.finditer(text):
+            node = trie
+            start = position = start_match.start()
+            while position < text_length:
+                node = node.get(text[position])
+                if node is None:
+                    break
+                position += 1
+                terminal = node.get(None)
+                if terminal is not None and (position == text_length or not text[position].isalnum()):
+                    skill, is_alias = terminal
+                    # Short aliases are often the tail of another name ("node.js", "next.js"),
+                    # so an alias only counts as a word of its own
+                    if not is_alias or start == 0 or text[start - 1] in ALIAS_PRECEDERS:
+                        found.add(skill)
+
+        return found
+
+    def domain_of(self, skill: str) -> str:
+        """Return the domain a skill is categorized under, or "other" if it is not in the vocabulary"""
+        return self.skill_domain.get(skill, "other")
+
+
+class SkillSimilarityIndex:
+    """Precomputed fuzzy-similarity and related-skill tables over the skill vocabulary"""
+
+    # Vocabulary x vocabulary boolean tables, stored as separate arrays in the taxonomy artifact
+    TABLES = ("related", "matches", "reachable")
+
+    def __init__(self, domain_skills: Dict[str, List[str]], match_threshold: float = 87, related_threshold: float = 82):
+        self.match_threshold = match_threshold
+        self.related_threshold = related_threshold
+
+        self.vocabulary: List[str] = list(dict.fromkeys(skill for skills in domain_skills.values() for skill in skills))
+        self.skill_ids: Dict[str, int] = {skill: i for i, skill in enumerate(self.vocabulary)}
+        size = len(self.vocabulary)
+
+        # Related skills are the other members of a skill's domain; when a skill
+        # appears in several domains the last one wins, as in the original map
+        related_domain: Dict[str, List[str]] = {}
+        for skills in domain_skills.values():
+            for skill in skills:
+                related_domain[skill] = skills
+        self.related = np.zeros((size, size), dtype=bool)
+        for skill, skills in related_domain.items():
+            row = self.skill_ids[skill]
+            for other in skills:
+                if other != skill:
+                    self.related[row, self.skill_ids[other]] = True
+
+        # All pairwise fuzz.ratio scores within the vocabulary, computed once
+        similarity = process.cdist(self.vocabulary, self.vocabulary, scorer=fuzz.ratio, dtype=np.float64)
+        self.matches = similarity > match_threshold
+        related_near = similarity > related_threshold
+        # reachable[j, s]: some skill related to j is similar to vocabulary skill s
+        self.reachable = (self.related.astype(np.int32) @ related_near.astype(np.int32)) > 0
+
+    def _split(self, skills: List[str]) -> Tuple[List[int], List[int], List[int]]:
+        """Split skill positions into vocabulary positions (with their ids) and out-of-vocabulary positions"""
+        known_positions, known_ids, unknown_positions = [], [], []
+        for position, skill in enumerate(skills):
+            skill_id = self.skill_ids.get(skill)
+            if skill_id is None:
+                unknown_positions.append(position)
+            else:
+                known_positions.append(position)
+                known_ids.append(skill_id)
+        return known_positions, known_ids, unknown_positions
+
+    def match_flags(self, job_skills: List[str], resume_skills: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        For each job skill return whether it fuzzy-matches a resume skill, and whether
+        one of its related skills does. Vocabulary pairs are table lookups; only
+        out-of-vocabulary terms are scored, in bulk with rapidfuzz.process.cdist.
+        """
+        resume_list = list(resume_skills)
+        matched = np.zeros(len(job_skills), dtype=bool)
+        related = np.zeros(len(job_skills), dtype=bool)
+        if not job_skills or not resume_list:
+            return matched, related
+
+        job_positions, job_ids, unknown_job_positions = self._split(job_skills)
+        _, resume_ids, unknown_resume_positions = self._split(resume_list)
+        resume_unknown = [resume_list[p] for p in unknown_resume_positions]
+
+        if job_ids:
+            rows = np.array(job_ids)
+            known_matches = np.zeros(len(job_ids), dtype=bool)
+            known_related = np.zeros(len(job_ids), dtype=bool)
+            if resume_ids:
+                columns = np.array(resume_ids)
+                known_matches |= self.matches[np.ix_(rows, columns)].any(axis=1)
+                known_related |= self.reachable[np.ix_(rows, columns)].any(axis=1)
+            if resume_unknown:
+                job_strings = [self.vocabulary[i] for i in job_ids]
+                known_matches |= (process.cdist(job_strings, resume_unknown, scorer=fuzz.ratio, dtype=np.float64) > self.match_threshold).any(axis=1)
+                # Vocabulary skills that are similar to any out-of-vocabulary resume term
+                near_unknown = (process.cdist(self.vocabulary, resume_unknown, scorer=fuzz.ratio, dtype=np.float64) > self.related_threshold).any(axis=1)
+                known_related |= (self.related[rows] & near_unknown).any(axis=1)
+            matched[job_positions] = known_matches
+            related[job_positions] = known_related
+
+        if unknown_job_positions:
+            # Out-of-vocabulary job skills have no related skills, only direct matches
+            unknown_jobs = [job_skills[p] for p in unknown_job_positions]
+            matched[unknown_job_positions] = (process.cdist(unknown_jobs, resume_list, scorer=fuzz.ratio, dtype=np.float64) > self.match_threshold).any(axis=1)
+
+        return matched, related
+
+
+class SkillVocabulary:
+    """Interns skill strings as integer IDs so skill sets can be held as bitmasks"""
+
+    def __init__(self):
+        self.skill_ids: Dict[str, int] = {}
+        self._bits: Dict[str, int] = {}  # skill -> 1 << skill ID
+
+    def __len__(self) -> int:
+        return len(self.skill_ids)
+
+    def intern(self, skills: Iterable[str]) -> int:
+        """Assign IDs to new skills and return the bitmask of all of them"""
+        mask = 0
+        for skill in skills:
+            if skill not in self.skill_ids:
+                self.skill_ids[skill] = len(self.skill_ids)
+                self._bits[skill] = 1 << self.skill_ids[skill]
+            mask |= self._bits[skill]
+        return mask
+
+    def mask(self, skills: Iterable[str]) -> int:
+        """Bitmask of the interned skills in skills; skills without an ID are left out"""
+        # Bits are distinct, so their sum is their union
+        return sum(map(self._bits.__getitem__, self._bits.keys() & skills))
+
+
+class SkillGroupMasks:
+    """Named skill groups as bitmasks over a shared vocabulary, for overlap counts and dominant-group lookups"""
+
+    def __init__(self, vocabulary: SkillVocabulary, groups: Dict[str, Iterable[str]]):
+        self.vocabulary = vocabulary
+        self.names: List[str] = list(groups)
+        self.masks: List[int] = [vocabulary.intern(skills) for skills in groups.values()]
+        self.by_name: Dict[str, int] = dict(zip(self.names, self.masks))
+        # Group x skill membership matrix for scoring many skill sets at once
+        self._width = len(vocabulary)
+        self.matrix = np.zeros((len(self.names), self._width), dtype=np.int32)
+        for row, mask in enumerate(self.masks):
+            self.matrix[row, [i for i in range(self._width) if (mask >> i) & 1]] = 1
+
+    def overlaps(self, mask: int) -> List[int]:
+        """Number of skills mask shares with each group, in group order"""
+        return [(mask & group_mask).bit_count() for group_mask in self.masks]
+
+    def dominant(self, mask: int) -> Optional[str]:
+        """The group sharing the most skills with mask (the first one on ties), None if no group shares any"""
+        best, best_overlap = None, 0
+        for name, group_mask in zip(self.names, self.masks):
+            overlap = (mask & group_mask).bit_count()
+            if overlap > best_overlap:
+                best, best_overlap = name, overlap
+        return best
+
+    def dominant_many(self, skill_sets: List[Iterable[str]]) -> List[Optional[str]]:
+        """dominant() for many skill sets with one membership matrix product"""
+        if not skill_sets:
+            return []
+        skill_ids = self.vocabulary.skill_ids
+        incidence = np.zeros((len(skill_sets), self._width), dtype=np.int32)
+        for row, skills in enumerate(skill_sets):
+            ids = [skill_id for skill_id in map(skill_ids.get, skills) if skill_id is not None and skill_id < self._width]
+            incidence[row, ids] = 1
+        overlaps = incidence @ self.matrix.T
+        # argmax returns the first maximum, matching dominant() on ties
+        best = overlaps.argmax(axis=1)
+        return [self.names[group] if overlaps[row, group] > 0 else None for row, group in enumerate(best)]
+
+
+class RecommendationIndex:
+    """Inverted skill -> domains index with core-skill flags, for prioritizing missing skills"""
+
+    def __init__(self, domain_core_skills: Dict[str, Iterable[str]], core_skills: Iterable[str]):
+        self.domains: List[str] = list(domain_core_skills)
+        self._domain_positions: Dict[str, int] = {domain: i for i, domain in enumerate(self.domains)}
+        groups = [set(skills) for skills in domain_core_skills.values()]
+        # Per-domain counters packed into one int, a field wide enough for the largest domain;
+        # summing the skills' packed values counts every domain's overlap in a single pass
+        self._field_bits = max((len(skills) for skills in groups), default=1).bit_length()
+        self._field_mask = (1 << self._field_bits) - 1
+        self.domain_counts: Dict[str, int] = {}  # skill -> 1 in the field of each domain listing it
+        self.domain_bits: Dict[str, int] = {}  # skill -> bit i set when domain i lists it
+        for i, skills in enumerate(groups):
+            for skill in skills:
+                self.domain_counts[skill] = self.domain_counts.get(skill, 0) + (1 << (i * self._field_bits))
+                self.domain_bits[skill] = self.domain_bits.get(skill, 0) | (1 << i)
+        self.core_skills = frozenset(core_skills)
+
+    def likely_domain(self, job_skills: Iterable[str]) -> Optional[str]:
+        """The domain listing the most job skills (the first one on ties), None if no domain lists any"""
+        packed = sum(map(self.domain_counts.__getitem__, self.domain_counts.keys() & job_skills))
+        best, best_count = None, 0
+        for domain in self.domains:
+            count = packed & self._field_mask
+            if count > best_count:
+                best, best_count = domain, count
+            packed >>= self._field_bits
+        return best
+
+    def prioritize(self, missing_skills: List[str], domain: Optional[str]) -> Tuple[List[str], List[str]]:
+        """Split missing skills, in order, into core or domain skills and the rest"""
+        domain_bit = 1 << self._domain_positions[domain] if domain is not None else 0
+        core_skills, domain_bits = self.core_skills, self.domain_bits
+        high_priority, other = [], []
+        for skill in missing_skills:
+            if skill in core_skills or domain_bits.get(skill, 0) & domain_bit:
+                high_priority.append(skill)
+            else:
+                other.append(skill)
+        return high_priority, other
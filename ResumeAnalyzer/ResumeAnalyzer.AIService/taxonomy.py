@@ -0,0 +1,194 @@
+"""
+Skill taxonomy bundle: the skill vocabulary and every index derived from it.
+The vocabulary lives in a JSON data file (data/taxonomy.json), with an optional
+aliases section mapping abbreviations and alternative names (k8s, postgres) to
+vocabulary skills. install_models.py compiles it into an artifact directory
+named after the file's hash: a pickle with the matcher trie, skill IDs, domain
+masks and recommendation index, plus .npy files with the vocabulary x
+vocabulary related-skill tables, which are memory-mapped on load. Without an artifact for the current data file the
+indexes are built in memory instead.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from skill_index import RecommendationIndex, SkillGroupMasks, SkillMatcher, SkillSimilarityIndex, SkillVocabulary
+
+logger = logging.getLogger(__name__)
+
+_SERVICE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TAXONOMY_PATH = os.path.join(_SERVICE_DIR, "data", "taxonomy.json")
+DEFAULT_ARTIFACT_DIR = os.path.join(_SERVICE_DIR, "models", "taxonomy")
+ARTIFACT_FORMAT = 3  # Bump when the pickled index classes change shape
+ARTIFACTS_KEPT = 3  # Compiled versions kept on disk, newest first
+
+_INDEX_FILE = "indexes.pickle"
+_MANIFEST_FILE = "manifest.json"
+# Sections of the data file: domain -> skills mappings, and plain skill lists
+_MAPPING_SECTIONS = ("domain_skills", "domain_groups", "domain_core_skills")
+_LIST_SECTIONS = ("core_skills",)
+
+
+@dataclass
+class Taxonomy:
+    """One consistent version of the skill vocabulary and its indexes"""
+    version: str  # Hash of the data file
+    domain_skills: Dict[str, List[str]]  # Extraction vocabulary by domain
+    domain_groups: Dict[str, List[str]]  # Groups used for the domain mismatch penalty
+    core_skills: List[str]  # Skills prioritized in every recommendation
+    domain_core_skills: Dict[str, List[str]]  # Skills prioritized per likely job domain
+    aliases: Dict[str, str]  # Alternative name -> vocabulary skill
+    skill_matcher: SkillMatcher
+    skill_similarity: SkillSimilarityIndex
+    skill_vocabulary: SkillVocabulary
+    domain_group_masks: SkillGroupMasks
+    recommendation_index: RecommendationIndex
+    origin: str = "source"  # "artifact" when loaded from a compiled artifact
+
+    def dominant_domain(self, skills: set) -> Optional[str]:
+        """The domain group with the most matching skills, or None if no group matches"""
+        return self.domain_group_masks.dominant(self.skill_vocabulary.mask(skills))
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "origin": self.origin,
+            "skills": len(self.skill_similarity.vocabulary),
+            "domains": len(self.domain_skills),
+            "aliases": len(self.aliases),
+        }
+
+
+def read_source(path: str) -> Tuple[dict, str]:
+    """Parse and validate the taxonomy data file; returns the data and its version hash"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    for section in _MAPPING_SECTIONS:
+        mapping = data.get(section)
+        if not isinstance(mapping, dict) or not mapping:
+            raise ValueError(f"{section} must be a non-empty object of domain -> skill list")
+        for domain, skills in mapping.items():
+            _check_skills(f"{section}.{domain}", skills)
+    for section in _LIST_SECTIONS:
+        _check_skills(section, data.get(section))
+    aliases = data.setdefault("aliases", {})
+    if not isinstance(aliases, dict):
+        raise ValueError("aliases must be an object of alternative name -> skill")
+    _check_skills("aliases", list(aliases))
+    vocabulary = {skill for skills in data["domain_skills"].values() for skill in skills}
+    for alias, skill in aliases.items():
+        if skill not in vocabulary:
+            raise ValueError(f"aliases.{alias} must name a domain_skills skill, not {skill!r}")
+        if alias in vocabulary:
+            raise ValueError(f"aliases.{alias} is already a domain_skills skill")
+    return data, hashlib.sha256(raw).hexdigest()[:16]
+
+
+def _check_skills(name: str, skills):
+    if not isinstance(skills, list) or not all(isinstance(skill, str) and skill.strip() for skill in skills):
+        raise ValueError(f"{name} must be a list of non-empty strings")
+    if any(skill != skill.lower() for skill in skills):
+        raise ValueError(f"{name} must be lowercase (text is lowercased before matching)")
+
+
+def build_taxonomy(data: dict, version: str) -> Taxonomy:
+    """Build every index from parsed taxonomy data"""
+    vocabulary = SkillVocabulary()
+    domain_group_masks = SkillGroupMasks(vocabulary, data["domain_groups"])
+    return Taxonomy(
+        version=version,
+        domain_skills=data["domain_skills"],
+        domain_groups=data["domain_groups"],
+        core_skills=data["core_skills"],
+        domain_core_skills=data["domain_core_skills"],
+        aliases=data["aliases"],
+        skill_matcher=SkillMatcher(data["domain_skills"], data["aliases"]),
+        skill_similarity=SkillSimilarityIndex(data["domain_skills"]),
+        skill_vocabulary=vocabulary,
+        domain_group_masks=domain_group_masks,
+        recommendation_index=RecommendationIndex(data["domain_core_skills"], data["core_skills"]),
+    )
+
+
+def compile_taxonomy(source_path: str = DEFAULT_TAXONOMY_PATH, artifact_dir: str = DEFAULT_ARTIFACT_DIR) -> str:
+    """Write the compiled artifact for the data file (if missing) and return its directory"""
+    data, version = read_source(source_path)
+    target = os.path.join(artifact_dir, version)
+    if _manifest(target) is not None:
+        return target
+
+    taxonomy = build_taxonomy(data, version)
+    os.makedirs(artifact_dir, exist_ok=True)
+    # Written to a temporary directory and renamed into place, so a loader never sees
+    # a partial artifact
+    staging = tempfile.mkdtemp(prefix=f".{version}-", dir=artifact_dir)
+    try:
+        similarity = copy.copy(taxonomy.skill_similarity)
+        for table in SkillSimilarityIndex.TABLES:
+            np.save(os.path.join(staging, f"{table}.npy"), getattr(similarity, table))
+            setattr(similarity, table, None)
+        with open(os.path.join(staging, _INDEX_FILE), "wb") as f:
+            pickle.dump(replace(taxonomy, skill_similarity=similarity), f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(os.path.join(staging, _MANIFEST_FILE), "w") as f:
+            json.dump({"format": ARTIFACT_FORMAT, "version": version, "created": time.time()}, f)
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another process compiled the same version first
+            if _manifest(target) is None:
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    _prune(artifact_dir, keep=target)
+    return target
+
+
+def load_taxonomy(source_path: str = DEFAULT_TAXONOMY_PATH, artifact_dir: Optional[str] = DEFAULT_ARTIFACT_DIR) -> Taxonomy:
+    """The taxonomy for the current data file, from its compiled artifact when there is one"""
+    data, version = read_source(source_path)
+    target = os.path.join(artifact_dir, version) if artifact_dir else None
+    if target is not None and _manifest(target) is not None:
+        try:
+            with open(os.path.join(target, _INDEX_FILE), "rb") as f:
+                taxonomy = pickle.load(f)
+            for table in SkillSimilarityIndex.TABLES:
+                setattr(taxonomy.skill_similarity, table, np.load(os.path.join(target, f"{table}.npy"), mmap_mode="r"))
+            taxonomy.origin = "artifact"
+            return taxonomy
+        except Exception as e:
+            logger.error(f"Error loading taxonomy artifact {target}: {str(e)}")
+    logger.info(f"No compiled taxonomy artifact for version {version}, building the indexes in memory")
+    return build_taxonomy(data, version)
+
+
+def _manifest(path: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(path, _MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get("format") == ARTIFACT_FORMAT else None
+
+
+def _prune(artifact_dir: str, keep: str):
+    """Remove all but the newest ARTIFACTS_KEPT compiled versions (mapped files stay valid after unlinking)"""
+    versions = [
+        os.path.join(artifact_dir, name) for name in os.listdir(artifact_dir)
+        if not name.startswith(".") and os.path.isdir(os.path.join(artifact_dir, name))
+    ]
+    versions.sort(key=os.path.getmtime, reverse=True)
+    for path in versions[ARTIFACTS_KEPT:]:
+        if path != keep:
+            shutil.rmtree(path, ignore_errors=True)
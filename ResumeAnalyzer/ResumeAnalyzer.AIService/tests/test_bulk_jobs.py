@@ -0,0 +1,61 @@
+"""
+Bulk job handover between processes: a job locked by one manager is taken over
+by another manager once the first one stops, as in a serve.py rolling reload.
+"""
+
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bulk_jobs import COMPLETED, RUNNING, BulkJobManager  # noqa: E402
+
+LINES = 20
+
+
+async def slow_analyze(records):
+    await asyncio.sleep(0.02)
+    return [{"result": {"resume": record["resume_text"]}} for record in records]
+
+
+def make_manager(directory):
+    return BulkJobManager(
+        directory, slow_analyze, batch_size=2, concurrency=1, max_upload_bytes=1 << 20,
+        retention_seconds=3600, lock_retry_seconds=0.05,
+    )
+
+
+async def upload():
+    yield "".join(json.dumps({"id": i, "resume_text": f"r{i}", "job_text": "j"}) + "\n" for i in range(LINES)).encode()
+
+
+async def wait_for(condition, timeout=10.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def test_locked_job_is_taken_over_when_its_holder_stops(tmp_path):
+    async def scenario():
+        first = make_manager(str(tmp_path))
+        first.start()
+        job_id = (await first.create(upload()))["job_id"]
+        await wait_for(lambda: (first.status(job_id) or {}).get("lines_read", 0) >= 4)
+
+        # A replacement worker scans the directory while the first still holds the lock
+        second = make_manager(str(tmp_path))
+        second.start()
+        await wait_for(lambda: second.stats()["waiting"] == 1)
+        assert first.status(job_id)["status"] == RUNNING
+
+        await first.stop()
+        await wait_for(lambda: second.status(job_id)["status"] == COMPLETED)
+        await second.stop()
+
+        results = [json.loads(line) for line in b"".join(second.iter_results(job_id)).splitlines()]
+        assert [result["id"] for result in results] == list(range(LINES))
+        assert second.stats()["waiting"] == 0
+
+    asyncio.run(scenario())
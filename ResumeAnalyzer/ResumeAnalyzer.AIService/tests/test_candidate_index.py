@@ -0,0 +1,78 @@
+"""
+Candidate index: the in-memory skill index stays consistent with SQLite when a
+batch fails, and similarities are cosines or None.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import candidate_index  # noqa: E402
+from candidate_index import CandidateEntry, CandidateIndex  # noqa: E402
+
+DIM = 4
+
+
+def entry(resume_id, skills, vector=None):
+    return CandidateEntry(resume_id=resume_id, resume_text=f"text of {resume_id}", skills=set(skills),
+                          experience="mid", vector=vector)
+
+
+def unit(values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def test_failed_batch_leaves_index_unchanged(tmp_path):
+    index = CandidateIndex(str(tmp_path), DIM)
+    index.add_many([entry("a", ["python", "sql"], unit([1, 0, 0, 0]))])
+    stats = index.stats()
+
+    # The second entry's vector has the wrong dimension, so the batch fails after
+    # "a" has been superseded and "b" inserted
+    with pytest.raises(ValueError):
+        index.add_many([entry("b", ["python"], unit([0, 1, 0, 0])), entry("a", ["go"], np.ones(DIM + 1))])
+
+    assert index.stats() == stats
+    assert [row for row, _, _ in index.shortlist({"python"}, None, 1, 10)] == [0]
+    assert index.shortlist({"go"}, None, 1, 10) == []
+    assert index.resumes([0])[0][0] == "a"
+
+    # The index and a reopened index from the database agree
+    reopened = CandidateIndex(str(tmp_path), DIM)
+    assert reopened.stats() == stats
+
+
+def test_replacing_within_a_batch_keeps_the_last_entry(tmp_path):
+    index = CandidateIndex(str(tmp_path), DIM)
+    index.add_many([entry("a", ["python"]), entry("a", ["go"])])
+    assert index.stats()["resumes"] == 1
+    assert index.shortlist({"python"}, None, 1, 10) == []
+    assert [row for row, _, _ in index.shortlist({"go"}, None, 1, 10)] == [1]
+
+
+def test_similarity_is_none_without_a_job_vector(tmp_path):
+    index = CandidateIndex(str(tmp_path), DIM)
+    index.add_many([entry("a", ["python", "sql"], unit([1, 0, 0, 0])), entry("b", ["python"])])
+
+    by_overlap = index.shortlist({"python", "sql"}, None, 1, 10)
+    assert [(row, similarity, overlap) for row, similarity, overlap in by_overlap] == [(0, None, 2), (1, None, 1)]
+
+    by_vector = index.shortlist({"python", "sql"}, unit([1, 0, 0, 0]), 1, 10)
+    assert [(row, round(similarity, 4)) for row, similarity, _ in by_vector] == [(0, 1.0), (1, 0.0)]
+
+
+def test_blocked_scoring_matches_a_full_sort(tmp_path, monkeypatch):
+    monkeypatch.setattr(candidate_index, "SCORE_BLOCK_ROWS", 7)
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(50, DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    index = CandidateIndex(str(tmp_path), DIM)
+    index.add_many([entry(f"r{i}", ["python"], vector) for i, vector in enumerate(vectors)])
+
+    job_vector = unit([1, 2, 0, -1])
+    expected = sorted(range(50), key=lambda row: -float(vectors[row] @ job_vector))[:10]
+    assert [row for row, _, _ in index.shortlist({"python"}, job_vector, 1, 10)] == expected
@@ -0,0 +1,52 @@
+"""
+Embedding store: re-storing a cached chunk does not inflate the entry count, and
+hits record their last use in memory until a batched flush.
+"""
+
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import embedding_store  # noqa: E402
+from embedding_store import EmbeddingStore  # noqa: E402
+
+
+def vectors(count):
+    return np.arange(count * 4, dtype=np.float32).reshape(count, 4)
+
+
+def last_used(store):
+    return dict(store._conn.execute("SELECT key, last_used FROM embeddings").fetchall())
+
+
+def test_storing_a_cached_chunk_again_keeps_the_count(tmp_path):
+    store = EmbeddingStore(str(tmp_path / "store.sqlite3"), "model", 100)
+    store.put_many(["a", "b"], vectors(2))
+    store.put_many(["b", "c"], vectors(2))
+    assert store.stats()["entries"] == 3
+    assert store._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0] == 3
+
+    # A second process sharing the file sees the rows it did not write as existing
+    other = EmbeddingStore(str(tmp_path / "store.sqlite3"), "model", 100)
+    other.put_many(["a", "d"], vectors(2))
+    assert other.stats()["entries"] == 4
+
+
+def test_hits_are_flushed_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_store, "TOUCH_FLUSH_SECONDS", 3600)
+    monkeypatch.setattr(embedding_store, "TOUCH_FLUSH_ROWS", 3)
+    store = EmbeddingStore(str(tmp_path / "store.sqlite3"), "model", 100)
+    store.put_many(["a", "b", "c"], vectors(3))
+    stored = last_used(store)
+
+    found = store.get_many(["a", "b", "missing"])
+    assert sorted(found) == ["a", "b"]
+    np.testing.assert_array_equal(found["b"], vectors(3)[1])
+    assert last_used(store) == stored
+
+    store.get_many(["c"])
+    assert len(store._touched) == 0
+    assert all(used > stored[key] for key, used in last_used(store).items())
+    assert store.stats()["hits"] == 3
@@ -0,0 +1,101 @@
+"""
+Experience scanner: the single-pass scan classifies resumes and jobs exactly as
+the per-pattern detectors it replaced, kept here as the reference.
+"""
+
+import os
+import random
+import re
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from experience_scanner import (  # noqa: E402
+    JOB_YEAR_KINDS, JUNIOR_INDICATORS, MID_INDICATORS, RESUME_YEAR_KINDS, SENIOR_INDICATORS, scan_experience,
+)
+
+RESUME_PATTERNS = [
+    r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
+    r'(\d+)\+?\s*years?\s*in',
+    r'experience\s*:\s*(\d+)\+?\s*years?',
+    r'(\d+)\+?\s*years?\s*working',
+]
+JOB_PATTERNS = [
+    r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
+    r'minimum\s*(\d+)\+?\s*years?',
+    r'at\s*least\s*(\d+)\+?\s*years?',
+]
+
+
+def reference_level(text, patterns, default):
+    """The detectors as they were before the scanner: one findall per pattern, then substring checks"""
+    text = text.lower()
+    years_found = [int(match) for pattern in patterns for match in re.findall(pattern, text)]
+    if years_found:
+        max_years = max(years_found)
+        if max_years >= 5:
+            return "senior"
+        elif max_years >= 2:
+            return "mid"
+        return "junior"
+    for level, indicators in (("senior", SENIOR_INDICATORS), ("mid", MID_INDICATORS), ("junior", JUNIOR_INDICATORS)):
+        if any(indicator in text for indicator in indicators):
+            return level
+    return default
+
+
+def assert_parity(text):
+    scan = scan_experience(text)
+    assert scan.level(RESUME_YEAR_KINDS, "junior") == reference_level(text, RESUME_PATTERNS, "junior"), text
+    assert scan.level(JOB_YEAR_KINDS, "mid") == reference_level(text, JOB_PATTERNS, "mid"), text
+
+
+@pytest.mark.parametrize("text", [
+    "5+ years of experience in Python",
+    "Experience: 3 years",
+    "experience:1year",
+    "Minimum 7 years, at least 2 years in a lead role",
+    "atleast 4 years",
+    "12years working with data",
+    "1 year in retail, 10 years experience overall",
+    "Over 2 yearsexperience",
+    "Senior engineer, previously an intern",
+    "Business analyst and trainee",
+    "leadership and management",
+    "entrypoint scripts",
+    "No seniority mentioned here",
+    "٥ years of experience",
+    "2021 - 2023 years in review",
+    "",
+])
+def test_levels_match_the_per_pattern_detectors(text):
+    assert_parity(text)
+
+
+def test_random_documents_match_the_per_pattern_detectors():
+    # Year phrases built from optional parts with optional spacing, mixed with keywords and noise
+    rng = random.Random(0)
+
+    def gap():
+        return rng.choice(["", " ", "  "])
+
+    def phrase():
+        label = rng.choice(["", "", "minimum", "at least", "atleast", "experience:", "experience :"])
+        number = rng.choice(["1", "3", "5", "12", "0"])
+        unit = rng.choice(["year", "years", "yrs", ""])
+        tail = rng.choice(["", "experience", "of experience", "ofexperience", "in", "working", "worked"])
+        return label + gap() + number + rng.choice(["", "+"]) + gap() + unit + gap() + tail
+
+    noise = ["senior", "lead", "intern", "analyst", "graduate", "python", "2019", ".", ",", "in", "experience"]
+    for _ in range(3000):
+        parts = [phrase() if rng.random() < 0.6 else rng.choice(noise) for _ in range(rng.randint(1, 5))]
+        assert_parity(gap().join(parts))
+
+
+def test_year_mentions_record_their_phrasings():
+    scan = scan_experience("Minimum 3 years; 6 years of experience. Experience: 4 years")
+    kinds = {mention.years: mention.kinds for mention in scan.years}
+    assert kinds == {3: ("minimum",), 6: ("experience",), 4: ("labelled",)}
+    assert scan.max_years(JOB_YEAR_KINDS) == 6
+    assert scan.max_years(("labelled",)) == 4
@@ -0,0 +1,65 @@
+"""
+Skill matcher: vocabulary skills and aliases are found on word boundaries of the
+lowercased text, and aliases only as words of their own.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SERVICE_DIR)
+from skill_index import SkillMatcher  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    with open(os.path.join(SERVICE_DIR, "data", "taxonomy.json"), encoding="utf-8") as f:
+        taxonomy = json.load(f)
+    return SkillMatcher(taxonomy["domain_skills"], taxonomy["aliases"])
+
+
+BOUNDARY_VOCABULARY = {"languages": ["c++", "c#", ".net", "node.js", "java", "javascript", "go", "react"],
+                       "practices": ["ci/cd", "r&d"]}
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("javascript developer", {"javascript"}),
+    ("c++ and c#", {"c++", "c#"}),
+    ("c++/c# and .net", {"c++", "c#", ".net"}),
+    ("(c#)", {"c#"}),
+    ("java/python", {"java"}),
+    ("go, java.", {"go", "java"}),
+    ("react&redux", {"react"}),
+    ("ci/cd pipelines and an r&d team", {"ci/cd", "r&d"}),
+    ("node.js", {"node.js"}),
+    ("google, django and golang", set()),
+    ("c++11 and asp.net", set()),
+])
+def test_skills_match_on_word_boundaries(text, expected):
+    assert SkillMatcher(BOUNDARY_VOCABULARY).find_skills(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "built services in node.js",
+    "server-side rendering with next.js",
+    "frontends in vue.js and react.js",
+    "wrote type definitions in foo.ts files",
+])
+def test_aliases_do_not_match_inside_dotted_names(matcher, text):
+    found = matcher.find_skills(text)
+    assert "javascript" not in found
+    assert "typescript" not in found
+
+
+@pytest.mark.parametrize("text", ["js", "5 years of js, ts and python", "frontend (js) work", "python; js"])
+def test_aliases_match_as_words(matcher, text):
+    assert "javascript" in matcher.find_skills(text)
+
+
+def test_cv_is_not_computer_vision(matcher):
+    # "CV" in a resume is nearly always the document itself
+    assert "computer vision" not in matcher.find_skills("please find my cv attached. cv: 2 pages")
+    assert "computer vision" in matcher.find_skills("computer vision with opencv")
@@ -0,0 +1,70 @@
+"""
+Text chunker: sentence boundaries leave dotted names alone, windows stay within
+the token budget without overlapping, and the window count is capped.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from text_chunker import TextChunker, split_sentences  # noqa: E402
+
+
+def count_words(sentences):
+    return [len(sentence.split()) for sentence in sentences]
+
+
+def test_sentences_split_on_real_boundaries():
+    text = (
+        "Built APIs in node.js and vb.net, e.g. billing v2.5 at 99.9% uptime. See https://example.com/a.b now!\n"
+        "• Led a team of 4\n- Wrote tests\n2019 - 2021\nLed a team of 4"
+    )
+    assert split_sentences(text) == [
+        "Built APIs in node.js and vb.net, e.g. billing v2.5 at 99.9% uptime.",
+        "See https://example.com/a.b now!",
+        "Led a team of 4.",
+        "Wrote tests.",
+    ]
+
+
+def test_windows_cover_every_sentence_once_within_the_budget():
+    sentences = [f"Sentence number {i} has {'some ' * (i % 5)}words." for i in range(40)]
+    chunker = TextChunker(max_tokens=20, max_chunks=100, count_tokens=count_words)
+    chunks = chunker.chunk(" ".join(sentences))
+
+    assert all(count <= 20 for count in count_words(chunks))
+    # Windows are consecutive sentences without overlap: joined back they are the input
+    assert " ".join(chunks) == " ".join(sentences)
+    # Greedy packing: the next window's first sentence would not have fit
+    for chunk, following in zip(chunks, chunks[1:]):
+        first = split_sentences(following)[0]
+        assert count_words([chunk])[0] + count_words([first])[0] > 20
+
+
+def test_long_sentences_are_cut_into_word_windows():
+    sentence = " ".join(f"word{i}" for i in range(100)) + "."
+    chunks = TextChunker(max_tokens=30, max_chunks=100, count_tokens=count_words).chunk(sentence)
+    assert len(chunks) > 1
+    assert all(count <= 30 for count in count_words(chunks))
+    assert " ".join(chunks) == sentence
+
+
+def test_window_count_is_capped():
+    text = " ".join(f"Sentence {i} about python." for i in range(200))
+
+    # Too many windows at the preferred size: packed again at the model limit, then truncated
+    chunker = TextChunker(max_tokens=8, max_chunks=10, model_max_tokens=40, count_tokens=count_words)
+    chunks = chunker.chunk(text)
+    assert len(chunks) == 10
+    assert all(count <= 40 for count in count_words(chunks))
+    assert chunks[0].startswith("Sentence 0 about python.")
+
+    # Few enough windows at the preferred size: the model limit is not used
+    assert len(chunker.chunk(" ".join(f"Sentence {i} about python." for i in range(20)))) == 10
+    assert all(count <= 8 for count in count_words(chunker.chunk("Sentence one about python. Sentence two here.")))
+
+
+def test_preferred_size_never_exceeds_the_model_limit():
+    chunker = TextChunker(max_tokens=512, max_chunks=4, model_max_tokens=254, count_tokens=count_words)
+    assert chunker.max_tokens == 254
+    assert TextChunker().chunk(" \n• 2019 |") == []
@@ -0,0 +1,147 @@
+"""
+Token-aware splitting of resumes and job descriptions into encoder inputs.
+Text is split on real sentence boundaries (sentence punctuation followed by
+whitespace, line breaks and bullet characters), so dots inside "node.js",
+"vb.net", version numbers, decimals and URLs stay put. Duplicate and trivial
+fragments are dropped, and consecutive sentences are packed into windows of at
+most max_tokens tokens. The number of windows per document is capped, which
+bounds the encode cost of very large inputs.
+"""
+
+import logging
+import math
+import re
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sentence punctuation followed by whitespace and something other than a lowercase
+# letter ("e.g. python" continues the sentence), line breaks, and bullet characters
+_BOUNDARY = re.compile(r"(?<=[.!?])\s+(?=[^a-z])|\s*[\r\n]+\s*|\s*[•▪●◦■►·]\s*")
+# List markers at the start of a line: "- ", "* ", "– ", "> "
+_LIST_MARKER = re.compile(r"^[-*–—>]+\s+")
+_WHITESPACE = re.compile(r"\s+")
+# A fragment needs at least one word of two or more letters ("2019 - 2021", "|" and
+# page numbers carry nothing the encoder can use)
+_WORD = re.compile(r"[^\W\d_]{2,}")
+# Abbreviations that end in a dot without ending the sentence
+_ABBREVIATIONS = {"e.g.", "i.e.", "etc.", "vs.", "approx.", "incl.", "no.", "dr.", "mr.", "ms.", "mrs.", "jr.", "sr."}
+_TERMINAL_PUNCTUATION = ".!?;:"
+# Rough WordPiece length: words and punctuation marks, plus a third for sub-word splits
+_TOKEN_ESTIMATE = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(sentences: List[str]) -> List[int]:
+    """Approximate token counts for encoders without a tokenizer"""
+    return [math.ceil(len(_TOKEN_ESTIMATE.findall(sentence)) * 4 / 3) for sentence in sentences]
+
+
+def token_counter(model) -> Callable[[List[str]], List[int]]:
+    """Token counting function for a sentence encoder: its own tokenizer if it has one, else an estimate"""
+    if hasattr(model, "count_tokens"):
+        return model.count_tokens
+    backend = getattr(getattr(model, "tokenizer", None), "backend_tokenizer", None)
+    if backend is None:
+        return estimate_tokens
+    try:
+        from tokenizers import Tokenizer
+        # A private copy: the transformers tokenizer changes its truncation and padding
+        # settings on every encode call, so sharing it across threads is unsafe
+        tokenizer = Tokenizer.from_str(backend.to_str())
+        tokenizer.no_truncation()
+        tokenizer.no_padding()
+    except Exception as e:
+        logger.error(f"Could not copy the encoder tokenizer, estimating token counts: {str(e)}")
+        return estimate_tokens
+    return lambda sentences: [
+        len(encoding.ids) for encoding in tokenizer.encode_batch(sentences, add_special_tokens=False)
+    ]
+
+
+def split_sentences(text: str) -> List[str]:
+    """Sentences and list items of text, whitespace-normalized, without duplicates or trivial fragments"""
+    sentences = []
+    seen = set()
+    pending = ""
+    for piece in _BOUNDARY.split(text):
+        piece = _WHITESPACE.sub(" ", _LIST_MARKER.sub("", piece.strip()))
+        if pending:
+            piece = f"{pending} {piece}".strip()
+            pending = ""
+        if piece.lower().rsplit(" ", 1)[-1] in _ABBREVIATIONS:
+            pending = piece
+            continue
+        if not _WORD.search(piece):
+            continue
+        # Every sentence ends in punctuation so packed windows read as separate sentences
+        if piece[-1] not in _TERMINAL_PUNCTUATION:
+            piece += "."
+        key = piece.lower()
+        if key not in seen:
+            seen.add(key)
+            sentences.append(piece)
+    if pending and _WORD.search(pending) and pending.lower() not in seen:
+        sentences.append(pending)
+    return sentences
+
+
+class TextChunker:
+    """Splits documents into at most max_chunks windows of at most max_tokens tokens"""
+
+    def __init__(self, max_tokens: int = 128, max_chunks: int = 64, model_max_tokens: Optional[int] = None,
+                 count_tokens: Callable[[List[str]], List[int]] = estimate_tokens):
+        # model_max_tokens is the encoder's limit without its special tokens; windows
+        # never exceed it, since anything past it would be truncated away
+        self.model_max_tokens = model_max_tokens or max_tokens
+        self.max_tokens = max(1, min(max_tokens, self.model_max_tokens))
+        self.max_chunks = max(1, max_chunks)
+        self.count_tokens = count_tokens
+
+    @classmethod
+    def for_model(cls, model, max_tokens: int, max_chunks: int) -> "TextChunker":
+        """Chunker sized to an encoder's max_seq_length (less [CLS] and [SEP]) and counting with its tokenizer"""
+        max_seq_length = getattr(model, "max_seq_length", None)
+        model_max_tokens = max_seq_length - 2 if max_seq_length else None
+        return cls(max_tokens, max_chunks, model_max_tokens, token_counter(model))
+
+    def chunk(self, text: str) -> List[str]:
+        """Encoder inputs for one document"""
+        sentences = split_sentences(text)
+        if not sentences:
+            return []
+        counts = self.count_tokens(sentences)
+        chunks = self._pack(sentences, counts, self.max_tokens)
+        if len(chunks) > self.max_chunks and self.max_tokens < self.model_max_tokens:
+            # Too long for the preferred window size: use the encoder's full input length
+            chunks = self._pack(sentences, counts, self.model_max_tokens)
+        if len(chunks) > self.max_chunks:
+            logger.debug(f"Document of {len(text)} chars truncated from {len(chunks)} to {self.max_chunks} chunks")
+            chunks = chunks[:self.max_chunks]
+        return chunks
+
+    def _pack(self, sentences: List[str], counts: List[int], budget: int) -> List[str]:
+        """Greedily join consecutive sentences while they fit in the token budget"""
+        chunks = []
+        window: List[str] = []
+        window_tokens = 0
+        for sentence, tokens in zip(sentences, counts):
+            if window and window_tokens + tokens > budget:
+                chunks.append(" ".join(window))
+                window, window_tokens = [], 0
+            if tokens > budget:
+                chunks.extend(self._split_long(sentence, tokens, budget))
+                continue
+            window.append(sentence)
+            window_tokens += tokens
+        if window:
+            chunks.append(" ".join(window))
+        return chunks
+
+    @staticmethod
+    def _split_long(sentence: str, tokens: int, budget: int) -> List[str]:
+        """Cut a sentence longer than the budget into word windows of roughly budget tokens"""
+        words = sentence.split(" ")
+        # Words per window from the sentence's average tokens per word, with a margin
+        # for windows that happen to hold longer words
+        per_window = max(1, int(len(words) * budget * 0.9 / tokens))
+        return [" ".join(words[start:start + per_window]) for start in range(0, len(words), per_window)]